@@ -1,27 +1,23 @@
 # app.py - AI Resume Matcher Pro (PROFESSIONAL + BUG-FREE)
+import hashlib
+import os
 import streamlit as st
-import pandas as pd
-import numpy as np
 import time
-import re
-from io import BytesIO
-import base64
-
-# ML / text
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-
-# PDF reading
-try:
-    from PyPDF2 import PdfReader
-except Exception:
-    PdfReader = None
-
-# Optional OpenAI (for resume improver)
-try:
-    import openai
-except Exception:
-    openai = None
+import uuid
+
+from resume_analyzer import metrics
+from resume_analyzer.ai import start_rewrite
+from resume_analyzer.cache import named_caches
+from resume_analyzer.jobs import analyze_job_description, parse_job
+from resume_analyzer.live import LiveResume
+from resume_analyzer.matching import calculate_ai_match, skill_overlap
+from resume_analyzer.pdf import extract_text_from_pdf, pypdf2_available
+from resume_analyzer.report import generate_text_report
+from resume_analyzer.scheduler import get_scheduler
+
+THEME_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "style.css")
+# How often the AI rewrite progress is polled while it streams
+AI_POLL_SECONDS = 0.5
 
 # ----------------------------
 # Page config
@@ -33,6 +29,24 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ----------------------------
+# Diagnostics (hidden unless RESUME_ANALYZER_DIAGNOSTICS=1)
+# ----------------------------
+# Metrics are process-wide and cover every session, so only the operator
+# can turn the panel on, not a visitor's URL.
+show_diagnostics = os.environ.get("RESUME_ANALYZER_DIAGNOSTICS") == "1"
+if show_diagnostics:
+    metrics.enable()
+
+@st.cache_resource
+def start_metrics_exporter(port):
+    # One Prometheus endpoint per server process, shared by all sessions
+    metrics.enable()
+    return metrics.serve_prometheus(port)
+
+if os.environ.get("RESUME_ANALYZER_METRICS_PORT"):
+    start_metrics_exporter(int(os.environ["RESUME_ANALYZER_METRICS_PORT"]))
+
 # ----------------------------
 # Helper to render safe HTML blocks
 # ----------------------------
@@ -55,678 +69,36 @@ def initialize_session_state():
         st.session_state["match_score"] = 0
     if "analysis_results" not in st.session_state:
         st.session_state["analysis_results"] = None
+    if "use_ai_rewrite" not in st.session_state:
+        st.session_state["use_ai_rewrite"] = False
+    if "session_id" not in st.session_state:
+        # Per-session quotas in the shared OpenAI scheduler
+        st.session_state["session_id"] = uuid.uuid4().hex
 
 initialize_session_state()
 
 # ----------------------------
 # PREMIUM PROFESSIONAL CSS
 # ----------------------------
-st.markdown(
-    """
-<style>
-/* ===== PREMIUM COLOR SCHEME ===== */
-:root {
-    --primary: #2563eb;
-    --primary-dark: #1d4ed8;
-    --primary-light: #dbeafe;
-    --secondary: #64748b;
-    --success: #10b981;
-    --success-light: #d1fae5;
-    --warning: #f59e0b;
-    --warning-light: #fef3c7;
-    --error: #ef4444;
-    --error-light: #fee2e2;
-    --background: #f8fafc;
-    --surface: #ffffff;
-    --text: #1e293b;
-    --text-light: #64748b;
-    --border: #e2e8f0;
-    --shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
-    --shadow-hover: 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05);
-}
-
-/* ===== MAIN CONTAINER ===== */
-.main .block-container {
-    padding-top: 1rem !important;
-    padding-bottom: 1rem !important;
-    padding-left: 1rem !important;
-    padding-right: 1rem !important;
-    max-width: 1400px !important;
-}
-
-.stApp {
-    background: var(--background) !important;
-    font-family: 'Inter', 'Segoe UI', system-ui, sans-serif !important;
-    line-height: 1.6 !important;
-}
-
-/* ===== PREMIUM HEADER ===== */
-.premium-header {
-    background: linear-gradient(135deg, var(--primary) 0%, var(--primary-dark) 100%) !important;
-    padding: 3rem 2rem !important;
-    border-radius: 16px !important;
-    margin-bottom: 2rem !important;
-    text-align: center !important;
-    box-shadow: var(--shadow) !important;
-    border: 1px solid var(--border) !important;
-    position: relative !important;
-    overflow: hidden !important;
-}
-
-.premium-header::before {
-    content: '' !important;
-    position: absolute !important;
-    top: 0 !important;
-    left: 0 !important;
-    right: 0 !important;
-    bottom: 0 !important;
-    background: url("data:image/svg+xml,%3Csvg width='100' height='100' viewBox='0 0 100 100' xmlns='http://www.w3.org/2000/svg'%3E%3Cpath d='M11 18c3.866 0 7-3.134 7-7s-3.134-7-7-7-7 3.134-7 7 3.134 7 7 7zm48 25c3.866 0 7-3.134 7-7s-3.134-7-7-7-7 3.134-7 7 3.134 7 7 7zm-43-7c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zm63 31c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zM34 90c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zm56-76c1.657 0 3-1.343 3-3s-1.343-3-3-3-3 1.343-3 3 1.343 3 3 3zM12 86c2.21 0 4-1.79 4-4s-1.79-4-4-4-4 1.79-4 4 1.79 4 4 4zm28-65c2.21 0 4-1.79 4-4s-1.79-4-4-4-4 1.79-4 4 1.79 4 4 4zm23-11c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zm-6 60c2.21 0 4-1.79 4-4s-1.79-4-4-4-4 1.79-4 4 1.79 4 4 4zm29 22c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zM32 63c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zm57-13c2.76 0 5-2.24 5-5s-2.24-5-5-5-5 2.24-5 5 2.24 5 5 5zm-9-21c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2zM60 91c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2zM35 41c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2zM12 60c1.105 0 2-.895 2-2s-.895-2-2-2-2 .895-2 2 .895 2 2 2z' fill='%23ffffff' fill-opacity='0.1' fill-rule='evenodd'/%3E%3C/svg%3E") !important;
-    opacity: 0.3 !important;
-}
-
-.main-title {
-    font-size: 2.75rem !important;
-    font-weight: 800 !important;
-    color: white !important;
-    margin: 0 !important;
-    letter-spacing: -0.5px !important;
-    text-shadow: 0 2px 4px rgba(0, 0, 0, 0.1) !important;
-}
-
-.sub-title {
-    color: rgba(255, 255, 255, 0.95) !important;
-    font-size: 1.25rem !important;
-    font-weight: 400 !important;
-    margin: 1rem 0 0 0 !important;
-    max-width: 600px !important;
-    margin-left: auto !important;
-    margin-right: auto !important;
-    line-height: 1.5 !important;
-}
-
-/* ===== PREMIUM CARDS ===== */
-.premium-card {
-    background: var(--surface) !important;
-    padding: 2rem !important;
-    border-radius: 16px !important;
-    border: 1px solid var(--border) !important;
-    box-shadow: var(--shadow) !important;
-    margin-bottom: 1.5rem !important;
-    transition: all 0.3s ease !important;
-    position: relative !important;
-    overflow: hidden !important;
-}
-
-.premium-card::before {
-    content: '' !important;
-    position: absolute !important;
-    top: 0 !important;
-    left: 0 !important;
-    width: 4px !important;
-    height: 100% !important;
-    background: linear-gradient(to bottom, var(--primary), var(--success)) !important;
-}
-
-.premium-card:hover {
-    box-shadow: var(--shadow-hover) !important;
-    border-color: #cbd5e1 !important;
-    transform: translateY(-2px) !important;
-}
-
-/* ===== PREMIUM BUTTONS ===== */
-.stButton > button {
-    background: linear-gradient(135deg, var(--primary) 0%, var(--primary-dark) 100%) !important;
-    color: white !important;
-    border: none !important;
-    border-radius: 10px !important;
-    padding: 0.875rem 2rem !important;
-    font-weight: 600 !important;
-    font-size: 1rem !important;
-    transition: all 0.3s ease !important;
-    width: 100% !important;
-    box-shadow: 0 2px 4px rgba(37, 99, 235, 0.2) !important;
-    position: relative !important;
-    overflow: hidden !important;
-}
-
-.stButton > button::before {
-    content: '' !important;
-    position: absolute !important;
-    top: 0 !important;
-    left: -100% !important;
-    width: 100% !important;
-    height: 100% !important;
-    background: linear-gradient(90deg, transparent, rgba(255, 255, 255, 0.2), transparent) !important;
-    transition: left 0.5s !important;
-}
-
-.stButton > button:hover::before {
-    left: 100% !important;
-}
-
-.stButton > button:hover {
-    transform: translateY(-2px) !important;
-    box-shadow: 0 4px 12px rgba(37, 99, 235, 0.4) !important;
-}
-
-/* Secondary Button */
-.secondary-button > button {
-    background: var(--surface) !important;
-    color: var(--primary) !important;
-    border: 2px solid var(--primary) !important;
-    border-radius: 10px !important;
-    padding: 0.875rem 2rem !important;
-    font-weight: 600 !important;
-    font-size: 1rem !important;
-    transition: all 0.3s ease !important;
-    width: 100% !important;
-}
-
-.secondary-button > button:hover {
-    background: var(--primary-light) !important;
-    transform: translateY(-2px) !important;
-    box-shadow: 0 4px 12px rgba(37, 99, 235, 0.15) !important;
-}
-
-/* ===== PREMIUM INPUT FIELDS ===== */
-.stTextArea textarea, .stTextInput input {
-    background: var(--surface) !important;
-    border-radius: 10px !important;
-    padding: 1rem 1.25rem !important;
-    border: 2px solid var(--border) !important;
-    font-size: 0.95rem !important;
-    line-height: 1.5 !important;
-    transition: all 0.3s ease !important;
-    color: var(--text) !important;
-    font-family: 'Inter', sans-serif !important;
-    box-shadow: 0 1px 2px rgba(0, 0, 0, 0.05) !important;
-}
-
-.stTextArea textarea:focus, .stTextInput input:focus {
-    border-color: var(--primary) !important;
-    box-shadow: 0 0 0 3px rgba(37, 99, 235, 0.1) !important;
-    outline: none !important;
-}
-
-.stTextArea textarea::placeholder, .stTextInput input::placeholder {
-    color: var(--text-light) !important;
-}
-
-/* ===== PREMIUM SKILL TAGS ===== */
-.skill-tag {
-    display: inline-block !important;
-    margin: 0.25rem !important;
-    padding: 0.5rem 1rem !important;
-    border-radius: 20px !important;
-    background: #f1f5f9 !important;
-    color: var(--text) !important;
-    font-weight: 500 !important;
-    font-size: 0.85rem !important;
-    border: 1px solid var(--border) !important;
-    transition: all 0.2s ease !important;
-    box-shadow: 0 1px 2px rgba(0, 0, 0, 0.05) !important;
-}
-
-.skill-tag:hover {
-    transform: translateY(-1px) !important;
-    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1) !important;
-}
-
-.skill-tag.strong {
-    background: var(--success-light) !important;
-    color: #065f46 !important;
-    border-color: #a7f3d0 !important;
-}
-
-.skill-tag.improve {
-    background: var(--warning-light) !important;
-    color: #92400e !important;
-    border-color: #fcd34d !important;
-}
-
-/* ===== PREMIUM STEP INDICATOR ===== */
-.step-indicator {
-    display: flex !important;
-    justify-content: space-between !important;
-    align-items: center !important;
-    margin: 2rem 0 !important;
-    position: relative !important;
-    background: var(--surface) !important;
-    padding: 1.5rem !important;
-    border-radius: 16px !important;
-    border: 1px solid var(--border) !important;
-    box-shadow: var(--shadow) !important;
-}
-
-.step {
-    display: flex !important;
-    flex-direction: column !important;
-    align-items: center !important;
-    flex: 1 !important;
-    position: relative !important;
-    z-index: 2 !important;
-}
-
-.step-number {
-    width: 48px !important;
-    height: 48px !important;
-    border-radius: 50% !important;
-    background: #f1f5f9 !important;
-    color: var(--text-light) !important;
-    display: flex !important;
-    align-items: center !important;
-    justify-content: center !important;
-    font-weight: 700 !important;
-    margin-bottom: 0.5rem !important;
-    border: 2px solid var(--border) !important;
-    transition: all 0.3s ease !important;
-    font-size: 1rem !important;
-    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05) !important;
-}
-
-.step.active .step-number {
-    background: var(--primary) !important;
-    color: white !important;
-    border-color: var(--primary) !important;
-    transform: scale(1.1) !important;
-    box-shadow: 0 4px 8px rgba(37, 99, 235, 0.3) !important;
-}
-
-.step.completed .step-number {
-    background: var(--success) !important;
-    color: white !important;
-    border-color: var(--success) !important;
-    box-shadow: 0 4px 8px rgba(16, 185, 129, 0.3) !important;
-}
-
-.step-line {
-    position: absolute !important;
-    top: 24px !important;
-    left: 50% !important;
-    right: -50% !important;
-    height: 3px !important;
-    background: var(--border) !important;
-    z-index: 1 !important;
-    transition: all 0.3s ease !important;
-    border-radius: 2px !important;
-}
-
-.step.completed .step-line {
-    background: var(--success) !important;
-}
-
-.step-label {
-    font-size: 0.9rem !important;
-    color: var(--text-light) !important;
-    font-weight: 500 !important;
-    text-align: center !important;
-    transition: all 0.3s ease !important;
-}
-
-.step.active .step-label {
-    color: var(--primary) !important;
-    font-weight: 600 !important;
-}
-
-.step.completed .step-label {
-    color: var(--success) !important;
-}
-
-/* ===== PREMIUM TABS ===== */
-.stTabs [data-baseweb="tab-list"] {
-    gap: 0.5rem !important;
-    background-color: var(--surface) !important;
-    padding: 0.5rem !important;
-    border-radius: 12px !important;
-    border: 1px solid var(--border) !important;
-    box-shadow: 0 1px 2px rgba(0, 0, 0, 0.05) !important;
-}
-
-.stTabs [data-baseweb="tab"] {
-    height: 50px !important;
-    background-color: transparent !important;
-    border-radius: 8px !important;
-    padding: 0 1.5rem !important;
-    font-weight: 500 !important;
-    color: var(--text-light) !important;
-    transition: all 0.2s ease !important;
-    border: 1px solid transparent !important;
-}
-
-.stTabs [aria-selected="true"] {
-    background: linear-gradient(135deg, var(--primary) 0%, var(--primary-dark) 100%) !important;
-    color: white !important;
-    border-color: var(--primary) !important;
-    box-shadow: 0 2px 4px rgba(37, 99, 235, 0.2) !important;
-}
-
-/* ===== PREMIUM PROGRESS BAR ===== */
-.stProgress > div > div > div {
-    background: linear-gradient(90deg, var(--primary) 0%, var(--primary-dark) 100%) !important;
-    border-radius: 8px !important;
-    height: 10px !important;
-}
-
-/* ===== PREMIUM METRICS ===== */
-[data-testid="metric-container"] {
-    background: var(--surface) !important;
-    border: 1px solid var(--border) !important;
-    border-radius: 12px !important;
-    padding: 1.5rem !important;
-    box-shadow: var(--shadow) !important;
-    transition: all 0.3s ease !important;
-}
-
-[data-testid="metric-container"]:hover {
-    transform: translateY(-2px) !important;
-    box-shadow: var(--shadow-hover) !important;
-}
-
-/* ===== PREMIUM SCORE DISPLAY ===== */
-.score-display {
-    text-align: center !important;
-    padding: 2rem !important;
-    border-radius: 16px !important;
-    margin: 1rem 0 !important;
-    background: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%) !important;
-    border: 1px solid var(--border) !important;
-    box-shadow: var(--shadow) !important;
-}
-
-.score-value {
-    font-size: 3.5rem !important;
-    font-weight: 800 !important;
-    margin: 0 !important;
-    background: linear-gradient(135deg, var(--primary) 0%, var(--success) 100%) !important;
-    -webkit-background-clip: text !important;
-    -webkit-text-fill-color: transparent !important;
-    background-clip: text !important;
-}
-
-.score-label {
-    font-size: 1.25rem !important;
-    color: var(--text-light) !important;
-    margin: 0.5rem 0 0 0 !important;
-    font-weight: 500 !important;
-}
-
-/* ===== MOBILE RESPONSIVENESS ===== */
-@media (max-width: 768px) {
-    .main .block-container {
-        padding: 0.5rem !important;
-    }
-    
-    .premium-header {
-        padding: 2rem 1rem !important;
-    }
-    
-    .main-title {
-        font-size: 2.25rem !important;
-    }
-    
-    .sub-title {
-        font-size: 1.1rem !important;
-    }
-    
-    .premium-card {
-        padding: 1.5rem !important;
-    }
-    
-    .step-indicator {
-        flex-wrap: wrap !important;
-        gap: 1rem !important;
-        margin: 1.5rem 0 !important;
-    }
-    
-    .step {
-        flex: 0 0 calc(50% - 1rem) !important;
-        margin-bottom: 0.5rem !important;
-    }
-    
-    .step-line {
-        display: none !important;
-    }
-    
-    .score-value {
-        font-size: 2.75rem !important;
-    }
-}
-
-/* ===== HIDE STREAMLIT DEFAULT ELEMENTS ===== */
-#MainMenu {visibility: hidden;}
-footer {visibility: hidden;}
-header {visibility: hidden;}
-
-/* ===== PREMIUM STATUS MESSAGES ===== */
-.status-success {
-    background: var(--success-light) !important;
-    color: #065f46 !important;
-    border: 1px solid #a7f3d0 !important;
-    border-radius: 10px !important;
-    padding: 1rem 1.25rem !important;
-    border-left: 4px solid var(--success) !important;
-}
-
-.status-warning {
-    background: var(--warning-light) !important;
-    color: #92400e !important;
-    border: 1px solid #fcd34d !important;
-    border-radius: 10px !important;
-    padding: 1rem 1.25rem !important;
-    border-left: 4px solid var(--warning) !important;
-}
-
-.status-error {
-    background: var(--error-light) !important;
-    color: #991b1b !important;
-    border: 1px solid #fca5a5 !important;
-    border-radius: 10px !important;
-    padding: 1rem 1.25rem !important;
-    border-left: 4px solid var(--error) !important;
-}
-
-/* ===== PREMIUM LOADING ANIMATION ===== */
-.stSpinner > div {
-    border-top-color: var(--primary) !important;
-}
-
-/* ===== CUSTOM RADIO BUTTONS ===== */
-.stRadio > div {
-    flex-direction: row !important;
-    gap: 1rem !important;
-}
-
-.stRadio > div [role="radiogroup"] {
-    display: flex !important;
-    gap: 1rem !important;
-    flex-wrap: wrap !important;
-}
-
-.stRadio > div [role="radiogroup"] label {
-    background: var(--surface) !important;
-    border: 2px solid var(--border) !important;
-    border-radius: 10px !important;
-    padding: 0.75rem 1.5rem !important;
-    transition: all 0.3s ease !important;
-    flex: 1 !important;
-    text-align: center !important;
-    min-width: 140px !important;
-}
-
-.stRadio > div [role="radiogroup"] label:hover {
-    border-color: var(--primary) !important;
-    background: var(--primary-light) !important;
-}
-
-.stRadio > div [role="radiogroup"] label[data-testid="stRadio"] {
-    background: var(--surface) !important;
-}
-
-.stRadio > div [role="radiogroup"] div:first-child {
-    flex: 1 !important;
-}
-
-.stRadio > div [role="radiogroup"] div:first-child label {
-    margin-right: 0 !important;
-}
-
-/* Selected radio button */
-.stRadio > div [role="radiogroup"] label[data-testid="stRadio"]:has(input:checked) {
-    background: linear-gradient(135deg, var(--primary) 0%, var(--primary-dark) 100%) !important;
-    color: white !important;
-    border-color: var(--primary) !important;
-    box-shadow: 0 2px 4px rgba(37, 99, 235, 0.2) !important;
-}
-</style>
-""",
-    unsafe_allow_html=True,
-)
-
-# ----------------------------
-# CORE FUNCTIONS
-# ----------------------------
-def extract_skills_advanced(text):
-    tech_skills = {
-        'Programming': ['python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'rust', 'kotlin', 'swift'],
-        'Web Frontend': ['react', 'angular', 'vue', 'html', 'css', 'sass', 'bootstrap', 'tailwind', 'javascript', 'typescript'],
-        'Web Backend': ['node', 'django', 'flask', 'spring', 'express', 'fastapi', 'ruby on rails', 'php', 'laravel'],
-        'Database': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'oracle', 'sqlite', 'dynamodb'],
-        'Cloud & DevOps': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'ci/cd', 'terraform', 'linux'],
-        'Data Science': ['machine learning', 'deep learning', 'tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn', 'tableau', 'power bi'],
-        'Mobile': ['react native', 'flutter', 'android', 'ios', 'swift', 'kotlin']
-    }
-    soft_skills = ['communication', 'teamwork', 'leadership', 'problem solving', 'creativity', 'adaptability', 'time management', 'critical thinking', 'collaboration', 'presentation']
-    
-    found_skills = {category: [] for category in tech_skills}
-    found_soft_skills = []
-    text_lower = (text or "").lower()
-    
-    for category, skills in tech_skills.items():
-        for skill in skills:
-            if skill in text_lower:
-                found_skills[category].append(skill.title())
-    
-    for skill in soft_skills:
-        if skill in text_lower:
-            found_soft_skills.append(skill.title())
-    
-    return found_skills, found_soft_skills
-
-def calculate_ai_match(resume_text, job_desc):
-    if not (resume_text or "").strip() or not (job_desc or "").strip():
-        return 0, {}, [], {}
-    
-    vectorizer = CountVectorizer(stop_words='english', ngram_range=(1,3))
-    tfidf_matrix = vectorizer.fit_transform([resume_text, job_desc])
-    similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-    
-    resume_tech, resume_soft = extract_skills_advanced(resume_text)
-    job_tech, job_soft = extract_skills_advanced(job_desc)
-    
-    total_tech_score = 0
-    max_tech_score = 0
-    
-    for category in job_tech:
-        job_skills = job_tech[category]
-        resume_skills = resume_tech[category]
-        if job_skills:
-            max_tech_score += len(job_skills)
-            matched = len(set(job_skills) & set(resume_skills))
-            total_tech_score += matched
-    
-    tech_match = (total_tech_score / max_tech_score * 100) if max_tech_score > 0 else 0
-    soft_match = (len(set(job_soft) & set(resume_soft)) / len(job_soft) * 100) if job_soft else 0
-    
-    final_score = (similarity * 40 + tech_match * 45 + soft_match * 15)
-    return min(round(final_score * 100, 2), 100), resume_tech, resume_soft, job_tech, job_soft
-
-def analyze_job_description(jd_text):
-    jd = jd_text or ""
-    lines = [l.strip() for l in jd.splitlines() if l.strip()]
-    jd_lower = jd.lower()
-    title = ""
-    
-    m = re.search(r"job title[:\-]\s*(.+)", jd_lower)
-    if m:
-        title = m.group(1).strip().title()
+# The stylesheet lives in static/style.css. With static serving on (see
+# .streamlit/config.toml) each rerun sends a <link> the browser resolves
+# from its HTTP cache, instead of ~16 KB of inline CSS.
+@st.cache_resource
+def load_theme():
+    with open(THEME_PATH, encoding="utf-8") as f:
+        css = f.read()
+    version = hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+    return css, version
+
+def inject_theme():
+    css, version = load_theme()
+    if st.get_option("server.enableStaticServing"):
+        html(f'<link rel="stylesheet" href="app/static/style.css?v={version}">')
     else:
-        if lines:
-            first = lines[0]
-            if len(first.split()) < 6:
-                title = first.title()
-    
-    bullets = re.split(r"[\n•\-]+", jd)
-    bullets = [b.strip() for b in bullets if len(b.strip()) > 2]
-    job_tech, job_soft = extract_skills_advanced(jd)
-    
-    return {
-        "title": title or "Not Specified",
-        "bullets": bullets,
-        "requirements": bullets[:6],
-        "job_tech": job_tech,
-        "job_soft": job_soft
-    }
+        html(f"<style>\n{css}</style>")
 
-def extract_text_from_pdf(file_bytes):
-    if PdfReader is None:
-        return None, "PyPDF2 not installed. Install with `pip install PyPDF2`"
-    try:
-        reader = PdfReader(file_bytes)
-        text = []
-        for page in reader.pages:
-            text.append(page.extract_text() or "")
-        return "\n".join(text), None
-    except Exception as e:
-        return None, f"Failed to extract PDF text: {e}"
-
-def ai_improve_resume(resume_text, openai_api_key, target_role=None, max_tokens=700):
-    if not openai:
-        return None, "OpenAI package not installed"
-    if not openai_api_key:
-        return None, "No OpenAI API key provided"
-    
-    try:
-        openai.api_key = openai_api_key
-        prompt = f"""Improve this resume for {target_role or 'a professional role'}:
-        
-{resume_text}
-
-Provide only the improved resume content:"""
-        
-        resp = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[{"role":"user","content":prompt}],
-            max_tokens=max_tokens,
-            temperature=0.2,
-        )
-        improved = resp["choices"][0]["message"]["content"].strip()
-        return improved, None
-    except Exception as e:
-        return None, f"OpenAI request failed: {e}"
-
-def generate_text_report(match_score, strong_points, improvement_points, job_title=""):
-    """Generate a simple text report instead of PDF to avoid encoding issues"""
-    report = f"""
-RESUME MATCH ANALYSIS REPORT
-============================
-
-Job Title: {job_title}
-Match Score: {match_score}%
-
-STRONG POINTS:
-{chr(10).join(f"• {point}" for point in strong_points) if strong_points else "• No strong points identified"}
+inject_theme()
 
-IMPROVEMENT AREAS:
-{chr(10).join(f"• {point}" for point in improvement_points) if improvement_points else "• No major improvement areas"}
-
-RECOMMENDATIONS:
-• Focus on developing the skills mentioned above
-• Tailor your resume to highlight matching skills
-• Consider relevant projects or certifications
-
-Generated by ResumeMatch Pro
-    """
-    return report
 
 # ----------------------------
 # STEP MANAGEMENT
@@ -736,7 +108,7 @@ def update_step_progress():
     has_resume = bool(st.session_state.get("resume_text", "").strip())
     has_job_desc = bool(st.session_state.get("job_desc_input", "").strip())
     analysis_done = st.session_state.get("analysis_complete", False)
-    
+
     if analysis_done:
         st.session_state.current_step = 4
     elif has_resume and has_job_desc:
@@ -746,6 +118,39 @@ def update_step_progress():
     else:
         st.session_state.current_step = 1
 
+# ----------------------------
+# PANEL DEPENDENCIES
+# ----------------------------
+# Every panel is an st.fragment, so a widget inside it reruns just that panel.
+# Panels share data only through session state; PANEL_INPUTS lists what each
+# panel renders from state written by *other* panels. A widget that writes
+# shared state reruns its own panel plus the panels whose inputs changed, so
+# typing in the job description never re-runs the PDF uploader or the results.
+def analysis_is_current(state):
+    results = state["analysis_results"]
+    return bool(results) and results.get("inputs") == (state["resume_text"], state["job_desc_input"])
+
+PANEL_INPUTS = {
+    "steps": lambda state: (bool(state["resume_text"].strip()), bool(state["job_desc_input"].strip()),
+                            state["analysis_complete"]),
+    "resume": lambda state: (state.get("use_ai_rewrite", False),
+                             state["job_desc_input"] if state.get("live_score_on") else None),
+    "analysis": lambda state: (bool(state["resume_text"].strip()), bool(state["job_desc_input"].strip()),
+                               analysis_is_current(state)),
+}
+
+def share(name, widget_key, panel):
+    """Widget callback: copy a widget's value to shared state and rerun the panels that depend on it."""
+    state = st.session_state
+    before = {key: inputs(state) for key, inputs in PANEL_INPUTS.items() if key != panel}
+    state[name] = state[widget_key]
+    st.rerun([panel] + [key for key, inputs in before.items() if PANEL_INPUTS[key](state) != inputs])
+
+def set_resume_text(text):
+    """Replace the resume from code; the text area shows it from the next run of the resume panel."""
+    st.session_state["resume_text"] = text
+    st.session_state["resume_area_pending"] = text
+
 # ----------------------------
 # PREMIUM UI BUILDING
 # ----------------------------
@@ -758,12 +163,12 @@ html(f"""
 </div>
 """)
 
-# Update step progress
-update_step_progress()
-
 # Dynamic Step Indicator
-current_step = st.session_state.current_step
-html(f"""
+@st.fragment(key="steps")
+def step_indicator():
+    update_step_progress()
+    current_step = st.session_state.current_step
+    html(f"""
 <div class="step-indicator">
     <div class="step {'completed' if current_step >= 1 else 'active' if current_step == 1 else ''}">
         <div class="step-number">1</div>
@@ -787,28 +192,38 @@ html(f"""
 </div>
 """)
 
+step_indicator()
+
 # Premium Sidebar
-with st.sidebar:
-    html('<div class="premium-card">')
-    st.header("⚙️ Settings & Tools")
-    
+@st.fragment(key="settings")
+def settings_panel():
     st.subheader("🤖 AI Features")
     openai_api_key = st.text_input(
-        "OpenAI API Key", 
+        "OpenAI API Key",
         type="password",
         placeholder="Enter your API key...",
-        help="Required for AI resume improvements"
+        help="Required for AI resume improvements",
+        key="openai_api_key"
     )
-    
+
     use_ai_rewrite = st.checkbox(
-        "Enable AI Resume Rewriter", 
+        "Enable AI Resume Rewriter",
         value=False,
-        help="Get AI-powered resume improvements"
+        help="Get AI-powered resume improvements",
+        key="ai_rewrite_toggle",
+        on_change=share,
+        args=("use_ai_rewrite", "ai_rewrite_toggle", "settings")
     )
-    
+
     if use_ai_rewrite and not openai_api_key:
         st.warning("🔑 Please add your OpenAI API key to enable AI features")
-    
+
+with st.sidebar:
+    html('<div class="premium-card">')
+    st.header("⚙️ Settings & Tools")
+
+    settings_panel()
+
     st.markdown("---")
     st.subheader("📚 Quick Guide")
     st.info("""
@@ -818,7 +233,7 @@ with st.sidebar:
     3. 📊 Click Analyze to get insights
     4. 📈 Review matches and improvements
     """)
-    
+
     st.markdown("---")
     st.subheader("💡 Tips")
     st.success("""
@@ -829,13 +244,14 @@ with st.sidebar:
     """)
     html('</div>')
 
-# Main Content Area with Premium Tabs
-tab1, tab2, tab3 = st.tabs(["📝 Resume", "💼 Job Description", "📊 Analysis"])
-
-with tab1:
+# ----------------------------
+# Resume panel
+# ----------------------------
+@st.fragment(key="resume")
+def resume_panel():
     html('<div class="premium-card">')
     st.subheader("📄 Resume Input")
-    
+
     # File upload section
     upload_col1, upload_col2 = st.columns([2, 1])
     with upload_col1:
@@ -844,37 +260,64 @@ with tab1:
             ["Paste Text", "Upload PDF"],
             horizontal=True
         )
-    
+
     if upload_mode == "Upload PDF":
         uploaded_file = st.file_uploader(
             "Upload your resume PDF",
             type=["pdf"],
-            help="Supported: PDF files"
+            help="Supported: PDF files",
+            # The resume panel runs first, so the others see the extracted text
+            on_change=st.rerun,
+            args=(["resume", "steps", "analysis"],)
         )
         if uploaded_file:
-            if PdfReader is None:
+            if not pypdf2_available():
                 st.error("PyPDF2 required: Install with `pip install PyPDF2`")
             else:
-                with st.spinner("📄 Extracting text from PDF..."):
-                    txt, err = extract_text_from_pdf(uploaded_file)
-                    if err:
-                        st.error(f"❌ Error: {err}")
-                    else:
-                        st.session_state["resume_text"] = txt
-                        st.success("✅ PDF extracted successfully!")
-                        with st.expander("👁️ Preview extracted text"):
-                            st.text_area(
-                                "Extracted Content", 
-                                value=st.session_state["resume_text"][:800] + "..." if len(st.session_state["resume_text"]) > 800 else st.session_state["resume_text"],
-                                height=150,
-                                key="preview_area"
-                            )
-    
+                # Extract once per upload, not on every run of this panel
+                extracted = st.session_state.get("pdf_extracted")
+                if extracted is None or extracted[0] != uploaded_file.file_id:
+                    with st.spinner("📄 Extracting text from PDF..."):
+                        live_preview = st.empty()
+                        streamed = []
+                        notes = []
+
+                        def show_page(page_text):
+                            streamed.append(page_text)
+                            with live_preview.container():
+                                st.caption(f"📄 {len(streamed)} page(s) extracted...")
+                                st.text("\n".join(streamed[:3])[:800])
+
+                        txt, err = extract_text_from_pdf(uploaded_file, on_page=show_page,
+                                                         on_truncated=notes.append)
+                        live_preview.empty()
+                    extracted = st.session_state["pdf_extracted"] = (uploaded_file.file_id, txt, err,
+                                                                     notes[0] if notes else None)
+                    if not err:
+                        set_resume_text(txt)
+                _, txt, err, note = extracted
+                if err:
+                    st.error(f"❌ Error: {err}")
+                elif note:
+                    st.warning(f"⚠️ {note}: the rest of the PDF was not extracted.")
+                else:
+                    st.success("✅ PDF extracted successfully!")
+                    with st.expander("👁️ Preview extracted text"):
+                        st.text_area(
+                            "Extracted Content",
+                            value=txt[:800] + "..." if len(txt) > 800 else txt,
+                            height=150,
+                            key="preview_area"
+                        )
+
+    # Text set from code (PDF, AI rewrite) replaces what the text area holds
+    if "resume_area_pending" in st.session_state:
+        st.session_state["resume_area"] = st.session_state.pop("resume_area_pending")
+
     # Text area for resume
     resume_text = st.text_area(
         "Paste your resume content:",
         height=300,
-        value=st.session_state["resume_text"],
         placeholder="""EXPERIENCE:
 • 2 years as Full Stack Developer
 • Built web applications using React & Node.js
@@ -889,54 +332,129 @@ SKILLS:
 EDUCATION:
 • B.Tech in Computer Science""",
         key="resume_area",
-        on_change=lambda: st.session_state.update({"resume_text": st.session_state.resume_area})
+        on_change=share,
+        args=("resume_text", "resume_area", "resume")
     )
-    
+
     # Update session state
     st.session_state["resume_text"] = resume_text
-    
+
     # Character count
     if st.session_state["resume_text"]:
         char_count = len(st.session_state["resume_text"])
         word_count = len(st.session_state["resume_text"].split())
         st.caption(f"📝 {char_count} characters, {word_count} words")
-    
+
+    # Live score: only edited paragraphs are re-analyzed on each rerun
+    if st.toggle("⚡ Live match score", key="live_score_on",
+                 help="Re-score against the job description after every edit"):
+        if not st.session_state["job_desc_input"].strip():
+            st.info("ℹ️ Add a job description to see a live score.")
+        elif st.session_state["resume_text"].strip():
+            if "live_resume" not in st.session_state:
+                st.session_state["live_resume"] = LiveResume()
+            live = st.session_state["live_resume"]
+            started = time.perf_counter()
+            live_score = live.match(st.session_state["resume_text"], st.session_state["job_desc_input"])[0]
+            _, (missing_tech, missing_soft) = live.overlap(st.session_state["job_desc_input"])
+            elapsed = time.perf_counter() - started
+
+            last_score = st.session_state.get("live_score_last")
+            if last_score is not None and last_score != live_score:
+                st.session_state["live_score_prev"] = last_score
+            st.session_state["live_score_last"] = live_score
+            prev_score = st.session_state.get("live_score_prev")
+            st.metric("⚡ Live Match", f"{live_score:.1f}%",
+                      delta=f"{live_score - prev_score:+.2f}" if prev_score is not None else None)
+
+            missing = [s for skills in missing_tech.values() for s in skills] + missing_soft
+            if missing:
+                st.caption("📚 Missing: " + ", ".join(missing[:6]))
+            st.caption(f"⏱️ Updated in {elapsed * 1000:.0f} ms")
+
     html('</div>')
-    
+
     # AI Improvement Section
-    if use_ai_rewrite:
+    if st.session_state.get("use_ai_rewrite"):
         html('<div class="premium-card">')
         st.subheader("🤖 AI Resume Improver")
-        
+
         target_role = st.text_input(
             "Target role (optional):",
             placeholder="e.g., Full Stack Developer",
             help="AI will tailor improvements for this role"
         )
-        
-        if st.button("✨ Improve with AI", use_container_width=True):
-            if not st.session_state["resume_text"]:
-                st.error("❌ Please add resume content first")
-            elif not openai_api_key:
-                st.error("🔑 OpenAI API key required")
-            else:
-                with st.spinner("🤖 AI is enhancing your resume..."):
-                    improved, err = ai_improve_resume(
-                        st.session_state["resume_text"], 
-                        openai_api_key, 
-                        target_role=target_role
+        by_section = st.checkbox(
+            "📑 Rewrite section by section",
+            value=True,
+            help="Sections are rewritten in parallel with their own length budgets, so long resumes come back complete"
+        )
+
+        ai_job = st.session_state.get("ai_job")
+        if ai_job is None:
+            if st.button("✨ Improve with AI", use_container_width=True):
+                openai_api_key = st.session_state.get("openai_api_key")
+                if not st.session_state["resume_text"]:
+                    st.error("❌ Please add resume content first")
+                elif not openai_api_key:
+                    st.error("🔑 OpenAI API key required")
+                else:
+                    ai_job = st.session_state["ai_job"] = start_rewrite(
+                        st.session_state["resume_text"],
+                        openai_api_key,
+                        target_role=target_role,
+                        by_section=by_section,
+                        session=st.session_state["session_id"]
                     )
-                    if err:
-                        st.error(f"❌ Error: {err}")
-                    else:
-                        st.session_state["resume_text"] = improved
-                        st.success("✅ Resume improved! Review below")
+        elif st.button("⏹️ Stop", use_container_width=True):
+            ai_job.cancel()
+            st.session_state.pop("ai_job")
+            ai_job = None
+            st.info("⏹️ AI rewrite stopped")
+
+        # The rewrite streams on a background thread; ai_progress polls it without
+        # holding this script run, and a rerun just re-attaches here
+        if ai_job is not None:
+            ai_progress()
+        if "ai_error" in st.session_state:
+            st.error(f"❌ Error: {st.session_state.pop('ai_error')}")
+        if "ai_notice" in st.session_state:
+            st.success(st.session_state.pop("ai_notice"))
         html('</div>')
 
-with tab2:
+@st.fragment(run_every=AI_POLL_SECONDS)
+def ai_progress():
+    ai_job = st.session_state.get("ai_job")
+    if ai_job is None:
+        return
+    ai_job.touch()
+    if not ai_job.done.is_set():
+        position = ai_job.queue_position
+        if position:
+            st.caption(f"⏳ Waiting for a free slot... you are #{position} in the queue")
+        else:
+            st.caption("🤖 AI is enhancing your resume...")
+        st.text(ai_job.text)
+        return
+
+    st.session_state.pop("ai_job", None)
+    improved, err = ai_job.wait()
+    if err:
+        st.session_state["ai_error"] = err
+    else:
+        set_resume_text(improved)
+        st.session_state["ai_notice"] = "✅ Resume improved! Review below"
+    # The new text feeds every panel (and the Stop button goes away), so this is a full rerun
+    st.rerun()
+
+# ----------------------------
+# Job description panel
+# ----------------------------
+@st.fragment(key="job")
+def job_panel():
     html('<div class="premium-card">')
     st.subheader("💼 Job Description Analysis")
-    
+
     job_desc_input = st.text_area(
         "Paste the job description:",
         height=300,
@@ -955,17 +473,18 @@ SOFT SKILLS:
 • Team player mentality
 • Problem-solving attitude""",
         key="job_area",
-        on_change=lambda: st.session_state.update({"job_desc_input": st.session_state.job_area})
+        on_change=share,
+        args=("job_desc_input", "job_area", "job")
     )
-    
+
     # Update session state
     st.session_state["job_desc_input"] = job_desc_input
-    
+
     if st.session_state["job_desc_input"]:
         char_count = len(st.session_state["job_desc_input"])
         word_count = len(st.session_state["job_desc_input"].split())
         st.caption(f"📋 {char_count} characters, {word_count} words")
-    
+
     # JD Analysis
     if st.button("🔍 Analyze Job Description", use_container_width=True):
         if not st.session_state["job_desc_input"]:
@@ -973,9 +492,9 @@ SOFT SKILLS:
         else:
             with st.spinner("🔍 Analyzing requirements..."):
                 jd_struct = analyze_job_description(st.session_state["job_desc_input"])
-                
+
                 col1, col2, col3, col4 = st.columns(4)
-                
+
                 with col1:
                     st.metric("🎯 Detected Job Title", jd_struct["title"])
                 with col2:
@@ -985,7 +504,7 @@ SOFT SKILLS:
                     st.metric("⚙️ Technical Skills", tech_skills_count)
                 with col4:
                     st.metric("🤝 Soft Skills", len(jd_struct["job_soft"]))
-                
+
                 # Skills breakdown
                 with st.expander("🔧 Technical Skills Breakdown"):
                     for cat, skills in jd_struct["job_tech"].items():
@@ -993,151 +512,219 @@ SOFT SKILLS:
                             st.write(f"**{cat}:**")
                             for skill in skills[:5]:  # Limit to 5 skills per category
                                 st.markdown(f'<span class="skill-tag">{skill}</span>', unsafe_allow_html=True)
-    
+
     html('</div>')
 
-with tab3:
+# ----------------------------
+# Analysis panel
+# ----------------------------
+def run_match_analysis(resume_text, job_desc_input):
+    """Score the match with a progress bar and keep everything the results view needs in session state."""
+    with st.spinner("🔍 Analyzing your resume match..."):
+        stage_labels = {
+            "skills": "Extracting skills",
+            "vectorize": "Comparing resume and job text",
+            "score": "Scoring the match",
+            "report": "Building the report",
+        }
+        stage_progress = st.progress(0.0, text=f"{stage_labels['skills']}...")
+        stage_timings = []
+
+        def show_stage(stage, seconds):
+            stage_timings.append((stage_labels[stage], seconds))
+            stage_progress.progress(
+                len(stage_timings) / len(stage_labels),
+                text=f"✓ {stage_labels[stage]} ({seconds * 1000:.0f} ms)"
+            )
+
+        score, rtech, rsoft, jtech, jsoft = calculate_ai_match(resume_text, job_desc_input, on_stage=show_stage)
+        (matched_tech, matched_soft), (missing_tech, missing_soft) = skill_overlap(resume_text, job_desc_input)
+        strong_list = [f"{cat}: {s}" for cat, matched in matched_tech.items() for s in matched]
+        strong_list += [f"Soft: {s}" for s in matched_soft]
+        missing_list = [f"{cat}: {s}" for cat, missing in missing_tech.items() for s in missing[:3]]
+        missing_list += [f"Soft: {s}" for s in missing_soft[:2]]
+
+        report_started = time.perf_counter()
+        jd_title = parse_job(job_desc_input).title
+        report_text = generate_text_report(score, strong_list, missing_list, job_title=jd_title)
+        show_stage("report", time.perf_counter() - report_started)
+        stage_progress.empty()
+
+    st.session_state.analysis_complete = True
+    st.session_state.current_step = 4
+    st.session_state.match_score = score
+    st.session_state.analysis_results = {
+        "rtech": rtech,
+        "rsoft": rsoft,
+        "jtech": jtech,
+        "jsoft": jsoft,
+        "inputs": (resume_text, job_desc_input),
+        "matched": (matched_tech, matched_soft),
+        "missing": (missing_tech, missing_soft),
+        "report": report_text,
+        "timings": stage_timings,
+    }
+
+def show_match_results(results):
+    score = st.session_state.match_score
+    matched_tech, matched_soft = results["matched"]
+    missing_tech, missing_soft = results["missing"]
+
+    # Display Results
+    st.markdown("---")
+
+    # Score Card
+    html('<div class="score-display">')
+    if score >= 80:
+        st.success(f"**🎉 EXCELLENT MATCH**")
+        st.info("Your resume strongly aligns with this job requirement!")
+    elif score >= 60:
+        st.warning(f"**👍 GOOD MATCH**")
+        st.info("Good foundation with some areas for improvement.")
+    else:
+        st.error(f"**📈 NEEDS IMPROVEMENT**")
+        st.info("Focus on developing the missing skills below.")
+
+    html(f'<div class="score-value">{score}%</div>')
+    html('<div class="score-label">Match Score</div>')
+    st.progress(score / 100)
+    html('</div>')
+
+    # Skills Analysis
+    col_left, col_right = st.columns(2)
+
+    with col_left:
+        html('<div class="premium-card">')
+        st.subheader("✅ Your Strong Points")
+        any_strong = False
+
+        for cat, matched in matched_tech.items():
+            if matched:
+                any_strong = True
+                st.write(f"**{cat}**")
+                for s in matched:
+                    st.markdown(f'<span class="skill-tag strong">✓ {s}</span>', unsafe_allow_html=True)
+
+        if matched_soft:
+            any_strong = True
+            st.write("**🤝 Soft Skills**")
+            for s in matched_soft:
+                st.markdown(f'<span class="skill-tag strong">✓ {s}</span>', unsafe_allow_html=True)
+
+        if not any_strong:
+            st.info("ℹ️ No strong matching points detected.")
+        html('</div>')
+
+    with col_right:
+        html('<div class="premium-card">')
+        st.subheader("📚 Improvement Areas")
+        any_missing = False
+
+        for cat, missing in missing_tech.items():
+            if missing:
+                any_missing = True
+                st.write(f"**{cat}**")
+                for s in missing[:3]:
+                    st.markdown(f'<span class="skill-tag improve">+ {s}</span>', unsafe_allow_html=True)
+
+        if missing_soft:
+            any_missing = True
+            st.write("**🤝 Soft Skills**")
+            for s in missing_soft[:2]:
+                st.markdown(f'<span class="skill-tag improve">+ {s}</span>', unsafe_allow_html=True)
+
+        if not any_missing:
+            st.success("🎉 Excellent! No major skill gaps found.")
+        html('</div>')
+
+    # Generate and Download Report
+    html('<div class="premium-card">')
+    st.subheader("📥 Download Report")
+    st.caption("⏱️ " + " • ".join(f"{label}: {seconds * 1000:.0f} ms" for label, seconds in results["timings"]))
+
+    # Create download button for text report
+    st.download_button(
+        "📄 Download Analysis Report",
+        data=results["report"],
+        file_name=f"resume_analysis_report.txt",
+        mime="text/plain",
+        use_container_width=True
+    )
+    html('</div>')
+
+@st.fragment(key="analysis")
+def analysis_panel():
     html('<div class="premium-card">')
     st.subheader("📊 Resume Match Analysis")
-    
-    if not st.session_state["resume_text"] or not st.session_state["job_desc_input"]:
+
+    resume_text = st.session_state["resume_text"]
+    job_desc_input = st.session_state["job_desc_input"]
+
+    if not resume_text.strip() or not job_desc_input.strip():
         st.warning("⚠️ Please add both resume content and job description to proceed with analysis.")
     else:
         st.success("✅ Ready for analysis! Click the button below to see how your resume matches the job requirements.")
-    
-    # Central analyze button
-    if st.button("🚀 Analyze Resume Match", type="primary", use_container_width=True):
-        resume_text = st.session_state.get("resume_text", "")
-        job_desc_input = st.session_state.get("job_desc_input", "")
-        
+
+    # Central analyze button; the step indicator moves on to "View Results"
+    if st.button("🚀 Analyze Resume Match", type="primary", use_container_width=True,
+                 on_click=st.rerun, args=(["analysis", "steps"],)):
         if not resume_text.strip():
             st.error("❌ Please provide your resume content")
         elif not job_desc_input.strip():
             st.error("❌ Please provide a job description")
         else:
-            with st.spinner("🔍 Analyzing your resume match..."):
-                time.sleep(1)
-                score, rtech, rsoft, jtech, jsoft = calculate_ai_match(resume_text, job_desc_input)
-                st.session_state.analysis_complete = True
-                st.session_state.current_step = 4
-                st.session_state.match_score = score
-                st.session_state.analysis_results = {
-                    "rtech": rtech,
-                    "rsoft": rsoft,
-                    "jtech": jtech,
-                    "jsoft": jsoft
-                }
-                
-                # Display Results
-                st.markdown("---")
-                
-                # Score Card
-                html('<div class="score-display">')
-                if score >= 80:
-                    st.success(f"**🎉 EXCELLENT MATCH**")
-                    st.info("Your resume strongly aligns with this job requirement!")
-                elif score >= 60:
-                    st.warning(f"**👍 GOOD MATCH**")
-                    st.info("Good foundation with some areas for improvement.")
-                else:
-                    st.error(f"**📈 NEEDS IMPROVEMENT**")
-                    st.info("Focus on developing the missing skills below.")
-                
-                html(f'<div class="score-value">{score}%</div>')
-                html('<div class="score-label">Match Score</div>')
-                st.progress(score / 100)
-                html('</div>')
-                
-                # Skills Analysis
-                col_left, col_right = st.columns(2)
-                strong_list, missing_list = [], []
-                
-                with col_left:
-                    html('<div class="premium-card">')
-                    st.subheader("✅ Your Strong Points")
-                    any_strong = False
-                    
-                    for cat in rtech:
-                        matched = set(rtech[cat]) & set(jtech[cat])
-                        if matched:
-                            any_strong = True
-                            st.write(f"**{cat}**")
-                            for s in matched:
-                                strong_list.append(f"{cat}: {s}")
-                                st.markdown(f'<span class="skill-tag strong">✓ {s}</span>', unsafe_allow_html=True)
-                    
-                    matched_soft = set(rsoft) & set(jsoft)
-                    if matched_soft:
-                        any_strong = True
-                        st.write("**🤝 Soft Skills**")
-                        for s in matched_soft:
-                            strong_list.append(f"Soft: {s}")
-                            st.markdown(f'<span class="skill-tag strong">✓ {s}</span>', unsafe_allow_html=True)
-                    
-                    if not any_strong:
-                        st.info("ℹ️ No strong matching points detected.")
-                    html('</div>')
-                
-                with col_right:
-                    html('<div class="premium-card">')
-                    st.subheader("📚 Improvement Areas")
-                    any_missing = False
-                    
-                    for cat in jtech:
-                        missing = set(jtech[cat]) - set(rtech[cat])
-                        if missing:
-                            any_missing = True
-                            st.write(f"**{cat}**")
-                            for s in list(missing)[:3]:
-                                missing_list.append(f"{cat}: {s}")
-                                st.markdown(f'<span class="skill-tag improve">+ {s}</span>', unsafe_allow_html=True)
-                    
-                    missing_soft = set(jsoft) - set(rsoft)
-                    if missing_soft:
-                        any_missing = True
-                        st.write("**🤝 Soft Skills**")
-                        for s in list(missing_soft)[:2]:
-                            missing_list.append(f"Soft: {s}")
-                            st.markdown(f'<span class="skill-tag improve">+ {s}</span>', unsafe_allow_html=True)
-                    
-                    if not any_missing:
-                        st.success("🎉 Excellent! No major skill gaps found.")
-                    html('</div>')
-                
-                # Generate and Download Report
-                html('<div class="premium-card">')
-                st.subheader("📥 Download Report")
-                
-                jd_title = analyze_job_description(job_desc_input)['title']
-                report_text = generate_text_report(score, strong_list, missing_list, job_title=jd_title)
-                
-                # Create download button for text report
-                st.download_button(
-                    "📄 Download Analysis Report",
-                    data=report_text,
-                    file_name=f"resume_analysis_report.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
-                html('</div>')
-    
+            run_match_analysis(resume_text, job_desc_input)
+
+    # Results stay up until the resume or job description they were computed for changes
+    if analysis_is_current(st.session_state):
+        show_match_results(st.session_state.analysis_results)
+    elif st.session_state.analysis_results:
+        st.info("ℹ️ Your resume or the job description changed since the last analysis. Analyze again to update the results.")
+
     html('</div>')
 
+# Main Content Area with Premium Tabs
+tab1, tab2, tab3 = st.tabs(["📝 Resume", "💼 Job Description", "📊 Analysis"])
+
+with tab1:
+    resume_panel()
+
+with tab2:
+    job_panel()
+
+with tab3:
+    analysis_panel()
+
+if show_diagnostics:
+    with st.sidebar:
+        with st.expander("🩺 Diagnostics", expanded=True):
+            summary = metrics.summary()
+            if summary:
+                st.caption("Per stage, over the last few hundred calls (ms)")
+                st.dataframe([
+                    {"stage": stage, "calls": s["count"], "errors": s["errors"],
+                     "p50": round(s["p50"] * 1000, 2), "p95": round(s["p95"] * 1000, 2)}
+                    for stage, s in summary.items()
+                ], hide_index=True, use_container_width=True)
+                st.caption("Most recent")
+                st.dataframe([
+                    {"stage": e["stage"], "ms": round(e["seconds"] * 1000, 2), "size": e["size"], "ok": e["ok"]}
+                    for e in metrics.recent(15)
+                ], hide_index=True, use_container_width=True)
+            else:
+                st.caption("No timings yet — run an analysis.")
+            queue = get_scheduler().stats()
+            st.caption(f"OpenAI queue: {queue['running']} running, {queue['waiting']} waiting")
+            st.caption("Caches")
+            st.dataframe([{"cache": name, **cache.stats()} for name, cache in sorted(named_caches().items())],
+                         hide_index=True, use_container_width=True)
+
 # Premium Footer
 html("""
-<div style='
-    text-align:center; 
-    color:#64748b; 
-    margin-top:3rem; 
-    padding:2rem; 
-    background:white;
-    border-radius:16px;
-    border:1px solid #e2e8f0;
-    box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
-'>
-    <div style='font-weight:700; margin-bottom:0.5rem; font-size:1.25rem; color:#1e293b;'>ResumeMatch Pro</div>
-    <div style='font-size:0.95rem; margin-bottom:0.5rem; color:#64748b;'>Professional Resume Analysis Tool</div>
-    <div style='font-size:0.85rem; color:#94a3b8;'>Built for Career Success • Powered by AI</div>
-    <div style='font-size:0.85rem; color:#94a3b8; margin-top:0.5rem;'>© 2025 ResumeMatch Pro. All rights reserved.</div>
+<div class="app-footer">
+    <div class="footer-title">ResumeMatch Pro</div>
+    <div class="footer-subtitle">Professional Resume Analysis Tool</div>
+    <div class="footer-note">Built for Career Success • Powered by AI</div>
+    <div class="footer-note">© 2025 ResumeMatch Pro. All rights reserved.</div>
 </div>
-""")
\ No newline at end of file
+""")
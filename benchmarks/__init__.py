@@ -0,0 +1,4 @@
+"""Benchmarks for the scoring pipeline on synthetic resumes, job descriptions and PDFs.
+
+See benchmarks/run.py; run with ``python -m benchmarks``.
+"""
@@ -0,0 +1,188 @@
+"""A local stand-in for the OpenAI chat completions endpoint.
+
+    python -m benchmarks.fake_openai --port 8199 --latency 0.5 --token-delay 0.02
+
+    OPENAI_API_BASE=http://127.0.0.1:8199/v1 streamlit run app.py
+
+It answers POST /v1/chat/completions with a canned rewrite of the prompt
+after `latency` seconds, word by word as server-sent events when the
+request asks for a stream (`token_delay` seconds apart), and counts the
+requests it has served. The first `fail_first` requests get a 503, to
+exercise retries, and with `rate_limit` more than that many requests in
+any `window` seconds get a 429 with a Retry-After header, like OpenAI's
+per-minute limits. This lets the AI improver's streaming, retries,
+caching, coalescing and scheduling be checked without an API key or
+network access. Any API key is accepted.
+
+    python -m benchmarks.fake_openai --rate-limit 5 --window 10 --latency 1
+"""
+import argparse
+import json
+import math
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeOpenAI:
+    def __init__(self, port=0, latency=0.0, host="127.0.0.1", token_delay=0.0, fail_first=0,
+                 rate_limit=0, window=60.0):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.fail_first = fail_first
+        self.rate_limit = rate_limit
+        self.window = window
+        self.requests = 0
+        self.rate_limited = 0
+        self.max_concurrent = 0
+        self._active = 0
+        self._accepted = deque()
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+
+    @property
+    def api_base(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name="fake-openai", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _admit(self):
+        """None if a request may go ahead now, else seconds to wait (for a 429)."""
+        if not self.rate_limit:
+            return None
+        now = time.monotonic()
+        while self._accepted and now - self._accepted[0] >= self.window:
+            self._accepted.popleft()
+        if len(self._accepted) >= self.rate_limit:
+            self.rate_limited += 1
+            return self.window - (now - self._accepted[0])
+        self._accepted.append(now)
+        return None
+
+    def reply(self, body):
+        """The completion text for a request body."""
+        prompt = body["messages"][-1]["content"]
+        resume = prompt.split("\n\n", 1)[-1].rsplit("\n\n", 1)[0]
+        return f"IMPROVED ({body.get('model')}):\n{resume.strip()}"
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                with fake._lock:
+                    fake.requests += 1
+                    number = fake.requests
+                    retry_after = fake._admit()
+                if retry_after is not None:
+                    self._send_json({"error": {"message": "Rate limit reached for requests", "type": "requests",
+                                               "code": "rate_limit_exceeded"}},
+                                    status=429, headers={"Retry-After": str(math.ceil(retry_after))})
+                    return
+                with fake._lock:
+                    fake._active += 1
+                    fake.max_concurrent = max(fake.max_concurrent, fake._active)
+                try:
+                    self._respond(number, body)
+                finally:
+                    with fake._lock:
+                        fake._active -= 1
+
+            def _respond(self, number, body):
+                time.sleep(fake.latency)
+                if number <= fake.fail_first:
+                    self._send_json({"error": {"message": "The server is overloaded", "type": "server_error"}},
+                                    status=503)
+                    return
+                text = fake.reply(body)
+                if body.get("stream"):
+                    self._stream(number, body.get("model"), text)
+                    return
+                self._send_json({
+                    "id": f"chatcmpl-fake-{number}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": text}}],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": len(text.split()),
+                              "total_tokens": len(text.split())},
+                })
+
+            def _stream(self, number, model, text):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                words = text.split(" ")
+                try:
+                    for i, word in enumerate(words):
+                        delta = {"content": word if i == 0 else " " + word}
+                        self._event({"id": f"chatcmpl-fake-{number}", "object": "chat.completion.chunk",
+                                     "model": model, "choices": [{"index": 0, "delta": delta,
+                                                                  "finish_reason": None}]})
+                        time.sleep(fake.token_delay)
+                    self._event({"id": f"chatcmpl-fake-{number}", "object": "chat.completion.chunk",
+                                 "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+                    self.wfile.write(b"data: [DONE]\n\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _event(self, payload):
+                self.wfile.write(b"data: " + json.dumps(payload).encode("utf-8") + b"\n\n")
+                self.wfile.flush()
+
+            def _send_json(self, payload, status=200, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fake_openai", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8199)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before each response")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed words")
+    parser.add_argument("--fail-first", type=int, default=0, help="answer this many requests with a 503")
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests allowed per window (0: no limit)")
+    parser.add_argument("--window", type=float, default=60.0, help="rate-limit window in seconds")
+    args = parser.parse_args(argv)
+
+    fake = FakeOpenAI(args.port, args.latency, args.host, args.token_delay, args.fail_first,
+                      args.rate_limit, args.window)
+    print(f"fake OpenAI at {fake.api_base}", flush=True)
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
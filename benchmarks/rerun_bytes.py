@@ -0,0 +1,192 @@
+"""Bytes sent and script time spent by the Streamlit server per interaction with app.py.
+
+    python -m benchmarks.rerun_bytes
+    python -m benchmarks.rerun_bytes --inline-css --min-cached-size 10000   # Streamlit defaults
+
+The app is driven headlessly with streamlit.testing and every ForwardMsg it
+produces is serialized and counted, as it would be written to the
+websocket; the time is the script's own, as Streamlit reports it in its
+page profile. The browser is simulated the way it talks to the server:
+
+* A widget inside an st.fragment reruns just that fragment; the last
+  column lists the fragments that ran, or "whole page" for a full run.
+* After a run, every cacheable message counts as held by the client, the
+  way a real browser reports it back with each rerun. Unchanged cached
+  elements are then sent as short hash references.
+
+Static files (the stylesheet) are fetched over HTTP separately and cached by
+the browser, so they are not included.
+"""
+import argparse
+import os
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME = """EXPERIENCE:
+• 3 years as Backend Developer building REST APIs with Python and Django
+• Deployed services on AWS with Docker and Kubernetes
+
+SKILLS:
+• Python, SQL, PostgreSQL, Docker, AWS, Git
+• Communication, teamwork, leadership"""
+JOB = "JOB TITLE: Backend Engineer\nPython, Django, PostgreSQL, Kubernetes, AWS, communication, leadership"
+
+
+@contextmanager
+def _recording():
+    """Yield a list that collects `(type, size, fragment_id, widget_id, exec_us)` for every message sent."""
+    from streamlit.runtime.scriptrunner_utils import script_run_context
+
+    context_class = script_run_context.ScriptRunContext
+    original = context_class.enqueue
+    sent = []
+    client_cache = set()
+
+    def enqueue(self, msg):
+        self.cached_message_hashes = frozenset(client_cache)
+        forward = self._enqueue
+        fragment_id, widget_id, exec_us = "", "", 0
+        if msg.WhichOneof("type") == "page_profile":
+            exec_us = msg.page_profile.exec_time
+        elif msg.WhichOneof("type") == "delta":
+            fragment_id = msg.delta.fragment_id
+            if msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                widget_id = getattr(getattr(element, element.WhichOneof("type")), "id", "")
+
+        def record(out):
+            sent.append((out.WhichOneof("type"), len(out.SerializeToString()), fragment_id, widget_id, exec_us))
+            # The test harness has no message cache, so it still gets the full element
+            return forward(msg)
+
+        self._enqueue = record
+        try:
+            original(self, msg)
+        finally:
+            self._enqueue = forward
+        if msg.metadata.cacheable:
+            client_cache.add(msg.hash)
+
+    context_class.enqueue = enqueue
+    try:
+        yield sent
+    finally:
+        context_class.enqueue = original
+
+
+@contextmanager
+def _fragment_run(fragment_id):
+    """Make the next AppTest run a rerun of one fragment, as the browser requests it."""
+    from functools import partial
+    from streamlit.testing.v1 import local_script_runner
+
+    original = local_script_runner.RerunData
+    local_script_runner.RerunData = partial(original, fragment_id=fragment_id)
+    try:
+        yield
+    finally:
+        local_script_runner.RerunData = original
+
+
+class Browser:
+    """One browser tab: the widgets it shows and which fragment each belongs to."""
+
+    def __init__(self, app_path, sent):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(app_path, default_timeout=60)
+        self.sent = sent
+        self.widgets = {}
+        self.fragment_of = {}
+
+    def load(self):
+        self._run(None, None)
+
+    def widget(self, name):
+        """A widget on the page by key or label."""
+        return self.widgets[name]
+
+    def interact(self, name, action):
+        from streamlit.proto.WidgetStates_pb2 import WidgetStates
+
+        element = self.widget(name)
+        action(element)
+        # Like the browser, send the value of every widget on the page
+        states = WidgetStates()
+        states.widgets.extend(widget._widget_state for widget in self.widgets.values())
+        self._run(states, self.fragment_of.get(element.id))
+
+    def panels(self):
+        """Keys of the fragments that sent something in the last run, [] after a full run."""
+        if any(kind == "delta" and not fragment_id for kind, _, fragment_id, _, _ in self.sent):
+            return []
+        storage = self.at._fragment_storage
+        ran = {fragment_id for _, _, fragment_id, _, _ in self.sent}
+        return sorted(key for key, ids in storage._ids_by_target_key.items() if ran & set(ids))
+
+    def _run(self, widget_states, fragment_id):
+        from streamlit.testing.v1.element_tree import Widget
+
+        with _fragment_run(fragment_id):
+            self.at._run(widget_states)
+        if self.at.exception:
+            raise RuntimeError(self.at.exception)
+        ran = {fragment for kind, _, fragment, _, _ in self.sent if kind == "delta"}
+        for _, _, fragment, widget_id, _ in self.sent:
+            if widget_id:
+                self.fragment_of[widget_id] = fragment or None
+        # A fragment run only replaces that fragment; the rest of the page stays as it was
+        self.widgets = {name: widget for name, widget in self.widgets.items()
+                        if "" not in ran and self.fragment_of.get(widget.id) not in ran}
+        for node in self.at._tree:
+            if isinstance(node, Widget):
+                self.widgets[node.key or node.label] = node
+
+
+def scenarios():
+    yield "first load", lambda b: b.load()
+    yield "rerun, nothing changed", lambda b: b.load()
+    yield "paste resume", lambda b: b.interact("resume_area", lambda w: w.input(RESUME))
+    yield "paste job description", lambda b: b.interact("job_area", lambda w: w.input(JOB))
+    yield "edit job description", lambda b: b.interact("job_area", lambda w: w.input(JOB + ", Go"))
+    yield "analyze match", lambda b: b.interact("🚀 Analyze Resume Match", lambda w: w.click())
+    yield "edit job after analysis", lambda b: b.interact("job_area", lambda w: w.input(JOB + ", Rust"))
+    yield "edit job again", lambda b: b.interact("job_area", lambda w: w.input(JOB + ", Rust, Go"))
+    yield "switch input method", lambda b: b.interact("Select input method:", lambda w: w.set_value("Upload PDF"))
+
+
+def measure(app_path, inline_css=False, min_cached_size=None):
+    from streamlit import config
+
+    if inline_css:
+        config.set_option("server.enableStaticServing", False)
+    if min_cached_size is not None:
+        config.set_option("global.minCachedMessageSize", min_cached_size)
+
+    results = []
+    with _recording() as sent:
+        browser = Browser(app_path, sent)
+        for name, step in scenarios():
+            del sent[:]
+            step(browser)
+            results.append((name, len(sent), sum(message[1] for message in sent),
+                            sum(message[4] for message in sent) / 1e6, browser.panels()))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.rerun_bytes", description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--inline-css", action="store_true", help="send the stylesheet inline, as without static serving")
+    parser.add_argument("--min-cached-size", type=float, help="override global.minCachedMessageSize")
+    args = parser.parse_args(argv)
+
+    # Pick up the repo's .streamlit/config.toml
+    os.chdir(ROOT)
+    for name, messages, size, elapsed, panels in measure(args.app, args.inline_css, args.min_cached_size):
+        print(f"{name:26} {messages:4} messages  {size:8,} bytes  {elapsed * 1000:7.1f} ms  "
+              f"{', '.join(panels) or 'whole page'}")
+
+
+if __name__ == "__main__":
+    main()
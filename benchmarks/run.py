@@ -0,0 +1,210 @@
+"""Run the benchmarks, write the results and compare them with a baseline.
+
+    python -m benchmarks                          # full run, table on stdout
+    python -m benchmarks --quick -o results.json
+    python -m benchmarks --check benchmarks/baseline.json
+    python -m benchmarks --save-baseline benchmarks/baseline.json
+
+Every case is run once to warm up (imports, compiled taxonomy), then
+repeatedly with the content caches cleared, so each run pays for the full
+computation. Latency percentiles come from the timed runs; peak memory is
+the tracemalloc peak of one extra run (Python allocations in this process
+only, so PDF pages parsed in pool workers are not included).
+
+--check compares the fastest run and peak memory of each case with the
+baseline. The fastest run is the least disturbed by whatever else the
+machine is doing, so it is a steadier signal than the percentiles.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.synthetic import synthetic_job, synthetic_pdf, synthetic_resume
+
+TEXT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+PDF_PAGES = [1, 10, 100, 500]
+QUICK_TEXT_SIZES = [1_000, 10_000, 100_000]
+QUICK_PDF_PAGES = [1, 10]
+JOB_SIZE = 4_000
+
+MIN_RUNS = 5
+MAX_RUNS = 50
+# Stop repeating a case once it has used this many seconds
+CASE_BUDGET = 3.0
+# Timing differences below this are noise, whatever the ratio
+NOISE_MS = 2.0
+NOISE_MB = 0.5
+
+
+def _label(size):
+    if size >= 1_000_000:
+        return f"{size // 1_000_000}MB"
+    return f"{size // 1_000}KB"
+
+
+def _clear_caches():
+    from resume_analyzer.features import resume_cache
+    from resume_analyzer.jobs import job_cache
+    from resume_analyzer.pdf import pdf_text_cache
+
+    pdf_text_cache.clear()
+    job_cache.clear()
+    resume_cache.clear()
+
+
+# ----------------------------
+# Cases
+# ----------------------------
+def cases(text_sizes, pdf_pages):
+    """Yield `(name, run, units, unit_name)`; `run()` does one measured call."""
+    from resume_analyzer.jobs import analyze_job_description, parse_job
+    from resume_analyzer.matching import calculate_ai_match, skill_gaps
+    from resume_analyzer.pdf import extract_text_from_pdf
+    from resume_analyzer.report import generate_text_report
+    from resume_analyzer.skills import extract_skills_advanced
+
+    for pages in pdf_pages:
+        pdf = synthetic_pdf(pages)
+
+        def run(pdf=pdf):
+            text, err = extract_text_from_pdf(pdf, max_pages=0, max_chars=0)
+            if err:
+                raise RuntimeError(err)
+        yield f"extract_text_from_pdf/{pages}p", run, pages, "pages"
+
+    job = synthetic_job(JOB_SIZE)
+    for size in text_sizes:
+        resume = synthetic_resume(size, seed=size)
+        jd = synthetic_job(size, seed=size)
+        mb = len(resume.encode("utf-8")) / 1e6
+
+        yield f"extract_skills_advanced/{_label(size)}", lambda r=resume: extract_skills_advanced(r), mb, "MB"
+        yield f"analyze_job_description/{_label(size)}", lambda j=jd: analyze_job_description(j), mb, "MB"
+        yield f"calculate_ai_match/{_label(size)}", lambda r=resume: calculate_ai_match(r, job), mb, "MB"
+
+        score = calculate_ai_match(resume, job)[0]
+        matched, missing = skill_gaps(resume, job)
+        title = parse_job(job).title
+        yield (f"generate_text_report/{_label(size)}",
+               lambda s=score, m=matched, g=missing: generate_text_report(s, m, g, title), 1, "reports")
+
+
+def _percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(run, units, unit_name):
+    _clear_caches()
+    run()
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < MAX_RUNS and (len(timings) < MIN_RUNS or time.perf_counter() - started < CASE_BUDGET):
+        _clear_caches()
+        t = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - t)
+    timings.sort()
+
+    _clear_caches()
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    p50 = _percentile(timings, 50)
+    return {
+        "runs": len(timings),
+        "min_ms": round(timings[0] * 1000, 3),
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(_percentile(timings, 95) * 1000, 3),
+        "p99_ms": round(_percentile(timings, 99) * 1000, 3),
+        "throughput": round(units / p50, 3) if p50 else None,
+        "throughput_unit": f"{unit_name}/s",
+        "peak_mb": round(peak / 1e6, 3),
+    }
+
+
+def run_all(text_sizes, pdf_pages, pattern="*", progress=None):
+    results = {}
+    for name, run, units, unit_name in cases(text_sizes, pdf_pages):
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        results[name] = measure(run, units, unit_name)
+        if progress:
+            progress(name, results[name])
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+# ----------------------------
+# Baseline comparison
+# ----------------------------
+def compare(results, baseline, tolerance):
+    """Return a list of regression messages (empty if none)."""
+    failures = []
+    for name, base in baseline["results"].items():
+        current = results["results"].get(name)
+        if current is None:
+            continue
+        for key, noise in (("min_ms", NOISE_MS), ("peak_mb", NOISE_MB)):
+            limit = base[key] * (1 + tolerance) + noise
+            if current[key] > limit:
+                failures.append(f"{name}: {key} {current[key]} > {limit:.3f} "
+                                f"(baseline {base[key]}, tolerance {tolerance:.0%})")
+    return failures
+
+
+def _print_row(name, result):
+    print(f"{name:40} min {result['min_ms']:10.2f} ms  p50 {result['p50_ms']:10.2f} ms  p95 {result['p95_ms']:10.2f} ms  "
+          f"p99 {result['p99_ms']:10.2f} ms  {result['throughput']:10.2f} {result['throughput_unit']:8}  "
+          f"peak {result['peak_mb']:8.2f} MB", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="skip the 1MB texts and 100+ page PDFs")
+    parser.add_argument("-k", "--only", default="*", help="run cases matching this glob, e.g. 'calculate_*'")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--check", metavar="BASELINE", help="exit 1 if slower / bigger than this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="allowed relative increase over the baseline (default 0.3)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results as the new baseline")
+    args = parser.parse_args(argv)
+
+    text_sizes = QUICK_TEXT_SIZES if args.quick else TEXT_SIZES
+    pdf_pages = QUICK_PDF_PAGES if args.quick else PDF_PAGES
+    results = run_all(text_sizes, pdf_pages, args.only, progress=_print_row)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.check:
+        with open(args.check, encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = compare(results, baseline, args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+        print(f"no regressions against {args.check}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
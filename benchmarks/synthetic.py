@@ -0,0 +1,133 @@
+"""Deterministic synthetic resumes, job descriptions and PDFs.
+
+Texts are built from the skill taxonomy plus resume-style filler, so skill
+matching, n-gram analysis and scoring see realistic input. The same
+arguments always produce the same bytes.
+"""
+import random
+
+from resume_analyzer.taxonomy import DEFAULT_TAXONOMY_PATH, load_taxonomy
+
+VERBS = ["Built", "Designed", "Led", "Shipped", "Maintained", "Migrated", "Optimized",
+         "Automated", "Mentored", "Owned", "Scaled", "Refactored", "Launched", "Improved"]
+OBJECTS = ["a customer-facing dashboard", "the payments service", "an internal analytics platform",
+           "our CI/CD pipeline", "a recommendation engine", "the mobile onboarding flow",
+           "a multi-tenant REST API", "the data warehouse", "an event-driven billing system",
+           "the search backend", "a real-time notification service", "legacy reporting jobs"]
+RESULTS = ["cutting latency by {n}%", "serving {n}k daily users", "reducing costs by {n}%",
+           "raising test coverage to {n}%", "with {n} engineers", "across {n} regions",
+           "improving conversion by {n}%", "handling {n}M events per day"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries",
+             "Wayne Enterprises", "Hooli", "Pied Piper", "Vandelay Imports", "Soylent Systems"]
+TITLES = ["Software Engineer", "Backend Developer", "Full Stack Developer", "Data Scientist",
+          "DevOps Engineer", "Mobile Developer", "Machine Learning Engineer", "Frontend Developer"]
+JD_PHRASES = ["Experience with {skill} in production", "Strong knowledge of {skill}",
+              "Hands-on {skill} experience", "Familiarity with {skill} is a plus",
+              "{n}+ years working with {skill}", "Ability to design systems using {skill}"]
+BOILERPLATE = ("We are an equal opportunity employer and value diversity. We offer competitive "
+               "compensation, flexible working hours, health benefits and a learning budget.")
+
+_skills = None
+
+
+def taxonomy_skills():
+    """`(tech skill names, soft skill names)` from the default taxonomy."""
+    global _skills
+    if _skills is None:
+        taxonomy = load_taxonomy(DEFAULT_TAXONOMY_PATH)
+        tech = sorted({entry.name for entries in taxonomy.tech.values() for entry in entries}, key=str.lower)
+        soft = sorted((entry.name for entry in taxonomy.soft), key=str.lower)
+        _skills = tech, soft
+    return _skills
+
+
+def _bullet(rng, tech):
+    result = rng.choice(RESULTS).format(n=rng.randint(2, 90))
+    return (f"• {rng.choice(VERBS)} {rng.choice(OBJECTS)} with {rng.choice(tech)} and "
+            f"{rng.choice(tech)}, {result}")
+
+
+def synthetic_resume(size_bytes, seed=0):
+    """A resume of roughly `size_bytes` UTF-8 bytes (at least one section)."""
+    rng = random.Random(seed)
+    tech, soft = taxonomy_skills()
+    known = rng.sample(tech, min(len(tech), 12))
+    name = f"Candidate {seed}"
+    lines = [name.upper(), f"{rng.choice(TITLES)} | candidate{seed}@example.com", "",
+             "SUMMARY:",
+             f"{rng.choice(TITLES)} with {rng.randint(1, 15)} years of experience in "
+             f"{', '.join(known[:4])}. Known for {' and '.join(rng.sample(soft, 2))}.", ""]
+    size = sum(len(line) + 1 for line in lines)
+    job = 0
+    while size < size_bytes:
+        job += 1
+        block = ["EXPERIENCE:"] if job == 1 else []
+        block += [f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({2024 - job * 2}-{2026 - job * 2})"]
+        block += [_bullet(rng, known) for _ in range(rng.randint(3, 6))]
+        block += [""]
+        lines += block
+        size += sum(len(line) + 1 for line in block)
+    lines += ["SKILLS:", "• " + ", ".join(known), "• " + ", ".join(rng.sample(soft, 3)), "",
+              "EDUCATION:", "• B.Tech in Computer Science"]
+    return "\n".join(lines)
+
+
+def synthetic_job(size_bytes, seed=0):
+    """A job description of roughly `size_bytes` UTF-8 bytes."""
+    rng = random.Random(10_000 + seed)
+    tech, soft = taxonomy_skills()
+    title = rng.choice(TITLES)
+    lines = [f"JOB TITLE: {title}", "", f"{rng.choice(COMPANIES)} is hiring a {title}.", "",
+             "REQUIREMENTS:"]
+    size = sum(len(line) + 1 for line in lines)
+    while size < size_bytes:
+        line = "• " + rng.choice(JD_PHRASES).format(skill=rng.choice(tech), n=rng.randint(1, 8))
+        if rng.random() < 0.2:
+            line = f"• Excellent {rng.choice(soft)} skills"
+        elif rng.random() < 0.05:
+            line = BOILERPLATE
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+# ----------------------------
+# PDF
+# ----------------------------
+def _pdf_string(text):
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def synthetic_pdf(pages, seed=0, lines_per_page=45):
+    """A `pages`-page text PDF (Helvetica, one resume line per text line)."""
+    # Helvetica's standard encoding has no bullet glyph
+    text = synthetic_resume(pages * lines_per_page * 90, seed).replace("•", "-")
+    text_lines = text.encode("latin-1", "replace").decode("latin-1").splitlines()
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        chunk = text_lines[page * lines_per_page:(page + 1) * lines_per_page] or [f"Page {page + 1}"]
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in chunk:
+            ops.append(f"{_pdf_string(line[:110])} Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
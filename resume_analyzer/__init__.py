@@ -0,0 +1,37 @@
+"""UI-independent building blocks for ResumeMatch Pro.
+
+The public functions are re-exported lazily, so ``import resume_analyzer``
+does not load scikit-learn, PyPDF2 or openai until they are actually used.
+"""
+import importlib
+
+_EXPORTS = {
+    "extract_skills_advanced": "resume_analyzer.skills",
+    "calculate_ai_match": "resume_analyzer.matching",
+    "match_many": "resume_analyzer.matching",
+    "rank_resumes": "resume_analyzer.matching",
+    "skill_gaps": "resume_analyzer.matching",
+    "skill_overlap": "resume_analyzer.matching",
+    "analyze_job_description": "resume_analyzer.jobs",
+    "parse_job": "resume_analyzer.jobs",
+    "resume_features": "resume_analyzer.features",
+    "extract_text_from_pdf": "resume_analyzer.pdf",
+    "iter_pdf_text": "resume_analyzer.pdf",
+    "ai_improve_resume": "resume_analyzer.ai",
+    "generate_text_report": "resume_analyzer.report",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
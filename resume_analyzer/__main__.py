@@ -0,0 +1,3 @@
+from resume_analyzer.cli import main
+
+main()
@@ -0,0 +1,454 @@
+"""OpenAI-backed resume rewriting.
+
+    job = start_rewrite(resume_text, api_key, target_role="Data Engineer")
+    while not job.done.wait(0.1):
+        show(job.text)           # streamed so far
+    improved, err = job.wait()
+
+A rewrite runs as a RewriteJob on a background thread and streams the
+completion, so callers can show text as it arrives and stay responsive.
+Each attempt gives up when nothing arrives for `timeout` seconds; attempts
+that fail before any text has arrived (rate limits, timeouts, connection
+and 5xx errors) are retried up to `retries` times with exponential backoff.
+A job stops when every caller waiting on it has cancelled it, or when
+nobody has polled it for ABANDON_AFTER seconds (e.g. the browser tab was
+closed). ai_improve_resume is the blocking form. Before each attempt a job
+waits for its turn in the process-wide scheduler.LLMScheduler, which
+enforces rate limits and per-session quotas; `queue_position` says where
+it stands meanwhile.
+
+With `by_section=True` the resume is split into its sections (see
+sections.py) and each one is rewritten as its own job, at most
+`concurrency` at a time, with a token budget sized to that section up
+front instead of one `max_tokens` for the whole document. Long resumes
+come back complete, in about the time of the slowest section. The part
+before the first heading (name, contact details) is kept as written.
+
+Rewrites are cached by (resume, target role, model, max_tokens,
+temperature, API base), so clicking "Improve with AI" again on the same input does
+not repeat the upstream call. Concurrent identical requests, e.g. from two
+sessions, share the one job that is already running. Only complete
+rewrites are cached.
+
+RESUME_ANALYZER_AI_CACHE_SIZE and RESUME_ANALYZER_AI_CACHE_TTL (seconds)
+bound the cache. `api_base` (or openai's OPENAI_API_BASE) points requests
+at another OpenAI-compatible endpoint, such as a local fake server.
+"""
+import os
+import random
+import threading
+import time
+
+from resume_analyzer import metrics
+from resume_analyzer.cache import ContentCache, content_key
+from resume_analyzer.scheduler import get_scheduler
+from resume_analyzer.sections import split_sections
+
+MODEL = "gpt-4o-mini"
+TEMPERATURE = 0.2
+TIMEOUT = 30.0
+RETRIES = 2
+BACKOFF = 1.0
+# Stop a job nobody has looked at for this long
+ABANDON_AFTER = 15.0
+SECTION_CONCURRENCY = 4
+SECTION_MIN_TOKENS = 150
+SECTION_MAX_TOKENS = 1500
+
+rewrite_cache = ContentCache(
+    maxsize=int(os.environ.get("RESUME_ANALYZER_AI_CACHE_SIZE", "256")),
+    ttl=float(os.environ.get("RESUME_ANALYZER_AI_CACHE_TTL", "3600")),
+    name="ai_rewrite",
+)
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+_RETRYABLE = ("RateLimitError", "APIConnectionError", "Timeout", "ServiceUnavailableError", "TryAgain")
+
+
+def _openai():
+    # Optional and slow to import, so only loaded when a rewrite is requested
+    try:
+        import openai
+    except Exception:
+        return None
+    return openai
+
+
+def rewrite_key(resume_text, target_role=None, model=MODEL, max_tokens=700, temperature=TEMPERATURE,
+                section=None, api_base=None):
+    # Different endpoints serve different models, so they never share a rewrite
+    parts = [content_key(resume_text or ""), target_role or "", model, str(max_tokens), repr(float(temperature)),
+             api_base or ""]
+    if section is not None:
+        parts.append(section)
+    return content_key("\0".join(parts))
+
+
+def _prompt(resume_text, target_role):
+    return f"""Improve this resume for {target_role or 'a professional role'}:
+
+{resume_text}
+
+Provide only the improved resume content:"""
+
+
+def _section_title(heading):
+    return heading.strip(" \t#*:").title()
+
+
+def _section_prompt(heading, body, target_role):
+    return f"""Improve the "{_section_title(heading)}" section of a resume for {target_role or 'a professional role'}:
+
+{body.strip()}
+
+Provide only the improved content of this section, without its heading:"""
+
+
+def section_budgets(sections):
+    """`max_tokens` for each section: its own length in tokens (~4 characters each) plus room to grow."""
+    return [min(SECTION_MAX_TOKENS, max(SECTION_MIN_TOKENS, len(section.body) * 3 // 8 + 64))
+            for section in sections]
+
+
+def _error_types(openai, names):
+    # openai.error only exists before openai 1.0; without it nothing matches
+    errors = getattr(openai, "error", None)
+    return tuple(getattr(errors, name) for name in names if hasattr(errors, name))
+
+
+def _timed_out(openai, error):
+    import requests
+
+    timeouts = _error_types(openai, ("Timeout",)) + (requests.exceptions.Timeout,)
+    return isinstance(error, timeouts) or "timed out" in str(error)
+
+
+def _rate_limited(openai, error):
+    return isinstance(error, _error_types(openai, ("RateLimitError",)))
+
+
+def _retry_after(error):
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _retryable(openai, error):
+    import requests
+
+    # Errors raised while reading a stream come straight from requests
+    if isinstance(error, _error_types(openai, _RETRYABLE) + (requests.exceptions.RequestException,)):
+        return True
+    return (isinstance(error, _error_types(openai, ("APIError",)))
+            and (getattr(error, "http_status", None) or 0) >= 500)
+
+
+class Cancelled(Exception):
+    pass
+
+
+class RewriteJob:
+    """One rewrite, streaming on a background thread.
+
+    `text` is what has arrived so far; `done` is set once the job has
+    finished, failed or been cancelled, and `wait()` then returns
+    `(text, error)` like ai_improve_resume.
+    """
+
+    def __init__(self, key, session=None, priority=0):
+        self.key = key
+        self.session = session
+        self.priority = priority
+        self.done = threading.Event()
+        self.error = None
+        self.attempts = 0
+        self.first_text_after = None
+        self._chunks = []
+        self._cancelled = threading.Event()
+        self._waiters = 1
+        self._seen = time.monotonic()
+        self._ticket = None
+
+    @property
+    def text(self):
+        return "".join(self._chunks)
+
+    @property
+    def queue_position(self):
+        """Place in the scheduler's queue while waiting for a turn, else 0."""
+        ticket = self._ticket
+        if ticket is None or self.done.is_set():
+            return 0
+        return get_scheduler().position(ticket)
+
+    def touch(self):
+        """Mark the job as still wanted; pollers call this regularly."""
+        self._seen = time.monotonic()
+
+    def cancel(self):
+        """Give up on this job; it stops once nobody else is waiting on it."""
+        with _jobs_lock:
+            self._waiters -= 1
+            if self._waiters > 0 or self.done.is_set():
+                return
+            self._cancelled.set()
+            if _jobs.get(self.key) is self:
+                del _jobs[self.key]
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.done.wait(1.0):
+            self.touch()
+            if deadline is not None and time.monotonic() > deadline:
+                return None, "OpenAI request is still running"
+        if self.error:
+            return None, self.error
+        return self.text.strip(), None
+
+    def _check(self):
+        if self._cancelled.is_set():
+            raise Cancelled()
+        if time.monotonic() - self._seen > ABANDON_AFTER:
+            self._cancelled.set()
+            raise Cancelled()
+
+    def _finish(self, error=None):
+        self.error = error
+        with _jobs_lock:
+            if _jobs.get(self.key) is self:
+                del _jobs[self.key]
+        self.done.set()
+
+    def _run(self, openai, request, timeout, retries, backoff):
+        started = time.perf_counter()
+        try:
+            scheduler = get_scheduler()
+            # Rough prompt size (~4 characters a token) plus the most it may generate
+            tokens = len(request["messages"][-1]["content"]) // 4 + request["max_tokens"]
+            for attempt in range(retries + 1):
+                self._check()
+                self.attempts = attempt + 1
+                self._ticket = scheduler.ticket(tokens, self.priority, self.session)
+                scheduler.wait(self._ticket, self._check)
+                metrics.record("ai.queue_wait", self._ticket.waited)
+                try:
+                    self._stream(openai, request, timeout, started)
+                    break
+                except Cancelled:
+                    raise
+                except Exception as e:
+                    error = e
+                finally:
+                    scheduler.release(self._ticket)
+                # Retrying after text has been shown would repeat it
+                if self._chunks or attempt == retries or not _retryable(openai, error):
+                    raise error
+                delay = backoff * 2 ** attempt * (0.5 + random.random())
+                if _rate_limited(openai, error):
+                    # Hold back every session, not just this job
+                    delay = _retry_after(error) or delay
+                    scheduler.pause(delay)
+                if self._cancelled.wait(delay):
+                    raise Cancelled()
+        except Cancelled:
+            self._finish("Cancelled")
+        except Exception as e:
+            try:
+                timed_out = _timed_out(openai, e)
+            except Exception:
+                timed_out = False
+            if timed_out:
+                self._finish(f"OpenAI request timed out (no response for {timeout:g}s)")
+            else:
+                self._finish(f"OpenAI request failed: {e}")
+        else:
+            rewrite_cache.put(self.key, self.text.strip())
+            self._finish()
+        finally:
+            # Whatever went wrong above, never leave callers waiting on a dead job
+            if not self.done.is_set():
+                self._finish("OpenAI request failed")
+            metrics.record("ai.rewrite", time.perf_counter() - started, None, self.error is None)
+
+    def _stream(self, openai, request, timeout, started):
+        resp = openai.ChatCompletion.create(stream=True, request_timeout=timeout, **request)
+        try:
+            for chunk in resp:
+                self._check()
+                choices = chunk.get("choices") or [{}]
+                text = (choices[0].get("delta") or {}).get("content")
+                if text:
+                    if not self._chunks:
+                        self.first_text_after = time.perf_counter() - started
+                        metrics.record("ai.first_text", self.first_text_after)
+                    self._chunks.append(text)
+        finally:
+            close = getattr(resp, "close", None)
+            if close:
+                close()
+
+
+class SectionedRewrite:
+    """Per-section RewriteJobs, at most `concurrency` running at once.
+
+    Has the same `text`, `done`, `wait()`, `touch()` and `cancel()` as a
+    RewriteJob; `text` is the resume reassembled in order from what each
+    section has produced so far.
+    """
+
+    def __init__(self, sections, start_section, concurrency):
+        self.sections = sections
+        self.done = threading.Event()
+        self.error = None
+        self.first_text_after = None
+        self._jobs = [None] * len(sections)
+        self._cancelled = threading.Event()
+        self._seen = time.monotonic()
+        threading.Thread(target=self._run, args=(start_section, concurrency), name="ai-sections",
+                         daemon=True).start()
+
+    @property
+    def text(self):
+        parts = []
+        for section, job in zip(self.sections, self._jobs):
+            if not section.heading:
+                parts.append(section.body.strip())
+            elif job is not None:
+                parts.append(f"{section.heading.strip()}\n{job.text.strip()}")
+        return "\n\n".join(parts)
+
+    touch = RewriteJob.touch
+    wait = RewriteJob.wait
+
+    @property
+    def queue_position(self):
+        positions = [job.queue_position for job in self._jobs if job is not None and not job.done.is_set()]
+        if not positions or 0 in positions:
+            return 0
+        return min(positions)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run(self, start_section, concurrency):
+        started = time.perf_counter()
+        pending = [i for i, section in enumerate(self.sections) if section.heading]
+        running = []
+        try:
+            while pending or running:
+                if self._cancelled.is_set() or time.monotonic() - self._seen > ABANDON_AFTER:
+                    self.error = "Cancelled"
+                    break
+                while pending and len(running) < concurrency:
+                    i = pending.pop(0)
+                    self._jobs[i] = start_section(i)
+                    running.append(i)
+                self._cancelled.wait(0.05)
+                for i in list(running):
+                    job = self._jobs[i]
+                    job.touch()
+                    if self.first_text_after is None and job.text:
+                        self.first_text_after = time.perf_counter() - started
+                    if job.done.is_set():
+                        running.remove(i)
+                        if job.error:
+                            self.error = f"{job.error} ({_section_title(self.sections[i].heading)} section)"
+                if self.error:
+                    break
+        except Exception as e:
+            self.error = f"OpenAI request failed: {e}"
+        finally:
+            for i in running:
+                self._jobs[i].cancel()
+            metrics.record("ai.rewrite_sections", time.perf_counter() - started, None, self.error is None)
+            self.done.set()
+
+
+def _finished(text=None, error=None):
+    job = RewriteJob(None)
+    if text is not None:
+        job._chunks.append(text)
+    job.error = error
+    job.done.set()
+    return job
+
+
+def start_rewrite(resume_text, openai_api_key, target_role=None, max_tokens=700, model=MODEL,
+                  temperature=TEMPERATURE, api_base=None, timeout=TIMEOUT, retries=RETRIES,
+                  backoff=BACKOFF, by_section=False, concurrency=SECTION_CONCURRENCY, session=None,
+                  priority=0):
+    """Start (or join) a rewrite and return its RewriteJob without waiting.
+
+    With `by_section`, returns a SectionedRewrite instead when the resume
+    has at least two sections; `max_tokens` then does not apply, since
+    every section gets its own budget. `session` identifies the caller for
+    the scheduler's per-session quotas; lower `priority` goes first.
+    """
+    openai = _openai()
+    if not openai:
+        return _finished(error="OpenAI package not installed")
+    if not openai_api_key:
+        return _finished(error="No OpenAI API key provided")
+
+    # The endpoint requests will actually go to, for the cache key
+    endpoint = api_base or getattr(openai, "api_base", None)
+    if by_section:
+        sections = split_sections(resume_text)
+        if sum(1 for section in sections if section.heading) >= 2:
+            budgets = section_budgets(sections)
+
+            def start_section(i):
+                heading, body = sections[i]
+                key = rewrite_key(body, target_role, model, budgets[i], temperature, section=heading,
+                                  api_base=endpoint)
+                return _start_job(openai, key, _section_prompt(heading, body, target_role), openai_api_key,
+                                  model, budgets[i], temperature, api_base, timeout, retries, backoff,
+                                  session, priority)
+            return SectionedRewrite(sections, start_section, concurrency)
+
+    key = rewrite_key(resume_text, target_role, model, max_tokens, temperature, api_base=endpoint)
+    return _start_job(openai, key, _prompt(resume_text, target_role), openai_api_key, model, max_tokens,
+                      temperature, api_base, timeout, retries, backoff, session, priority)
+
+
+def _start_job(openai, key, prompt, openai_api_key, model, max_tokens, temperature, api_base, timeout,
+               retries, backoff, session, priority):
+    improved = rewrite_cache.get(key)
+    if improved is not None:
+        return _finished(improved)
+
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is not None:
+            job._waiters += 1
+            job.touch()
+            return job
+        job = _jobs[key] = RewriteJob(key, session, priority)
+
+    # Per-request credentials, so concurrent sessions with different keys don't race
+    request = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "api_key": openai_api_key,
+    }
+    if api_base:
+        request["api_base"] = api_base
+    # The scheduler bounds how many of these threads are talking to OpenAI at once
+    threading.Thread(target=job._run, args=(openai, request, timeout, retries, backoff), name="ai-rewrite",
+                     daemon=True).start()
+    return job
+
+
+@metrics.timed("ai_improve_resume", returns_error=True)
+def ai_improve_resume(resume_text, openai_api_key, target_role=None, max_tokens=700,
+                      model=MODEL, temperature=TEMPERATURE, api_base=None, timeout=TIMEOUT,
+                      retries=RETRIES, by_section=False, concurrency=SECTION_CONCURRENCY):
+    """Rewrite a resume and return `(improved_text, error)` once it is complete."""
+    return start_rewrite(resume_text, openai_api_key, target_role, max_tokens, model, temperature,
+                         api_base, timeout, retries, by_section=by_section, concurrency=concurrency).wait()
@@ -0,0 +1,130 @@
+"""Content-addressed LRU cache with an optional on-disk tier."""
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+# Caches created with a name, reported by metrics.prometheus_text()
+_named = {}
+
+
+def content_key(data):
+    """Hex digest identifying `data` (bytes or str) by content."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class ContentCache:
+    """Bounded, thread-safe LRU keyed by content hashes.
+
+    When `disk_dir` is set, values are also pickled to
+    ``disk_dir/<key[:2]>/<key>.pkl`` and a memory miss falls back to disk
+    before counting as a miss. Only point `disk_dir` at a directory this
+    process owns, since entries are unpickled on read. With `ttl` (seconds),
+    entries older than that count as misses. A `name` registers the cache
+    for the metrics exporters.
+    """
+
+    def __init__(self, maxsize=128, disk_dir=None, name=None, ttl=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.disk_dir = disk_dir
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._stored = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if name:
+            _named[name] = self
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.pkl")
+
+    def _read_disk(self, key):
+        path = self._disk_path(key)
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+
+    def _write_disk(self, key, value):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def _remember(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.ttl is not None:
+            self._stored[key] = time.monotonic()
+        while len(self._data) > self.maxsize:
+            old_key, _ = self._data.popitem(last=False)
+            self._stored.pop(old_key, None)
+
+    def _expired(self, key):
+        if self.ttl is None or time.monotonic() - self._stored[key] <= self.ttl:
+            return False
+        del self._data[key]
+        del self._stored[key]
+        return True
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data and not self._expired(key):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+        if self.disk_dir:
+            value = self._read_disk(key)
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, value)
+                return value
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+        if self.disk_dir:
+            self._write_disk(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._stored.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+
+def named_caches():
+    """`{name: ContentCache}` of every cache created with a name."""
+    return dict(_named)
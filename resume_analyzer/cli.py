@@ -0,0 +1,290 @@
+"""Headless batch scoring of resumes against job descriptions.
+
+    python -m resume_analyzer score resumes/ --job backend.txt --job data.txt -o ranked.csv
+
+Every resume (PDF, .txt or .md) in the folder is scored against every job
+description with match_many, spread over a process pool, and the results
+are written ranked per job as CSV or JSON Lines. ``serve`` starts the HTTP
+API in resume_analyzer.service, ``index`` manages a persistent
+resume_analyzer.job_index and ``idf fit`` trains resume_analyzer.idf weights.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from resume_analyzer.features import VECTORIZERS
+from resume_analyzer.jobs import analyze_job_description
+from resume_analyzer.matching import match_many, skill_gaps
+from resume_analyzer.pdf import extract_text_from_pdf
+
+RESUME_EXTENSIONS = (".pdf", ".txt", ".md")
+FIELDS = ["job", "job_title", "rank", "resume", "score", "matched_skills", "missing_skills", "error"]
+
+_jobs = None
+_vectorizer = "exact"
+
+
+def _init_worker(jobs, vectorizer="exact"):
+    global _jobs, _vectorizer
+    _jobs = jobs
+    _vectorizer = vectorizer
+
+
+def read_resume(path):
+    """Return `(text, error)` for a resume file."""
+    if path.lower().endswith(".pdf"):
+        with open(path, "rb") as f:
+            # Already inside a worker process: don't fan out again per page.
+            return extract_text_from_pdf(f.read(), parallel=False)
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read(), None
+    except OSError as e:
+        return None, f"Failed to read resume: {e}"
+
+
+def score_resume(path, jobs=None, vectorizer=None):
+    """Score one resume file against `jobs` (`(name, title, text)` tuples)."""
+    jobs = jobs if jobs is not None else _jobs
+    vectorizer = vectorizer or _vectorizer
+    text, err = read_resume(path)
+    if err:
+        return [{"job": name, "job_title": title, "resume": path, "score": 0,
+                 "matched_skills": [], "missing_skills": [], "error": err}
+                for name, title, _ in jobs]
+
+    rows = []
+    results = match_many(text, [job_text for _, _, job_text in jobs], vectorizer=vectorizer)
+    for (name, title, job_text), (score, _, _, jtech, _) in zip(jobs, results):
+        matched, missing = skill_gaps(text, job_text) if jtech else ([], [])
+        rows.append({"job": name, "job_title": title, "resume": path, "score": float(score),
+                     "matched_skills": matched, "missing_skills": missing, "error": ""})
+    return rows
+
+
+def find_resumes(folder):
+    paths = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def job_names(paths):
+    """Name each job file by its path below the folder all of them share.
+
+    Files in one folder keep their plain file names; ``a/dev.txt`` and
+    ``b/dev.txt`` stay apart as such. The same file given twice is an error.
+    """
+    absolute = [os.path.abspath(path) for path in paths]
+    if len(set(absolute)) < len(absolute):
+        raise ValueError("The same job description file was given more than once")
+    parent = os.path.commonpath([os.path.dirname(path) for path in absolute])
+    return [os.path.relpath(path, parent) for path in absolute]
+
+
+def load_jobs(paths):
+    """`(name, title, text)` for each job description file; see job_names."""
+    jobs = []
+    for name, path in zip(job_names(paths), paths):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        jobs.append((name, analyze_job_description(text)["title"], text))
+    return jobs
+
+
+def score_folder(folder, jobs, workers=None, progress=None, vectorizer="exact"):
+    """Score every resume in `folder` against `jobs`, ranked per job."""
+    paths = find_resumes(folder)
+    workers = workers or os.cpu_count() or 1
+    rows = []
+    if workers == 1:
+        batches = (score_resume(path, jobs, vectorizer) for path in paths)
+        for done, batch in enumerate(batches, 1):
+            rows.extend(batch)
+            if progress:
+                progress(done, len(paths))
+    else:
+        chunksize = max(1, min(64, len(paths) // (workers * 4)))
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(jobs, vectorizer)) as pool:
+            for done, batch in enumerate(pool.map(score_resume, paths, chunksize=chunksize), 1):
+                rows.extend(batch)
+                if progress:
+                    progress(done, len(paths))
+
+    order = {name: i for i, (name, _, _) in enumerate(jobs)}
+    rows.sort(key=lambda row: (order[row["job"]], -row["score"], row["resume"]))
+    rank, current = 0, None
+    for row in rows:
+        rank = rank + 1 if row["job"] == current else 1
+        current = row["job"]
+        row["rank"] = rank
+    return rows
+
+
+def write_rows(rows, out, fmt):
+    if fmt == "jsonl":
+        for row in rows:
+            out.write(json.dumps({field: row[field] for field in FIELDS}) + "\n")
+        return
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(dict(row, matched_skills="; ".join(row["matched_skills"]),
+                             missing_skills="; ".join(row["missing_skills"])))
+
+
+def iter_postings(paths):
+    """Yield `(id, text, title)` from job files; .jsonl files hold one record per line."""
+    for path in paths:
+        if path.lower().endswith(".jsonl"):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        yield str(record["id"]), record["text"], record.get("title")
+        else:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                yield os.path.basename(path), f.read(), None
+
+
+def _run_index(args):
+    from resume_analyzer.job_index import JobIndex
+
+    index = JobIndex.load(args.index)
+    if args.index_command == "add":
+        added = 0
+        for job_id, text, title in iter_postings(args.jobs):
+            index.add(job_id, text, title)
+            added += 1
+        index.save(args.index)
+        print(f"added {added} postings, {len(index)} in index", file=sys.stderr)
+        return
+
+    text, err = read_resume(args.resume)
+    if err:
+        sys.exit(err)
+    for result in index.top_k(text, args.top):
+        print(json.dumps(result))
+
+
+def iter_corpus(paths):
+    """Yield the text of every resume / job file in `paths`, searching folders."""
+    for path in paths:
+        for file_path in find_resumes(path) if os.path.isdir(path) else [path]:
+            if file_path.lower().endswith(".jsonl"):
+                for _, text, _ in iter_postings([file_path]):
+                    yield text
+                continue
+            text, err = read_resume(file_path)
+            if err:
+                print(f"{file_path}: {err}", file=sys.stderr)
+                continue
+            yield text
+
+
+def _run_idf(args):
+    from resume_analyzer.idf import IdfModel
+
+    model = IdfModel.fit(iter_corpus(args.corpus), min_df=args.min_df)
+    model.save(args.output)
+    print(f"{len(model)} n-grams from {model.n_docs} documents -> {args.output}", file=sys.stderr)
+
+
+def _report_progress(done, total):
+    if done == total or done % 500 == 0:
+        print(f"scored {done}/{total} resumes", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m resume_analyzer", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser("score", help="rank a folder of resumes against job descriptions")
+    score.add_argument("resumes", help="folder of .pdf/.txt/.md resumes (searched recursively)")
+    score.add_argument("-j", "--job", action="append", required=True,
+                       help="job description text file (repeatable)")
+    score.add_argument("-o", "--output", help="output file (default: stdout)")
+    score.add_argument("-f", "--format", choices=["csv", "jsonl"],
+                       help="output format (default: from the output extension, else csv)")
+    score.add_argument("-w", "--workers", type=int, help="worker processes (default: CPU count)")
+    score.add_argument("--vectorizer", choices=VECTORIZERS, default="exact",
+                       help="n-gram features for text similarity (hashed: fixed memory, tiny score drift)")
+
+    serve = commands.add_parser("serve", help="run the JSON HTTP scoring API (requires aiohttp)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("-w", "--workers", type=int, help="worker processes (default: CPU count)")
+    serve.add_argument("--max-batch", type=int, default=32, help="most requests scored per pool task")
+    serve.add_argument("--max-delay-ms", type=float, default=5.0,
+                       help="how long to wait for a batch to fill")
+    serve.add_argument("--vectorizer", choices=VECTORIZERS, default="exact",
+                       help="n-gram features for text similarity (hashed: fixed memory, tiny score drift)")
+    serve.add_argument("--metrics", action="store_true", help="record stage timings, served at /metrics")
+    serve.add_argument("--metrics-log", action="store_true",
+                       help="also log every timed stage as a JSON line on stderr")
+
+    index = commands.add_parser("index", help="persistent job-posting index with top-k retrieval")
+    index_commands = index.add_subparsers(dest="index_command", required=True)
+    index_add = index_commands.add_parser("add", help="add or replace postings")
+    index_add.add_argument("index", help="index directory (created if missing)")
+    index_add.add_argument("jobs", nargs="+", help="job description files, or .jsonl with id/text[/title]")
+    index_query = index_commands.add_parser("query", help="best-matching postings for a resume (JSON Lines)")
+    index_query.add_argument("index", help="index directory")
+    index_query.add_argument("resume", help="resume .pdf/.txt/.md")
+    index_query.add_argument("-k", "--top", type=int, default=20)
+
+    idf = commands.add_parser("idf", help="corpus IDF weights for text similarity")
+    idf_commands = idf.add_subparsers(dest="idf_command", required=True)
+    idf_fit = idf_commands.add_parser("fit", help="fit weights on job descriptions and resumes")
+    idf_fit.add_argument("output", help="model file (.npz); point RESUME_ANALYZER_IDF at it")
+    idf_fit.add_argument("corpus", nargs="+",
+                         help="resume/job files or folders; .jsonl files hold id/text records")
+    idf_fit.add_argument("--min-df", type=int, default=2, help="drop n-grams in fewer documents")
+    args = parser.parse_args(argv)
+
+    if args.command == "index":
+        _run_index(args)
+        return
+
+    if args.command == "idf":
+        _run_idf(args)
+        return
+
+    if args.command == "serve":
+        import logging
+
+        from resume_analyzer import metrics
+        from resume_analyzer.service import serve as run_server
+
+        if args.metrics or args.metrics_log:
+            metrics.enable()
+        if args.metrics_log:
+            logging.basicConfig(level=logging.INFO, format="%(message)s")
+            metrics.add_sink(metrics.log_sink())
+
+        run_server(args.host, args.port, args.workers, args.max_batch, args.max_delay_ms / 1000,
+                   args.vectorizer)
+        return
+
+    fmt = args.format or ("jsonl" if (args.output or "").endswith((".jsonl", ".json")) else "csv")
+    try:
+        jobs = load_jobs(args.job)
+    except ValueError as e:
+        parser.error(str(e))
+    rows = score_folder(args.resumes, jobs, workers=args.workers, progress=_report_progress,
+                        vectorizer=args.vectorizer)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            write_rows(rows, out, fmt)
+    else:
+        write_rows(rows, sys.stdout, fmt)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""N-gram vectors and cached per-resume features shared by the scoring paths.
+
+Texts are analyzed exactly like ``CountVectorizer(stop_words='english',
+ngram_range=(1,3))``, so the cosine of two NgramVectors equals the cosine
+of their rows in a CountVectorizer fitted on both.
+
+Two vectorizers are available:
+
+* ``"exact"`` (ngram_vector) keys counts by the n-gram strings themselves.
+* ``"hashed"`` (hashed_vector) keys them by a CRC32 bucket out of
+  HASHED_FEATURES. There is no vocabulary, the same text gives the same
+  vector in every process, and no n-gram strings are kept, so a worker's
+  memory does not grow with the corpus. Distinct n-grams that share a
+  bucket are counted together, which moves a cosine very slightly (see
+  "Hashed n-grams" in the README for measured drift).
+
+Either way, counts are multiplied by the corpus IDF weights of
+resume_analyzer.idf when a model is configured.
+"""
+import itertools
+import math
+from collections import Counter, namedtuple
+
+from resume_analyzer.cache import ContentCache, content_key
+from resume_analyzer.idf import gram_hash, get_idf_model
+from resume_analyzer.skills import get_default_matcher
+from resume_analyzer.taxonomy import tokenize
+
+NgramVector = namedtuple("NgramVector", "counts norm")
+
+VECTORIZERS = ("exact", "hashed")
+HASHED_FEATURES = 2 ** 20
+
+# Resume features by content hash, so one candidate compared against many
+# postings is tokenized, n-grammed and skill-matched once.
+resume_cache = ContentCache(maxsize=128, name="resume")
+
+_analyzer = None
+_splitter = None
+
+
+def ngram_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        _analyzer = CountVectorizer(stop_words='english', ngram_range=(1,3)).build_analyzer()
+    return _analyzer
+
+
+def ngram_words(text):
+    """The words n-grams are built from: lowercased, stop words removed."""
+    global _splitter
+    if _splitter is None:
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        vectorizer = CountVectorizer(stop_words='english')
+        preprocess, split, stop_words = (vectorizer.build_preprocessor(), vectorizer.build_tokenizer(),
+                                         vectorizer.get_stop_words())
+        _splitter = lambda doc: [word for word in split(preprocess(doc)) if word not in stop_words]
+    return _splitter(text or "")
+
+
+def word_ngrams(words):
+    """1-3 grams of `words`, as ngram_analyzer produces them."""
+    grams = list(words)
+    for n in (2, 3):
+        grams.extend(" ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+    return grams
+
+
+def _vector(counts):
+    return NgramVector(counts, math.sqrt(sum(v * v for v in counts.values())))
+
+
+def counts_vector(counts, vectorizer="exact", n_features=HASHED_FEATURES):
+    """NgramVector for a Counter of n-gram strings, as text_vector builds it.
+
+    Counts are IDF-weighted if a corpus model is configured; "hashed" folds
+    them into `n_features` CRC32 buckets.
+    """
+    idf = get_idf_model()
+    if vectorizer == "exact":
+        if idf is None or not counts:
+            return _vector(counts)
+        weights = idf.lookup([gram_hash(gram) for gram in counts])
+        return _vector({gram: count * weight for (gram, count), weight in zip(counts.items(), weights.tolist())})
+    if vectorizer == "hashed":
+        mask = n_features - 1
+        hashes = [gram_hash(gram) for gram in counts]
+        weights = idf.lookup(hashes).tolist() if idf is not None and counts else itertools.repeat(1)
+        folded = {}
+        for h, count, weight in zip(hashes, counts.values(), weights):
+            folded[h & mask] = folded.get(h & mask, 0) + count * weight
+        return _vector(folded)
+    raise ValueError(f"Unknown vectorizer {vectorizer!r}, expected one of {VECTORIZERS}")
+
+
+def ngram_vector(text):
+    """N-gram counts of `text`, IDF-weighted if a corpus model is configured."""
+    return counts_vector(Counter(ngram_analyzer()(text or "")))
+
+
+def hashed_vector(text, n_features=HASHED_FEATURES):
+    """Like ngram_vector, with n-grams folded into `n_features` CRC32 buckets."""
+    return counts_vector(Counter(ngram_analyzer()(text or "")), "hashed", n_features)
+
+
+def text_vector(text, vectorizer="exact"):
+    return counts_vector(Counter(ngram_analyzer()(text or "")), vectorizer)
+
+
+def cosine(a, b):
+    if not a.norm or not b.norm:
+        return 0.0
+    if len(a.counts) > len(b.counts):
+        a, b = b, a
+    other = b.counts
+    dot = sum(count * other[gram] for gram, count in a.counts.items() if gram in other)
+    return dot / (a.norm * b.norm)
+
+
+class ResumeFeatures:
+    """Tokens, skills and n-gram vectors of one resume.
+
+    Instances are shared through resume_cache; treat them as read-only.
+    Each vectorizer's vector is built on first use.
+    """
+
+    def __init__(self, resume_text):
+        matcher = get_default_matcher()
+        self.text = resume_text or ""
+        self.tokens = tokenize(self.text)
+        self.slots = frozenset(matcher.match_slots(self.tokens))
+        self.tech, self.soft = matcher.group_slots(self.slots)
+        self._vectors = {}
+
+    @property
+    def vector(self):
+        return self.vector_for("exact")
+
+    def vector_for(self, vectorizer):
+        if vectorizer not in self._vectors:
+            self._vectors[vectorizer] = text_vector(self.text, vectorizer)
+        return self._vectors[vectorizer]
+
+
+def resume_features(resume_text):
+    """Tokens, skills and n-gram vectors of a resume, cached by content."""
+    key = content_key(resume_text or "")
+    features = resume_cache.get(key)
+    if features is None:
+        features = ResumeFeatures(resume_text)
+        resume_cache.put(key, features)
+    return features
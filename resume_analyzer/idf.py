@@ -0,0 +1,119 @@
+"""Corpus IDF weights for the n-gram text similarity.
+
+    python -m resume_analyzer idf fit resume_analyzer/data/ngram_idf.npz postings/ resumes/
+
+With raw counts, boilerplate that every posting shares ("experience with",
+"ability to") dominates the cosine. An IdfModel is fitted once on a corpus
+of job descriptions and resumes and afterwards only applied: each n-gram
+count is multiplied by scikit-learn's smoothed IDF,
+
+    idf = ln((1 + n_docs) / (1 + df)) + 1
+
+so every pair is weighted by the same corpus statistics and scores stay
+comparable across a ranking.
+
+N-grams are stored as sorted CRC32 hashes of their text next to float32
+weights, 8 bytes per n-gram kept. N-grams seen in fewer than `min_df`
+documents are dropped and, like n-grams never seen, weigh as much as an
+n-gram seen in one document.
+
+The model is read from RESUME_ANALYZER_IDF, else data/ngram_idf.npz next to
+this module, on first use. Without a model the similarity uses raw counts.
+NumPy is only imported once a model is fitted or loaded.
+"""
+import hashlib
+import math
+import os
+import zlib
+from collections import Counter
+
+DEFAULT_IDF_PATH = os.path.join(os.path.dirname(__file__), "data", "ngram_idf.npz")
+
+
+def gram_hash(gram):
+    return zlib.crc32(gram.encode("utf-8"))
+
+
+class IdfModel:
+    def __init__(self, hashes, weights, n_docs):
+        self.hashes = hashes
+        self.weights = weights
+        self.n_docs = int(n_docs)
+        self.default = math.log((1 + self.n_docs) / 2) + 1
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @classmethod
+    def fit(cls, texts, min_df=2):
+        """Count document frequencies of every 1-3 gram in `texts`."""
+        import numpy as np
+
+        from resume_analyzer.features import ngram_analyzer
+
+        analyzer = ngram_analyzer()
+        df = Counter()
+        n_docs = 0
+        for text in texts:
+            n_docs += 1
+            df.update({gram_hash(gram) for gram in analyzer(text or "")})
+
+        kept = sorted(h for h, count in df.items() if count >= min_df)
+        hashes = np.array(kept, dtype=np.uint32)
+        counts = np.array([df[h] for h in kept], dtype=np.float64)
+        weights = (np.log((1 + n_docs) / (1 + counts)) + 1).astype(np.float32)
+        return cls(hashes, weights, n_docs)
+
+    def lookup(self, hashes):
+        """IDF weight for each n-gram hash in `hashes`, as a float array."""
+        import numpy as np
+
+        hashes = np.asarray(hashes, dtype=np.uint32)
+        if not len(self.hashes):
+            return np.full(len(hashes), self.default)
+        pos = np.minimum(np.searchsorted(self.hashes, hashes), len(self.hashes) - 1)
+        found = self.hashes[pos] == hashes
+        return np.where(found, self.weights[pos].astype(np.float64), self.default)
+
+    def fingerprint(self):
+        """Changes whenever the weights would."""
+        digest = hashlib.sha256(str(self.n_docs).encode("ascii"))
+        digest.update(self.hashes.tobytes())
+        digest.update(self.weights.tobytes())
+        return digest.hexdigest()
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def save(self, path):
+        import numpy as np
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, hashes=self.hashes, weights=self.weights,
+                                n_docs=np.array(self.n_docs))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+
+        with np.load(path) as data:
+            return cls(data["hashes"], data["weights"], data["n_docs"])
+
+
+_model = None
+_loaded = False
+
+
+def get_idf_model():
+    """The configured IdfModel, loaded once per process, or None if there is none."""
+    global _model, _loaded
+    if not _loaded:
+        path = os.environ.get("RESUME_ANALYZER_IDF")
+        if path:
+            _model = IdfModel.load(path)
+        elif os.path.exists(DEFAULT_IDF_PATH):
+            _model = IdfModel.load(DEFAULT_IDF_PATH)
+        _loaded = True
+    return _model
@@ -0,0 +1,82 @@
+"""Job description parsing."""
+import re
+
+from resume_analyzer.cache import ContentCache, content_key
+from resume_analyzer.features import text_vector
+from resume_analyzer.metrics import timed
+from resume_analyzer.skills import get_default_matcher
+from resume_analyzer.taxonomy import tokenize
+
+# Parsed postings by content hash, shared by the JD tab, scoring and reports
+job_cache = ContentCache(maxsize=256, name="job")
+
+
+def job_title(jd_text):
+    jd = jd_text or ""
+    lines = [l.strip() for l in jd.splitlines() if l.strip()]
+    jd_lower = jd.lower()
+    title = ""
+
+    m = re.search(r"job title[:\-]\s*(.+)", jd_lower)
+    if m:
+        title = m.group(1).strip().title()
+    else:
+        if lines:
+            first = lines[0]
+            if len(first.split()) < 6:
+                title = first.title()
+    return title or "Not Specified"
+
+
+class ParsedJob:
+    """Everything derived from one job description, computed once.
+
+    Instances are shared through job_cache; treat them as read-only. The
+    n-gram vectors are built on first use, since batch scoring does not need
+    them.
+    """
+
+    def __init__(self, jd_text):
+        jd = jd_text or ""
+        self.text = jd
+        bullets = re.split(r"[\n•\-]+", jd)
+        self.bullets = [b.strip() for b in bullets if len(b.strip()) > 2]
+        self.title = job_title(jd)
+        self.requirements = self.bullets[:6]
+        matcher = get_default_matcher()
+        # Taxonomy slot ids behind job_tech / job_soft, for skill masks
+        self.slots = frozenset(matcher.match_slots(tokenize(jd)))
+        self.job_tech, self.job_soft = matcher.group_slots(self.slots)
+        self._vectors = {}
+
+    @property
+    def vector(self):
+        return self.vector_for("exact")
+
+    def vector_for(self, vectorizer):
+        if vectorizer not in self._vectors:
+            self._vectors[vectorizer] = text_vector(self.text, vectorizer)
+        return self._vectors[vectorizer]
+
+    def as_dict(self):
+        return {
+            "title": self.title,
+            "bullets": self.bullets,
+            "requirements": self.requirements,
+            "job_tech": self.job_tech,
+            "job_soft": self.job_soft
+        }
+
+
+def parse_job(jd_text):
+    key = content_key(jd_text or "")
+    job = job_cache.get(key)
+    if job is None:
+        job = ParsedJob(jd_text)
+        job_cache.put(key, job)
+    return job
+
+
+@timed("analyze_job_description")
+def analyze_job_description(jd_text):
+    return parse_job(jd_text).as_dict()
@@ -0,0 +1,183 @@
+"""Incremental re-scoring of a resume while it is being edited.
+
+    live = LiveResume()
+    score, rtech, rsoft, jtech, jsoft = live.match(resume_text, job_desc)
+    (matched_tech, matched_soft), (missing_tech, missing_soft) = live.overlap(job_desc)
+
+The resume is split into paragraphs at blank lines. Each paragraph's
+n-gram vector and skill hits are cached by content, and a LiveResume keeps
+running totals, so after an edit only the paragraphs that changed are
+analyzed and only their n-grams are added to / subtracted from the totals.
+N-grams and multi-word skills that straddle a paragraph break are
+recomputed from the few words either side of each break. The totals are
+therefore those of the whole text and live scores equal
+calculate_ai_match's (up to float rounding when IDF weights are in use).
+"""
+import math
+import re
+from collections import Counter, namedtuple
+
+from resume_analyzer.cache import ContentCache, content_key
+from resume_analyzer.features import NgramVector, cosine, counts_vector, ngram_words, word_ngrams
+from resume_analyzer.jobs import parse_job
+from resume_analyzer.matching import EMPTY_MATCH
+from resume_analyzer.skills import get_default_matcher
+from resume_analyzer.taxonomy import tokenize
+
+Paragraph = namedtuple("Paragraph", "words counts tokens slots")
+
+# Paragraphs by vectorizer and content hash, shared by every LiveResume
+paragraph_cache = ContentCache(maxsize=4096, name="paragraph")
+
+_BREAK_RE = re.compile(r"\n\s*\n")
+
+
+def split_paragraphs(text):
+    return [part for part in _BREAK_RE.split(text or "") if part.strip()]
+
+
+def _paragraph(text, vectorizer):
+    key = f"{vectorizer}:{content_key(text)}"
+    paragraph = paragraph_cache.get(key)
+    if paragraph is None:
+        words = ngram_words(text)
+        tokens = tokenize(text)
+        counts = counts_vector(Counter(word_ngrams(words)), vectorizer).counts
+        paragraph = Paragraph(words, counts, tokens, frozenset(get_default_matcher().match_slots(tokens)))
+        paragraph_cache.put(key, paragraph)
+    return paragraph
+
+
+def _joined(paragraphs, field):
+    """All paragraphs' `field` lists end to end, and where each paragraph ends."""
+    items, ends = [], []
+    for paragraph in paragraphs:
+        part = getattr(paragraph, field)
+        if part:
+            items.extend(part)
+            ends.append(len(items))
+    return items, ends
+
+
+def _crossing_ngrams(paragraphs):
+    """2-3 grams that start in one paragraph and end in a later one."""
+    words, ends = _joined(paragraphs, "words")
+    grams = []
+    first = 0
+    for end in ends[:-1]:
+        # Attributed to the paragraph they start in, so each is counted once
+        for start in range(max(first, end - 2), end):
+            for n in (2, 3):
+                if start + n > end and start + n <= len(words):
+                    grams.append(" ".join(words[start:start + n]))
+        first = end
+    return grams
+
+
+def _crossing_slots(paragraphs, matcher):
+    """Skills whose phrase runs across a paragraph break."""
+    span = matcher.index.max_phrase_words - 1
+    tokens, ends = _joined(paragraphs, "tokens")
+    hits = set()
+    if span > 0:
+        for end in ends[:-1]:
+            hits.update(matcher.match_slots(tokens[max(0, end - span):end + span]))
+    return hits
+
+
+class LiveResume:
+    """Running n-gram and skill totals of one resume across edits.
+
+    Keep one per editing session (e.g. in Streamlit's session_state).
+    """
+
+    def __init__(self, vectorizer="exact"):
+        self.vectorizer = vectorizer
+        self.matcher = get_default_matcher()
+        self.text = ""
+        self.counts = {}
+        self.slots = frozenset()
+        self.tech, self.soft = self.matcher.group_slots(())
+        self._square_norm = 0
+        self._paragraphs = Counter()
+        self._by_key = {}
+        self._slot_refs = Counter()
+        self._crossing = {}
+
+    @property
+    def vector(self):
+        return NgramVector(self.counts, math.sqrt(max(self._square_norm, 0)))
+
+    def _add(self, counts, sign):
+        total = self.counts
+        square_norm = self._square_norm
+        for gram, count in counts.items():
+            old = total.get(gram, 0)
+            new = old + sign * count
+            square_norm += new * new - old * old
+            # Float weights may not cancel exactly; drop what is left over
+            if abs(new) > 1e-9:
+                total[gram] = new
+            else:
+                total.pop(gram, None)
+                square_norm -= new * new
+        self._square_norm = square_norm
+
+    def update(self, resume_text):
+        """Bring the totals up to date with `resume_text`."""
+        resume_text = resume_text or ""
+        if resume_text == self.text:
+            return self
+
+        parts = split_paragraphs(resume_text)
+        keys = [content_key(part) for part in parts]
+        wanted = Counter(keys)
+        for key, times in (self._paragraphs - wanted).items():
+            paragraph = self._by_key[key]
+            for _ in range(times):
+                self._add(paragraph.counts, -1)
+                self._slot_refs.subtract(paragraph.slots)
+        for part, key in zip(parts, keys):
+            if key not in self._by_key:
+                self._by_key[key] = _paragraph(part, self.vectorizer)
+        for key, times in (wanted - self._paragraphs).items():
+            paragraph = self._by_key[key]
+            for _ in range(times):
+                self._add(paragraph.counts, 1)
+                self._slot_refs.update(paragraph.slots)
+        self._paragraphs = wanted
+        self._by_key = {key: self._by_key[key] for key in wanted}
+
+        paragraphs = [self._by_key[key] for key in keys]
+        self._add(self._crossing, -1)
+        self._crossing = counts_vector(Counter(_crossing_ngrams(paragraphs)), self.vectorizer).counts
+        self._add(self._crossing, 1)
+
+        slots = {slot for slot, refs in self._slot_refs.items() if refs > 0}
+        self.slots = frozenset(slots | _crossing_slots(paragraphs, self.matcher))
+        self.tech, self.soft = self.matcher.group_slots(self.slots)
+        self.text = resume_text
+        return self
+
+    def match(self, resume_text, job_desc):
+        """Like calculate_ai_match, re-analyzing only what changed since the last call."""
+        from resume_analyzer.skill_masks import blend, get_skill_space
+
+        self.update(resume_text)
+        if not self.text.strip() or not (job_desc or "").strip():
+            return EMPTY_MATCH
+
+        job = parse_job(job_desc)
+        similarity = cosine(self.vector, job.vector_for(self.vectorizer))
+        space = get_skill_space()
+        tech_match, soft_match = space.coverage(space.mask(self.slots), space.mask(job.slots))
+        score = float(blend(similarity, tech_match[0, 0], soft_match[0, 0]))
+        return score, self.tech, self.soft, job.job_tech, job.job_soft
+
+    def overlap(self, job_desc):
+        """Like skill_overlap, for the text of the last update."""
+        from resume_analyzer.skill_masks import get_skill_space
+
+        space = get_skill_space()
+        matched, missing = space.gaps(space.mask(self.slots), space.mask(parse_job(job_desc).slots))
+        return self.matcher.group_slots(matched), self.matcher.group_slots(missing)
@@ -0,0 +1,215 @@
+"""Resume / job description scoring.
+
+scikit-learn and NumPy (via skill_masks) are imported on first use so that
+importing this module (e.g. in a worker process or a test) stays cheap.
+"""
+import time
+
+from resume_analyzer import metrics
+from resume_analyzer.features import VECTORIZERS, cosine, resume_features, text_vector
+from resume_analyzer.idf import get_idf_model
+from resume_analyzer.jobs import parse_job
+
+# Stages reported to `on_stage(stage, seconds)` callbacks, in order
+STAGES = ("skills", "vectorize", "score")
+
+EMPTY_MATCH = (0, {}, [], {}, [])
+
+
+def _one_vs_many_similarity(anchor, others, vectorizer="exact"):
+    """Cosine similarity of `anchor` against every text in `others`.
+
+    In exact mode one CountVectorizer is fitted on the whole corpus and all
+    similarities come out of a single sparse product. Restricting the
+    vocabulary to a pair's own n-grams does not change their cosine, so the
+    values are the same as fitting each pair separately. In hashed mode, or
+    when corpus IDF weights are configured, each text is vectorized on its
+    own and nothing is fitted.
+    """
+    if vectorizer != "exact" or get_idf_model() is not None:
+        anchor_vector = text_vector(anchor, vectorizer)
+        return [cosine(anchor_vector, text_vector(text, vectorizer)) for text in others]
+
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    vectorizer = CountVectorizer(stop_words='english', ngram_range=(1,3))
+    try:
+        count_matrix = vectorizer.fit_transform([anchor] + list(others))
+    except ValueError:
+        # Only stop words / no tokens anywhere in the corpus
+        return [0.0] * len(others)
+    return cosine_similarity(count_matrix[0:1], count_matrix[1:])[0]
+
+
+class _StageTimer:
+    def __init__(self, on_stage):
+        self.on_stage = on_stage
+        self.started = time.perf_counter()
+
+    def done(self, stage):
+        now = time.perf_counter()
+        if self.on_stage is not None:
+            self.on_stage(stage, now - self.started)
+        metrics.record(f"match.{stage}", now - self.started)
+        self.started = now
+
+
+def _parsed(text, is_job):
+    # Both sides come from their content-hash caches
+    if is_job:
+        job = parse_job(text)
+        return job.job_tech, job.job_soft, job.slots
+    features = resume_features(text)
+    return features.tech, features.soft, features.slots
+
+
+def _check_vectorizer(vectorizer):
+    if vectorizer not in VECTORIZERS:
+        raise ValueError(f"Unknown vectorizer {vectorizer!r}, expected one of {VECTORIZERS}")
+
+
+def _score_one_vs_many(anchor, others, anchor_is_resume, on_stage=None, vectorizer="exact"):
+    from resume_analyzer.skill_masks import blend, get_skill_space
+
+    _check_vectorizer(vectorizer)
+    results = [EMPTY_MATCH] * len(others)
+    if not (anchor or "").strip():
+        return results
+
+    live = [i for i, text in enumerate(others) if (text or "").strip()]
+    if not live:
+        return results
+
+    timer = _StageTimer(on_stage)
+    anchor_tech, anchor_soft, anchor_slots = _parsed(anchor, is_job=not anchor_is_resume)
+    other_parsed = [_parsed(others[i], is_job=anchor_is_resume) for i in live]
+    timer.done("skills")
+
+    similarities = _one_vs_many_similarity(anchor, [others[i] for i in live], vectorizer)
+    timer.done("vectorize")
+
+    space = get_skill_space()
+    anchor_mask = space.mask(anchor_slots)
+    other_masks = space.stack([slots for _, _, slots in other_parsed])
+    if anchor_is_resume:
+        tech_match, soft_match = (m[0] for m in space.coverage(anchor_mask, other_masks))
+    else:
+        tech_match, soft_match = (m[:, 0] for m in space.coverage(other_masks, anchor_mask))
+    scores = blend(similarities, tech_match, soft_match)
+
+    for i, score, (other_tech, other_soft, _) in zip(live, scores, other_parsed):
+        if anchor_is_resume:
+            breakdown = (anchor_tech, anchor_soft, other_tech, other_soft)
+        else:
+            breakdown = (other_tech, other_soft, anchor_tech, anchor_soft)
+        results[i] = (float(score),) + breakdown
+    timer.done("score")
+    return results
+
+
+@metrics.timed("match_many")
+def match_many(resume_text, job_descs, on_stage=None, vectorizer="exact"):
+    """Score one resume against many job descriptions.
+
+    Returns one `(score, rtech, rsoft, jtech, jsoft)` tuple per job
+    description, in input order. `on_stage(stage, seconds)` is called as
+    each of STAGES finishes, with the time that stage took. `vectorizer` is
+    one of VECTORIZERS, as in calculate_ai_match.
+    """
+    return _score_one_vs_many(resume_text, job_descs, anchor_is_resume=True,
+                              on_stage=on_stage, vectorizer=vectorizer)
+
+
+@metrics.timed("rank_resumes")
+def rank_resumes(job_desc, resumes, on_stage=None, vectorizer="exact"):
+    """Score many resumes against one job description, best match first.
+
+    Returns `(index, (score, rtech, rsoft, jtech, jsoft))` pairs where
+    `index` points back into `resumes`.
+    """
+    results = _score_one_vs_many(job_desc, resumes, anchor_is_resume=False,
+                                 on_stage=on_stage, vectorizer=vectorizer)
+    return sorted(enumerate(results), key=lambda item: item[1][0], reverse=True)
+
+
+@metrics.timed("calculate_ai_match")
+def calculate_ai_match(resume_text, job_desc, on_stage=None, vectorizer="exact"):
+    """Score one resume against one job description.
+
+    Both sides (skills and n-gram vectors) come from the parse_job and
+    resume_features caches, so re-running an analysis only pays for the
+    side whose text changed.
+
+    `vectorizer` picks the n-gram features behind the text similarity:
+    "exact" (the default) or "hashed", whose memory does not depend on the
+    vocabulary; see features.py for the trade-off.
+    """
+    from resume_analyzer.skill_masks import blend, get_skill_space
+
+    _check_vectorizer(vectorizer)
+    if not (resume_text or "").strip() or not (job_desc or "").strip():
+        return EMPTY_MATCH
+
+    timer = _StageTimer(on_stage)
+    # Tokens and skills are extracted here; the n-gram vectors are built lazily below
+    job = parse_job(job_desc)
+    resume = resume_features(resume_text)
+    timer.done("skills")
+
+    similarity = cosine(resume.vector_for(vectorizer), job.vector_for(vectorizer))
+    timer.done("vectorize")
+
+    space = get_skill_space()
+    tech_match, soft_match = space.coverage(space.mask(resume.slots), space.mask(job.slots))
+    score = float(blend(similarity, tech_match[0, 0], soft_match[0, 0]))
+    timer.done("score")
+    return score, resume.tech, resume.soft, job.job_tech, job.job_soft
+
+
+def _gap_slots(resume_text, job_desc):
+    from resume_analyzer.skill_masks import get_skill_space
+
+    space = get_skill_space()
+    matched, missing = space.gaps(space.mask(resume_features(resume_text).slots),
+                                  space.mask(parse_job(job_desc).slots))
+    return space.matcher, matched, missing
+
+
+def skill_overlap(resume_text, job_desc):
+    """Return the `(matched, missing)` skills of a job description.
+
+    Each side is grouped like extract_skills_advanced, as
+    `({category: [skills]}, [soft skills])` in taxonomy order, and both are
+    read off the same skill masks the score is computed from.
+    """
+    matcher, matched, missing = _gap_slots(resume_text, job_desc)
+    return matcher.group_slots(matched), matcher.group_slots(missing)
+
+
+def skill_gaps(resume_text, job_desc):
+    """Return `(matched, missing)` job skills as "Category: Skill" strings.
+
+    Soft skills are reported under "Soft", as in the Analysis tab.
+    """
+    matcher, matched, missing = _gap_slots(resume_text, job_desc)
+    return ([matcher.slot_name(slot) for slot in matched],
+            [matcher.slot_name(slot) for slot in missing])
+
+
+def score_pairs(pairs, vectorizer="exact"):
+    """Score `(resume_text, job_desc)` pairs, sharing work per resume.
+
+    Pairs with the same resume are scored together through match_many.
+    Results come back in input order.
+    """
+    by_resume = {}
+    for i, (resume_text, job_desc) in enumerate(pairs):
+        by_resume.setdefault(resume_text, []).append((i, job_desc))
+
+    results = [None] * len(pairs)
+    for resume_text, jobs in by_resume.items():
+        scored = match_many(resume_text, [job_desc for _, job_desc in jobs], vectorizer=vectorizer)
+        for (i, _), result in zip(jobs, scored):
+            results[i] = result
+    return results
@@ -0,0 +1,255 @@
+"""Per-stage timing metrics for the analysis pipeline.
+
+Core functions are wrapped with `timed(stage)`. While metrics are disabled
+(the default) the wrapper is a single flag check before the call. Once
+enabled, with `enable()` or RESUME_ANALYZER_METRICS=1, every call records
+
+* a duration in the ``resume_analyzer_stage_seconds`` histogram,
+* an ok / error count and the input size, and
+* an event in a short in-memory history (for the app's diagnostics panel)
+  that is also passed to each registered sink.
+
+Exporters:
+
+* `prometheus_text()` renders everything, including ContentCache hit
+  counts, in the Prometheus text format. The HTTP service serves it at
+  ``/metrics``. `serve_prometheus(port)` (or RESUME_ANALYZER_METRICS_PORT)
+  runs a standalone endpoint, e.g. next to the Streamlit app.
+* `add_sink(log_sink())` writes one JSON log line per event.
+
+Work done in process pools is recorded in the workers. Callers that want
+it in the parent return `drain()` from the worker and `replay()` it.
+"""
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RECENT_EVENTS = 500
+
+_enabled = os.environ.get("RESUME_ANALYZER_METRICS", "") not in ("", "0")
+_lock = threading.Lock()
+_stages = {}
+_recent = deque(maxlen=RECENT_EVENTS)
+_sinks = []
+
+
+def enabled():
+    return _enabled
+
+
+def enable(flag=True):
+    global _enabled
+    _enabled = bool(flag)
+
+
+class _Stage:
+    __slots__ = ("buckets", "count", "total", "errors", "input_size")
+
+    def __init__(self):
+        self.buckets = [0] * (len(STAGE_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.input_size = 0
+
+
+def record(stage, seconds, size=None, ok=True):
+    """Record one finished `stage` (also usable for stages not wrapped by timed)."""
+    if not _enabled:
+        return
+    _record({"stage": stage, "seconds": seconds, "size": size, "ok": ok, "time": time.time()})
+
+
+def _record(event):
+    with _lock:
+        stats = _stages.get(event["stage"])
+        if stats is None:
+            stats = _stages[event["stage"]] = _Stage()
+        stats.buckets[bisect.bisect_left(STAGE_BUCKETS, event["seconds"])] += 1
+        stats.count += 1
+        stats.total += event["seconds"]
+        if not event["ok"]:
+            stats.errors += 1
+        if event["size"]:
+            stats.input_size += event["size"]
+        _recent.append(event)
+        sinks = list(_sinks)
+    for sink in sinks:
+        try:
+            sink(event)
+        except Exception:
+            pass
+
+
+def _size_of(value):
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    return None
+
+
+def timed(stage, returns_error=False):
+    """Decorator recording each call of a function as `stage`.
+
+    The input size is the length of the first argument when it is a string
+    or bytes. With `returns_error`, the function returns a `(value, err)`
+    tuple and a non-empty `err` counts as an error.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = func(*args, **kwargs)
+                ok = not (returns_error and result[1])
+                return result
+            finally:
+                record(stage, time.perf_counter() - started, _size_of(args[0]) if args else None, ok)
+        return wrapper
+    return decorate
+
+
+# ----------------------------
+# History, sinks and pools
+# ----------------------------
+def recent(n=50):
+    """The last `n` events, newest first."""
+    with _lock:
+        events = list(_recent)[-n:]
+    return events[::-1]
+
+
+def add_sink(sink):
+    """Call `sink(event)` for every recorded event."""
+    with _lock:
+        _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    with _lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def log_sink(logger=None, level=logging.INFO):
+    """Sink writing each event as one JSON log line."""
+    logger = logger or logging.getLogger("resume_analyzer.metrics")
+
+    def sink(event):
+        logger.log(level, json.dumps(event, sort_keys=True))
+    return sink
+
+
+def drain():
+    """Return and forget the event history (e.g. at the end of a pool task)."""
+    with _lock:
+        events = list(_recent)
+        _recent.clear()
+    return events
+
+
+def replay(events):
+    """Record events drained from another process."""
+    if _enabled:
+        for event in events:
+            _record(event)
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _recent.clear()
+
+
+def summary():
+    """`{stage: {"count", "errors", "mean", "p50", "p95"}}` from the recent history."""
+    by_stage = {}
+    for event in recent(RECENT_EVENTS):
+        by_stage.setdefault(event["stage"], []).append(event)
+    result = {}
+    for stage, events in sorted(by_stage.items()):
+        seconds = sorted(event["seconds"] for event in events)
+        result[stage] = {
+            "count": len(seconds),
+            "errors": sum(not event["ok"] for event in events),
+            "mean": sum(seconds) / len(seconds),
+            "p50": seconds[len(seconds) // 2],
+            "p95": seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))],
+        }
+    return result
+
+
+# ----------------------------
+# Prometheus
+# ----------------------------
+def prometheus_text():
+    """All stage and cache metrics in the Prometheus text exposition format."""
+    from resume_analyzer.cache import named_caches
+
+    lines = [
+        "# HELP resume_analyzer_stage_seconds Time spent in each pipeline stage.",
+        "# TYPE resume_analyzer_stage_seconds histogram",
+    ]
+    with _lock:
+        stages = {name: (list(s.buckets), s.count, s.total, s.errors, s.input_size)
+                  for name, s in _stages.items()}
+    for name, (buckets, count, total, _, _) in sorted(stages.items()):
+        cumulative = 0
+        for bound, n in zip(STAGE_BUCKETS + (float("inf"),), buckets):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'resume_analyzer_stage_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+        lines.append(f'resume_analyzer_stage_seconds_sum{{stage="{name}"}} {total!r}')
+        lines.append(f'resume_analyzer_stage_seconds_count{{stage="{name}"}} {count}')
+
+    lines += ["# HELP resume_analyzer_stage_errors_total Stage calls that failed.",
+              "# TYPE resume_analyzer_stage_errors_total counter"]
+    lines += [f'resume_analyzer_stage_errors_total{{stage="{name}"}} {errors}'
+              for name, (_, _, _, errors, _) in sorted(stages.items())]
+    lines += ["# HELP resume_analyzer_stage_input_bytes_total Characters or bytes passed to each stage.",
+              "# TYPE resume_analyzer_stage_input_bytes_total counter"]
+    lines += [f'resume_analyzer_stage_input_bytes_total{{stage="{name}"}} {size}'
+              for name, (_, _, _, _, size) in sorted(stages.items())]
+
+    caches = sorted(named_caches().items())
+    for key, kind, help_text in (("hits", "counter", "Memory cache hits."),
+                                 ("disk_hits", "counter", "On-disk cache hits."),
+                                 ("misses", "counter", "Cache misses."),
+                                 ("size", "gauge", "Entries held in memory.")):
+        metric = f"resume_analyzer_cache_{key}" + ("_total" if kind == "counter" else "")
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{cache="{name}"}} {cache.stats()[key]}' for name, cache in caches]
+    return "\n".join(lines) + "\n"
+
+
+def serve_prometheus(port, host="127.0.0.1"):
+    """Serve prometheus_text() at http://host:port/metrics from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return server
@@ -0,0 +1,255 @@
+"""PDF text extraction with a content-addressed result cache."""
+import importlib.util
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from io import BytesIO
+
+from resume_analyzer.cache import ContentCache, content_key
+from resume_analyzer.metrics import timed
+
+PYPDF2_MISSING = "PyPDF2 not installed. Install with `pip install PyPDF2`"
+
+# Re-uploads and Streamlit reruns of the same file are answered from here.
+# Set RESUME_ANALYZER_PDF_CACHE_DIR to keep extractions across restarts.
+pdf_text_cache = ContentCache(
+    maxsize=int(os.environ.get("RESUME_ANALYZER_PDF_CACHE_SIZE", "64")),
+    disk_dir=os.environ.get("RESUME_ANALYZER_PDF_CACHE_DIR") or None,
+    name="pdf_text",
+)
+
+# Text pages take a few milliseconds each in PyPDF2's pure-Python
+# extract_text, while a cold pool of spawned workers takes about a second
+# to start and every worker parses the whole document once. Parallel mode
+# therefore does not speed up small or ordinary PDFs; it only pays off for
+# long documents with slow pages (large content streams, many fonts) on a
+# host with several cores. Documents shorter than PARALLEL_MIN_PAGES are
+# always read in-process. Longer ones are read in-process for their first
+# PARALLEL_PROBE_PAGES pages, and the rest goes to the pool only if the
+# measured page time says that is at least twice as fast.
+PARALLEL_MIN_PAGES = 16
+PARALLEL_PROBE_PAGES = 4
+POOL_START_SECONDS = 1.0
+# Handing a page to a worker and its text back costs about a millisecond
+POOL_PAGE_OVERHEAD = 0.001
+PAGE_TIMEOUT = 10.0
+# Upper bounds on what a single upload may extract, to cap memory and latency.
+MAX_PAGES = int(os.environ.get("RESUME_ANALYZER_PDF_MAX_PAGES", "200"))
+MAX_CHARS = int(os.environ.get("RESUME_ANALYZER_PDF_MAX_CHARS", "500000"))
+PDF_WORKERS = int(os.environ.get("RESUME_ANALYZER_PDF_WORKERS", "0")) or min(8, os.cpu_count() or 1)
+
+# Workers are spawned, not forked: the Streamlit server and the HTTP service
+# are threaded, and a forked child can inherit locks held by other threads.
+_mp = multiprocessing.get_context("spawn")
+_pool = None
+_pool_users = {}  # pool -> extractions currently using it
+_pool_lock = threading.Lock()
+
+
+def _acquire_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _mp.Pool(PDF_WORKERS)
+        _pool_users[_pool] = _pool_users.get(_pool, 0) + 1
+        return _pool
+
+
+def _release_pool(pool, stuck=False):
+    """Done with `pool`. If one of its workers is `stuck` on a page, new
+    extractions get a fresh pool and this one is terminated once no other
+    extraction is still waiting on it."""
+    global _pool
+    with _pool_lock:
+        if stuck and pool is _pool:
+            _pool = None
+        _pool_users[pool] -= 1
+        if not _pool_users[pool] and pool is not _pool:
+            del _pool_users[pool]
+            pool.terminate()
+
+
+def pypdf2_available():
+    return importlib.util.find_spec("PyPDF2") is not None
+
+
+def _pdf_reader():
+    # PyPDF2 is imported on first extraction, not when the module loads
+    try:
+        from PyPDF2 import PdfReader
+    except Exception:
+        return None
+    return PdfReader
+
+
+# (path, PdfReader) of the document a worker process is reading
+_worker_document = None
+
+
+def _extract_page(path, page):
+    """Text of one page, in a worker. None if the extraction was given up."""
+    global _worker_document
+    # The parent removes the file when it stops early; skip what is left
+    if not os.path.exists(path):
+        return None
+    if _worker_document is None or _worker_document[0] != path:
+        with open(path, "rb") as f:
+            _worker_document = (path, _pdf_reader()(BytesIO(f.read())))
+    return _worker_document[1].pages[page].extract_text() or ""
+
+
+def _iter_pages_parallel(data, start, stop, page_timeout):
+    """Extract pages `start` to `stop` in worker processes, yielding them in page order.
+
+    The document is handed to the workers as a temporary file, which each
+    worker parses once. Every page is its own task, so a slow page holds up
+    only its own worker. A page that has not come back `page_timeout`
+    seconds after the page before it (or after submission, for the first)
+    raises TimeoutError, and the pool is retired once no extraction is
+    using it any more. When the caller stops early, the file is removed and
+    pages still queued are skipped.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(data)
+        path = f.name
+    pool = _acquire_pool()
+    timed_out = False
+    try:
+        pending = [pool.apply_async(_extract_page, (path, page)) for page in range(start, stop)]
+        progress = time.monotonic()
+        for page, result in zip(range(start, stop), pending):
+            try:
+                text = result.get(timeout=max(0.0, progress + page_timeout - time.monotonic()))
+            except multiprocessing.TimeoutError:
+                timed_out = True
+                raise TimeoutError(f"page {page + 1} timed out after {page_timeout:g}s") from None
+            progress = time.monotonic()
+            yield text
+    finally:
+        os.unlink(path)
+        _release_pool(pool, stuck=timed_out)
+
+
+def _pool_pays_off(seconds_per_page, remaining, parse_seconds):
+    """Whether `remaining` pages would come back at least twice as fast from the pool."""
+    sequential = seconds_per_page * remaining
+    parallel = (parse_seconds + sequential / PDF_WORKERS + remaining * POOL_PAGE_OVERHEAD
+                + (0 if _pool is not None else POOL_START_SECONDS))
+    return parallel * 2 <= sequential
+
+
+def _iter_pages(reader, data, n_pages, parallel, page_timeout, parse_seconds):
+    if parallel and n_pages > 1:
+        yield from _iter_pages_parallel(data, 0, n_pages, page_timeout)
+        return
+    probe = parallel is None and PDF_WORKERS > 1 and n_pages >= PARALLEL_MIN_PAGES
+    started = time.perf_counter()
+    for page in range(n_pages):
+        if probe and page == PARALLEL_PROBE_PAGES:
+            seconds_per_page = (time.perf_counter() - started) / page
+            if _pool_pays_off(seconds_per_page, n_pages - page, parse_seconds):
+                yield from _iter_pages_parallel(data, page, n_pages, page_timeout)
+                return
+        yield reader.pages[page].extract_text() or ""
+
+
+def _read_bytes(file_bytes):
+    if isinstance(file_bytes, (bytes, bytearray)):
+        return bytes(file_bytes)
+    if hasattr(file_bytes, "getvalue"):
+        return file_bytes.getvalue()
+    data = file_bytes.read()
+    if hasattr(file_bytes, "seek"):
+        file_bytes.seek(0)
+    return data
+
+
+def iter_pdf_text(file_bytes, parallel=None, page_timeout=PAGE_TIMEOUT,
+                  max_pages=MAX_PAGES, max_chars=MAX_CHARS, on_truncated=None):
+    """Yield the text of a PDF page by page, within page and character budgets.
+
+    Extraction stops after `max_pages` pages or once `max_chars` characters
+    have been produced (the last page is cut to fit); 0 disables a budget.
+    When a budget cuts the document short, `on_truncated(message)` is called
+    with a note such as "Stopped after 200 of 350 pages".
+    `parallel=None` moves the rest of a long document to the worker pool
+    only when its first pages show that to be faster (see
+    PARALLEL_MIN_PAGES); True/False forces either mode. `page_timeout`
+    applies to pages read by the pool: a page that takes longer raises
+    TimeoutError. A run that is consumed to the end is cached, and a cache
+    hit yields the stored text as a single piece.
+    """
+    PdfReader = _pdf_reader()
+    if PdfReader is None:
+        raise RuntimeError(PYPDF2_MISSING)
+    data = _read_bytes(file_bytes)
+    # Entries are (text, truncation note or None)
+    key = f"{content_key(data)}-{max_pages}-{max_chars}-v3"
+    cached = pdf_text_cache.get(key)
+    if cached is not None:
+        text, note = cached
+        if note and on_truncated is not None:
+            on_truncated(note)
+        yield text
+        return
+
+    started = time.perf_counter()
+    reader = PdfReader(BytesIO(data))
+    n_pages = total_pages = len(reader.pages)
+    parse_seconds = time.perf_counter() - started
+    if max_pages:
+        n_pages = min(n_pages, max_pages)
+    pages = _iter_pages(reader, data, n_pages, parallel, page_timeout, parse_seconds)
+
+    collected = []
+    remaining = max_chars
+    cut = False
+    # Closing the page iterator stops (and cancels) work not yet consumed
+    try:
+        for text in pages:
+            if max_chars:
+                if len(text) > remaining:
+                    text = text[:remaining]
+                    cut = True
+                # account for the newline that joins pages
+                remaining -= len(text) + 1
+            collected.append(text)
+            yield text
+            if max_chars and remaining <= 0:
+                break
+    finally:
+        pages.close()
+    note = None
+    if cut or len(collected) < n_pages:
+        note = f"Stopped at the {max_chars:,}-character limit on page {len(collected)} of {total_pages}"
+    elif n_pages < total_pages:
+        note = f"Stopped after {n_pages} of {total_pages} pages"
+    if note and on_truncated is not None:
+        on_truncated(note)
+    pdf_text_cache.put(key, ("\n".join(collected), note))
+
+
+@timed("extract_text_from_pdf", returns_error=True)
+def extract_text_from_pdf(file_bytes, parallel=None, page_timeout=PAGE_TIMEOUT,
+                          max_pages=MAX_PAGES, max_chars=MAX_CHARS, on_page=None, on_truncated=None):
+    """Return `(text, error)` for a PDF given as bytes or a file-like object.
+
+    `on_page(text)` is called with each piece of text as it is extracted, so
+    callers can show progress before the whole document is done. See
+    iter_pdf_text for the other keyword arguments.
+    """
+    if not pypdf2_available():
+        return None, PYPDF2_MISSING
+    try:
+        pages = iter_pdf_text(file_bytes, parallel=parallel, page_timeout=page_timeout,
+                              max_pages=max_pages, max_chars=max_chars, on_truncated=on_truncated)
+        text = []
+        for page_text in pages:
+            text.append(page_text)
+            if on_page is not None:
+                on_page(page_text)
+        return "\n".join(text), None
+    except Exception as e:
+        return None, f"Failed to extract PDF text: {e}"
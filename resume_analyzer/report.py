@@ -0,0 +1,28 @@
+"""Plain-text analysis reports."""
+from resume_analyzer.metrics import timed
+
+
+@timed("generate_text_report")
+def generate_text_report(match_score, strong_points, improvement_points, job_title=""):
+    """Generate a simple text report instead of PDF to avoid encoding issues"""
+    report = f"""
+RESUME MATCH ANALYSIS REPORT
+============================
+
+Job Title: {job_title}
+Match Score: {match_score}%
+
+STRONG POINTS:
+{chr(10).join(f"• {point}" for point in strong_points) if strong_points else "• No strong points identified"}
+
+IMPROVEMENT AREAS:
+{chr(10).join(f"• {point}" for point in improvement_points) if improvement_points else "• No major improvement areas"}
+
+RECOMMENDATIONS:
+• Focus on developing the skills mentioned above
+• Tailor your resume to highlight matching skills
+• Consider relevant projects or certifications
+
+Generated by ResumeMatch Pro
+    """
+    return report
@@ -0,0 +1,212 @@
+"""Process-wide admission control for OpenAI calls.
+
+Every Streamlit session runs in the same server process, so without
+coordination a burst of users trips OpenAI's rate limits and one user
+rewriting section by section can crowd out everyone else. Each LLM request
+first waits for a ticket from the shared LLMScheduler, which grants tickets
+
+* in priority order (lower first), then first come first served,
+* only while the request and token buckets (per minute, refilled
+  continuously) have room for the request's estimated tokens,
+* to at most `max_concurrent` requests at a time, and
+* to at most `session_concurrency` running requests and
+  `session_requests_per_minute` per session, so a busy session waits
+  without holding up the others.
+
+A waiting caller can ask for its `position()` in the queue to show it. On
+a 429, `pause()` stops all grants for the Retry-After period.
+
+Limits come from RESUME_ANALYZER_LLM_RPM, RESUME_ANALYZER_LLM_TPM,
+RESUME_ANALYZER_LLM_CONCURRENCY, RESUME_ANALYZER_LLM_SESSION_CONCURRENCY and
+RESUME_ANALYZER_LLM_SESSION_RPM.
+"""
+import bisect
+import itertools
+import os
+import threading
+import time
+from collections import Counter
+
+# Upper bound on how long a waiter sleeps before re-checking the queue
+POLL = 0.25
+
+
+class TokenBucket:
+    """`per_minute` units, refilled continuously, holding at most `capacity`.
+
+    The default capacity is six seconds' worth: providers enforce per-minute
+    limits over shorter periods, so a full minute's burst would be refused.
+    """
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or max(1.0, per_minute / 10)
+        self.level = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount, now):
+        """Seconds until `amount` units are available (0 if they are now)."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate) if self.rate else (0.0 if missing <= 0 else float("inf"))
+
+    def take(self, amount, now):
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+
+
+class Ticket:
+    __slots__ = ("order", "session", "tokens", "granted", "waited")
+
+    def __init__(self, order, session, tokens):
+        self.order = order
+        self.session = session
+        self.tokens = tokens
+        self.granted = False
+        self.waited = 0.0
+
+    def __lt__(self, other):
+        return self.order < other.order
+
+
+class LLMScheduler:
+    def __init__(self, requests_per_minute=500, tokens_per_minute=200_000, max_concurrent=16,
+                 session_concurrency=4, session_requests_per_minute=60):
+        self.max_concurrent = max_concurrent
+        self.session_concurrency = session_concurrency
+        self.session_requests_per_minute = session_requests_per_minute
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._session_buckets = {}
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._running = 0
+        self._session_running = Counter()
+        self._paused_until = 0.0
+        self._seq = itertools.count()
+
+    def ticket(self, tokens, priority=0, session=None):
+        """Join the queue for a request of about `tokens` tokens (prompt plus max_tokens)."""
+        with self._cond:
+            ticket = Ticket((priority, next(self._seq)), session, tokens)
+            bisect.insort(self._waiting, ticket)
+            self._cond.notify_all()
+            return ticket
+
+    def position(self, ticket):
+        """1-based place of a waiting ticket in the queue, 0 once granted."""
+        with self._cond:
+            if ticket.granted or ticket not in self._waiting:
+                return 0
+            return self._waiting.index(ticket) + 1
+
+    def wait(self, ticket, check=None):
+        """Block until `ticket` is granted. `check()` is called while waiting and may raise to give up."""
+        started = time.monotonic()
+        try:
+            with self._cond:
+                while True:
+                    if check is not None:
+                        check()
+                    delay = self._delay(ticket, time.monotonic())
+                    if delay <= 0:
+                        break
+                    self._cond.wait(min(delay, POLL))
+                now = time.monotonic()
+                self._requests.take(1, now)
+                self._tokens.take(ticket.tokens, now)
+                if ticket.session is not None:
+                    self._session_bucket(ticket.session).take(1, now)
+                self._waiting.remove(ticket)
+                ticket.granted = True
+                self._running += 1
+                self._session_running[ticket.session] += 1
+                self._cond.notify_all()
+        except BaseException:
+            self.cancel(ticket)
+            raise
+        ticket.waited = time.monotonic() - started
+        return ticket
+
+    def release(self, ticket):
+        """The granted request has finished."""
+        with self._cond:
+            if ticket.granted:
+                ticket.granted = False
+                self._running -= 1
+                self._session_running[ticket.session] -= 1
+                if not self._session_running[ticket.session]:
+                    del self._session_running[ticket.session]
+                if len(self._session_buckets) > 1024:
+                    self._forget_idle_sessions(time.monotonic())
+                self._cond.notify_all()
+
+    def cancel(self, ticket):
+        with self._cond:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
+
+    def pause(self, seconds):
+        """Grant nothing for `seconds` (e.g. the Retry-After of a 429)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self):
+        with self._cond:
+            return {"waiting": len(self._waiting), "running": self._running,
+                    "sessions": len(self._session_running)}
+
+    # ----------------------------
+    # Admission (called with the lock held)
+    # ----------------------------
+    def _session_bucket(self, session):
+        bucket = self._session_buckets.get(session)
+        if bucket is None:
+            bucket = self._session_buckets[session] = TokenBucket(self.session_requests_per_minute)
+        return bucket
+
+    def _forget_idle_sessions(self, now):
+        # A full bucket remembers nothing a new one would not
+        for session, bucket in list(self._session_buckets.items()):
+            if session not in self._session_running and bucket.delay(bucket.capacity, now) <= 0:
+                del self._session_buckets[session]
+
+    def _session_ok(self, ticket, now):
+        if ticket.session is None:
+            return True
+        return (self._session_running[ticket.session] < self.session_concurrency
+                and self._session_bucket(ticket.session).delay(1, now) <= 0)
+
+    def _delay(self, ticket, now):
+        if self._paused_until > now:
+            return self._paused_until - now
+        # Only the first ticket whose session is within its quota may go next
+        head = next((t for t in self._waiting if self._session_ok(t, now)), None)
+        if head is not ticket or self._running >= self.max_concurrent:
+            return POLL
+        return max(self._requests.delay(1, now), self._tokens.delay(ticket.tokens, now))
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """The process-wide scheduler, configured from the environment on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            env = os.environ.get
+            _scheduler = LLMScheduler(
+                requests_per_minute=float(env("RESUME_ANALYZER_LLM_RPM", "500")),
+                tokens_per_minute=float(env("RESUME_ANALYZER_LLM_TPM", "200000")),
+                max_concurrent=int(env("RESUME_ANALYZER_LLM_CONCURRENCY", "16")),
+                session_concurrency=int(env("RESUME_ANALYZER_LLM_SESSION_CONCURRENCY", "4")),
+                session_requests_per_minute=float(env("RESUME_ANALYZER_LLM_SESSION_RPM", "60")),
+            )
+        return _scheduler
@@ -0,0 +1,46 @@
+"""Splitting a resume into its sections (Experience, Skills, Education...)."""
+import re
+from collections import namedtuple
+
+# `heading` is the heading line as written ("" for the part before the first one)
+Section = namedtuple("Section", "heading body")
+
+SECTION_NAMES = (
+    "summary", "professional summary", "profile", "objective", "about me",
+    "experience", "work experience", "professional experience", "employment history", "work history",
+    "skills", "technical skills", "core competencies", "key skills",
+    "education", "academic background", "projects", "personal projects", "key projects",
+    "certifications", "certificates", "licenses", "awards", "achievements", "honors",
+    "publications", "languages", "interests", "hobbies", "volunteering", "volunteer experience",
+    "references", "training", "courses", "leadership", "activities",
+)
+
+_NAME_RE = re.compile(r"^[#*\s]*(%s)[\s*]*:?[\s*]*$" % "|".join(sorted(map(re.escape, SECTION_NAMES),
+                                                                       key=len, reverse=True)),
+                      re.IGNORECASE)
+# Short all-caps lines ending in a colon, e.g. "OPEN SOURCE:"
+_CAPS_RE = re.compile(r"^[#*\s]*[A-Z][A-Z &/]{2,30}:\s*$")
+
+
+def is_heading(line):
+    return bool(_NAME_RE.match(line) or _CAPS_RE.match(line))
+
+
+def split_sections(text):
+    """Return the resume as `Section`s in order.
+
+    Joining `heading + "\\n" + body` of every section (just `body` when the
+    heading is empty) with newlines gives back the original lines.
+    """
+    sections = []
+    heading, body = "", []
+    for line in (text or "").splitlines():
+        if is_heading(line.strip()):
+            if heading or any(l.strip() for l in body):
+                sections.append(Section(heading, "\n".join(body)))
+            heading, body = line, []
+        else:
+            body.append(line)
+    if heading or any(l.strip() for l in body):
+        sections.append(Section(heading, "\n".join(body)))
+    return sections
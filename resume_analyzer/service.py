@@ -0,0 +1,182 @@
+"""JSON HTTP API for resume scoring.
+
+    python -m resume_analyzer serve --port 8080
+
+``POST /score`` accepts JSON ``{"resume_text": ..., "job_desc": ...}``, a
+form (urlencoded or multipart) with ``resume_text`` and ``job_desc`` fields,
+or a multipart form with a ``resume`` PDF file in place of ``resume_text``.
+It returns ``{"score", "rtech", "rsoft", "jtech", "jsoft"}``, the same breakdown
+the Analysis tab renders. ``GET /healthz`` reports liveness and
+``GET /metrics`` serves stage timings and cache counters in the Prometheus
+text format (see metrics.py; populated once metrics are enabled).
+
+Handlers are async; scoring and PDF extraction run in a process pool.
+Concurrent score requests are gathered into micro-batches (up to
+``max_batch`` pairs or ``max_delay`` seconds) and each batch is one pool task
+scored with score_pairs, so pool overhead is paid per batch rather than per
+request. Requires aiohttp (``pip install aiohttp``).
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from resume_analyzer import metrics
+from resume_analyzer.matching import score_pairs
+from resume_analyzer.pdf import extract_text_from_pdf
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+def _with_metrics(func, *args):
+    # Runs in a pool worker; its stage timings travel back with the result
+    return func(*args), metrics.drain()
+
+
+async def _in_pool(executor, func, *args):
+    result, events = await asyncio.get_running_loop().run_in_executor(executor, _with_metrics, func, *args)
+    metrics.replay(events)
+    return result
+
+
+class ScoreBatcher:
+    """Coalesces concurrent score requests into batched pool tasks."""
+
+    def __init__(self, executor, max_batch=32, max_delay=0.005, vectorizer="exact"):
+        self.executor = executor
+        self.vectorizer = vectorizer
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = asyncio.Queue()
+        self._task = None
+        self._inflight = set()
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        for task in list(self._inflight):
+            await task
+
+    async def score(self, resume_text, job_desc):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((resume_text, job_desc, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Keep collecting the next batch while this one is being scored
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch):
+        pairs = [(resume_text, job_desc) for resume_text, job_desc, _ in batch]
+        started = time.perf_counter()
+        try:
+            results = await _in_pool(self.executor, score_pairs, pairs, self.vectorizer)
+            metrics.record("service.batch", time.perf_counter() - started,
+                           sum(len(resume_text) + len(job_desc) for resume_text, job_desc in pairs))
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _breakdown(result):
+    score, rtech, rsoft, jtech, jsoft = result
+    return {"score": float(score), "rtech": rtech, "rsoft": rsoft, "jtech": jtech, "jsoft": jsoft}
+
+
+def create_app(workers=None, max_batch=32, max_delay=0.005, vectorizer="exact"):
+    from aiohttp import web
+
+    async def read_request(request):
+        if request.content_type in ("multipart/form-data", "application/x-www-form-urlencoded"):
+            form = await request.post()
+            job_desc = form.get("job_desc")
+            resume = form.get("resume")
+            if hasattr(resume, "file"):
+                data = resume.file.read()
+                text, err = await _in_pool(request.app["executor"], extract_text_from_pdf, data, False)
+                if err:
+                    raise web.HTTPBadRequest(text=err)
+                return text, job_desc
+            return form.get("resume_text", resume), job_desc
+        try:
+            body = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="Expected a JSON body or a form")
+        if not isinstance(body, dict):
+            raise web.HTTPBadRequest(text="Expected a JSON object")
+        return body.get("resume_text"), body.get("job_desc")
+
+    async def score(request):
+        started = time.perf_counter()
+        try:
+            resume_text, job_desc = await read_request(request)
+        except web.HTTPBadRequest as e:
+            return web.json_response({"error": e.text}, status=400)
+        if not isinstance(resume_text, str) or not isinstance(job_desc, str):
+            return web.json_response({"error": "resume_text (or a resume PDF) and job_desc are required"},
+                                     status=400)
+        result = await request.app["batcher"].score(resume_text, job_desc)
+        metrics.record("service.score", time.perf_counter() - started, len(resume_text) + len(job_desc))
+        return web.json_response(_breakdown(result))
+
+    async def healthz(request):
+        return web.json_response({"status": "ok"})
+
+    async def metrics_text(request):
+        return web.Response(text=metrics.prometheus_text(),
+                            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    async def on_startup(app):
+        # Workers record stage timings only if the parent does
+        app["executor"] = ProcessPoolExecutor(workers or os.cpu_count() or 1,
+                                              initializer=metrics.enable, initargs=(metrics.enabled(),))
+        app["batcher"] = ScoreBatcher(app["executor"], max_batch=max_batch, max_delay=max_delay,
+                                        vectorizer=vectorizer)
+        app["batcher"].start()
+
+    async def on_cleanup(app):
+        await app["batcher"].stop()
+        app["executor"].shutdown(cancel_futures=True)
+
+    app = web.Application(client_max_size=MAX_BODY_BYTES)
+    app.router.add_post("/score", score)
+    app.router.add_get("/healthz", healthz)
+    app.router.add_get("/metrics", metrics_text)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def serve(host="127.0.0.1", port=8080, workers=None, max_batch=32, max_delay=0.005, vectorizer="exact"):
+    from aiohttp import web
+
+    web.run_app(create_app(workers, max_batch, max_delay, vectorizer), host=host, port=port)
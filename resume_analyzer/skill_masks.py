@@ -0,0 +1,103 @@
+"""Skills as boolean masks over the taxonomy slots.
+
+A mask has one entry per taxonomy slot (one skill within one category), so
+a skill listed under two categories is counted once per category, exactly
+as the `{category: [skills]}` lists count it. Stacking masks row-wise turns
+matched / missing / coverage for many resume x job pairs into a handful of
+array operations instead of per-category set intersections.
+"""
+import numpy as np
+
+from resume_analyzer.skills import get_default_matcher
+
+
+class SkillSpace:
+    def __init__(self, matcher):
+        self.matcher = matcher
+        n_slots = matcher.index.n_slots
+        self.n_slots = n_slots
+        self.category = np.array([matcher.index.category_of(slot) for slot in range(n_slots)],
+                                 dtype=np.int32)
+        self.soft = self.category == matcher.index.soft_category
+        self.tech = ~self.soft
+
+    # ----------------------------
+    # Building masks
+    # ----------------------------
+    def mask(self, slots):
+        """Boolean row with True at each slot id in `slots`."""
+        row = np.zeros(self.n_slots, dtype=bool)
+        row[np.fromiter(slots, dtype=np.int64, count=len(slots))] = True
+        return row
+
+    def stack(self, slot_sets):
+        """One mask per slot set, as a 2-D array."""
+        rows = np.zeros((len(slot_sets), self.n_slots), dtype=bool)
+        for i, slots in enumerate(slot_sets):
+            rows[i, np.fromiter(slots, dtype=np.int64, count=len(slots))] = True
+        return rows
+
+    # ----------------------------
+    # Pairwise comparison
+    # ----------------------------
+    def coverage(self, resume_masks, job_masks):
+        """`(tech %, soft %)` of each job's skills found in each resume.
+
+        Both are `len(resume_masks) x len(job_masks)` arrays; a job with no
+        skills of a kind scores 0 for that kind.
+        """
+        resumes = np.atleast_2d(resume_masks).astype(np.float32)
+        jobs = np.atleast_2d(job_masks)
+        return (self._percent(resumes, jobs, self.tech),
+                self._percent(resumes, jobs, self.soft))
+
+    @staticmethod
+    def _percent(resumes, jobs, kind):
+        # Matched counts are exact in float32 up to 2**24 slots
+        wanted = (jobs & kind).astype(np.float32)
+        matched = resumes @ wanted.T
+        totals = wanted.sum(axis=1)
+        percent = np.divide(matched.astype(np.float64), totals,
+                            out=np.zeros(matched.shape), where=totals > 0)
+        return percent * 100
+
+    def category_matches(self, resume_masks, job_masks):
+        """Matched skill counts per category, shaped resumes x jobs x categories.
+
+        The last category is soft skills, after the taxonomy's tech categories.
+        """
+        resumes = np.atleast_2d(resume_masks).astype(np.float32)
+        jobs = np.atleast_2d(job_masks)
+        n_categories = len(self.matcher.categories) + 1
+        counts = np.zeros((len(resumes), len(jobs), n_categories), dtype=np.int64)
+        for cat_index in range(n_categories):
+            wanted = (jobs & (self.category == cat_index)).astype(np.float32)
+            counts[:, :, cat_index] = resumes @ wanted.T
+        return counts
+
+    def gaps(self, resume_mask, job_mask):
+        """`(matched, missing)` slot ids of a job for one resume, in slot order."""
+        return np.flatnonzero(job_mask & resume_mask), np.flatnonzero(job_mask & ~resume_mask)
+
+
+def blend(similarity, tech_match, soft_match):
+    """40% text similarity (0-1), 45% tech and 15% soft skill coverage (0-100).
+
+    Coverage is already a percentage, so it is weighted by 0.45 and 0.15;
+    weighting it by 45 and 15 would count it 100 times over.
+
+    Works elementwise on arrays; the result is capped at 100.
+    """
+    final_score = np.asarray(similarity) * 40 + tech_match * 0.45 + soft_match * 0.15
+    return np.minimum(np.round(final_score, 2), 100)
+
+
+_default_space = None
+
+
+def get_skill_space():
+    """SkillSpace over the default matcher's taxonomy."""
+    global _default_space
+    if _default_space is None or _default_space.matcher is not get_default_matcher():
+        _default_space = SkillSpace(get_default_matcher())
+    return _default_space
@@ -0,0 +1,91 @@
+"""Single-pass skill matching over a compiled skill taxonomy."""
+import hashlib
+
+from resume_analyzer.metrics import timed
+from resume_analyzer.taxonomy import load_skill_index, tokenize
+
+
+class SkillMatcher:
+    """Finds every taxonomy skill in a text with one scan over its tokens.
+
+    The index maps each normalized skill phrase (and alias) to its taxonomy
+    slots and flags phrases that are proper prefixes of longer ones. Matching
+    walks the tokens once and only extends a candidate phrase while it is
+    still a known prefix, so the cost depends on the text length rather than
+    the number of skills, and matches always fall on token boundaries
+    ("go" never matches inside "good", "java" never inside "javascript").
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.categories = index.categories
+
+    def match(self, text):
+        return self.match_tokens(tokenize(text))
+
+    def match_tokens(self, tokens):
+        """Like match, for text already split with taxonomy.tokenize."""
+        return self.group_slots(self.match_slots(tokens))
+
+    def match_slots(self, tokens):
+        """Set of taxonomy slot ids (one per category entry) found in `tokens`."""
+        n_tokens = len(tokens)
+        lookup = self.index.lookup
+        hits = set()
+
+        for start in range(n_tokens):
+            key = tokens[start]
+            end = start + 1
+            while True:
+                entry = lookup(key)
+                if entry is None:
+                    break
+                slots, is_prefix = entry
+                hits.update(slots)
+                if not is_prefix or end >= n_tokens:
+                    break
+                key = key + " " + tokens[end]
+                end += 1
+        return hits
+
+    def is_soft(self, slot):
+        return self.index.category_of(slot) == self.index.soft_category
+
+    def slot_name(self, slot):
+        """"Category: Skill" (or "Soft: Skill") for a slot, as in skill_gaps."""
+        if self.is_soft(slot):
+            return f"Soft: {self.index.label(slot)}"
+        return f"{self.categories[self.index.category_of(slot)]}: {self.index.label(slot)}"
+
+    def fingerprint(self):
+        """Changes whenever slot ids would mean different skills."""
+        names = "\n".join(self.slot_name(slot) for slot in range(self.index.n_slots))
+        return hashlib.sha256(names.encode("utf-8")).hexdigest()
+
+    def group_slots(self, hits):
+        """Turn slot ids into the `({category: [skills]}, [soft skills])` shape."""
+        found_skills = {category: [] for category in self.categories}
+        found_soft_skills = []
+        for slot in sorted(hits):
+            cat_index = self.index.category_of(slot)
+            if cat_index == self.index.soft_category:
+                found_soft_skills.append(self.index.label(slot))
+            else:
+                found_skills[self.categories[cat_index]].append(self.index.label(slot))
+        return found_skills, found_soft_skills
+
+
+_default_matcher = None
+
+
+def get_default_matcher():
+    """Matcher over the configured taxonomy, opened once per process."""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = SkillMatcher(load_skill_index())
+    return _default_matcher
+
+
+@timed("extract_skills_advanced")
+def extract_skills_advanced(text):
+    return get_default_matcher().match(text)
@@ -0,0 +1,328 @@
+"""Loading skill taxonomies and compiling them into a memory-mapped index.
+
+A taxonomy is read from JSON or CSV:
+
+JSON::
+
+    {"tech": {"Cloud & DevOps": ["docker", {"name": "kubernetes", "aliases": ["k8s"]}]},
+     "soft": ["communication", {"name": "teamwork", "aliases": ["team player"]}]}
+
+CSV (header required, aliases separated by ``|``)::
+
+    category,skill,aliases
+    Cloud & DevOps,kubernetes,k8s
+    Soft Skills,teamwork,team work|team player
+
+Rows whose category is ``Soft Skills`` become soft skills. A skill is
+displayed as its name is written ("PostgreSQL", "iOS"), or as its optional
+``label`` when that differs from the phrase to match (``node`` -> "Node.js").
+Matching ignores case either way.
+
+The taxonomy is compiled into a flat binary file (an open-addressing hash
+table over normalized skill phrases plus string tables) that is opened with
+``mmap`` so that starting a process costs one ``open`` instead of a rebuild.
+Build it ahead of time with::
+
+    python -m resume_analyzer.taxonomy path/to/taxonomy.json [-o out.idx]
+"""
+import argparse
+import csv
+import functools
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+from collections import namedtuple
+
+SOFT_CATEGORY = "Soft Skills"
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "data", "skills_taxonomy.json")
+
+SkillEntry = namedtuple("SkillEntry", "name aliases label")
+Taxonomy = namedtuple("Taxonomy", "tech soft")
+
+# magic, n_categories, n_slots, n_phrases, table_size, n_refs, blob_len,
+# source_mtime_ns, source_size
+_HEADER = struct.Struct("<8sIIIIIIqq")
+_MAGIC = b"RSKIDX01"
+_PHRASE_FIELDS = 5  # key_offset, key_len, ref_start, ref_count, flags
+_SLOT_FIELDS = 3  # category, label_offset, label_len
+_IS_SKILL = 1
+_IS_PREFIX = 2
+
+# A token starts with a letter or digit and may carry trailing "+"/"#" so
+# that "c++" and "c#" survive; every other character is a boundary.
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+class TaxonomyError(ValueError):
+    pass
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+# ----------------------------
+# Taxonomy sources
+# ----------------------------
+def _entry(raw):
+    if isinstance(raw, str):
+        return SkillEntry(raw, (), None)
+    if isinstance(raw, dict) and raw.get("name"):
+        return SkillEntry(raw["name"], tuple(raw.get("aliases") or ()), raw.get("label"))
+    raise TaxonomyError(f"Invalid skill entry: {raw!r}")
+
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("tech"), dict):
+        raise TaxonomyError(f"{path}: expected an object with a 'tech' mapping")
+    tech = {category: [_entry(raw) for raw in skills] for category, skills in data["tech"].items()}
+    soft = [_entry(raw) for raw in data.get("soft", [])]
+    return Taxonomy(tech, soft)
+
+
+def _load_csv(path):
+    tech, soft = {}, []
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or not {"category", "skill"} <= set(reader.fieldnames):
+            raise TaxonomyError(f"{path}: expected 'category' and 'skill' columns")
+        for row in reader:
+            name = (row.get("skill") or "").strip()
+            if not name:
+                continue
+            aliases = tuple(a.strip() for a in (row.get("aliases") or "").split("|") if a.strip())
+            entry = SkillEntry(name, aliases, (row.get("label") or "").strip() or None)
+            category = (row.get("category") or "").strip()
+            if category == SOFT_CATEGORY:
+                soft.append(entry)
+            else:
+                tech.setdefault(category, []).append(entry)
+    return Taxonomy(tech, soft)
+
+
+def load_taxonomy(path):
+    if path.lower().endswith(".csv"):
+        return _load_csv(path)
+    return _load_json(path)
+
+
+# ----------------------------
+# Index build
+# ----------------------------
+def _hash(key):
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def build_index(taxonomy, source_mtime_ns=0, source_size=0):
+    """Compile a taxonomy into the binary index format and return the bytes."""
+    categories = list(taxonomy.tech)
+    grouped = [taxonomy.tech[c] for c in categories] + [taxonomy.soft]
+
+    blob = bytearray()
+    strings = {}
+
+    def intern(text):
+        data = text.encode("utf-8")
+        if data not in strings:
+            strings[data] = len(blob)
+            blob.extend(data)
+        return strings[data], len(data)
+
+    # Slot ids follow taxonomy order, so sorting hits restores that order.
+    slots = []
+    phrase_refs = {}
+    prefixes = set()
+    for cat_index, entries in enumerate(grouped):
+        for entry in entries:
+            slot = len(slots)
+            slots.append((cat_index,) + intern(entry.label or entry.name))
+            for text in (entry.name,) + entry.aliases:
+                words = tokenize(text)
+                if not words:
+                    continue
+                refs = phrase_refs.setdefault(" ".join(words), [])
+                if slot not in refs:
+                    refs.append(slot)
+                for end in range(1, len(words)):
+                    prefixes.add(" ".join(words[:end]))
+
+    keys = sorted(set(phrase_refs) | prefixes)
+    table_size = 8
+    while table_size < 2 * len(keys):
+        table_size *= 2
+    hashes = [0] * table_size
+    ids = [0] * table_size
+    phrases, refs = [], []
+    for phrase_id, key in enumerate(keys):
+        key_bytes = key.encode("utf-8")
+        key_offset, key_len = intern(key)
+        key_refs = phrase_refs.get(key, [])
+        flags = (_IS_SKILL if key_refs else 0) | (_IS_PREFIX if key in prefixes else 0)
+        phrases.extend((key_offset, key_len, len(refs), len(key_refs), flags))
+        refs.extend(key_refs)
+
+        h = _hash(key_bytes)
+        pos = h & (table_size - 1)
+        while ids[pos]:
+            pos = (pos + 1) & (table_size - 1)
+        hashes[pos] = h
+        ids[pos] = phrase_id + 1
+
+    category_strings = []
+    for name in categories:
+        category_strings.extend(intern(name))
+    flat_slots = [value for slot in slots for value in slot]
+
+    header = _HEADER.pack(_MAGIC, len(categories), len(slots), len(keys), table_size,
+                          len(refs), len(blob), source_mtime_ns, source_size)
+    return b"".join([
+        header,
+        struct.pack(f"<{table_size}Q", *hashes),
+        struct.pack(f"<{table_size}I", *ids),
+        struct.pack(f"<{len(phrases)}I", *phrases),
+        struct.pack(f"<{len(refs)}I", *refs),
+        struct.pack(f"<{len(flat_slots)}I", *flat_slots),
+        struct.pack(f"<{len(category_strings)}I", *category_strings),
+        bytes(blob),
+    ])
+
+
+def compile_taxonomy(source, index_path):
+    """Build the index for `source` and atomically write it to `index_path`."""
+    stat = os.stat(source)
+    data = build_index(load_taxonomy(source), stat.st_mtime_ns, stat.st_size)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, index_path)
+    return data
+
+
+# ----------------------------
+# Index reader
+# ----------------------------
+class SkillIndex:
+    """Read-only view over a compiled index held in a buffer or an mmap."""
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        (magic, n_categories, n_slots, n_phrases, table_size, n_refs, blob_len,
+         self.source_mtime_ns, self.source_size) = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise TaxonomyError("Not a skill index (bad magic)")
+
+        offset = _HEADER.size
+
+        def section(count, fmt, width):
+            nonlocal offset
+            part = view[offset:offset + count * width].cast(fmt)
+            offset += count * width
+            return part
+
+        self._mask = table_size - 1
+        self._hashes = section(table_size, "Q", 8)
+        self._ids = section(table_size, "I", 4)
+        self._phrases = section(n_phrases * _PHRASE_FIELDS, "I", 4)
+        self._refs = section(n_refs, "I", 4)
+        self._slots = section(n_slots * _SLOT_FIELDS, "I", 4)
+        category_strings = section(n_categories * 2, "I", 4)
+        self._blob = view[offset:offset + blob_len]
+
+        self.categories = [self._string(category_strings[2 * i], category_strings[2 * i + 1])
+                           for i in range(n_categories)]
+        self.soft_category = n_categories
+        self.n_slots = n_slots
+        self.lookup = functools.lru_cache(maxsize=65536)(self._lookup)
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _string(self, offset, length):
+        return bytes(self._blob[offset:offset + length]).decode("utf-8")
+
+    def _lookup(self, key):
+        """Return `(slot_ids, is_prefix)` for a normalized phrase, or None."""
+        key_bytes = key.encode("utf-8")
+        h = _hash(key_bytes)
+        pos = h & self._mask
+        while True:
+            phrase_id = self._ids[pos]
+            if not phrase_id:
+                return None
+            if self._hashes[pos] == h:
+                base = (phrase_id - 1) * _PHRASE_FIELDS
+                key_offset, key_len, ref_start, ref_count, flags = self._phrases[base:base + _PHRASE_FIELDS]
+                if self._blob[key_offset:key_offset + key_len] == key_bytes:
+                    return tuple(self._refs[ref_start:ref_start + ref_count]), bool(flags & _IS_PREFIX)
+            pos = (pos + 1) & self._mask
+
+    @functools.cached_property
+    def max_phrase_words(self):
+        """Most tokens in any indexed skill phrase or alias."""
+        lengths = self._phrases[1::_PHRASE_FIELDS]
+        offsets = self._phrases[0::_PHRASE_FIELDS]
+        return max((self._string(offset, length).count(" ") + 1
+                    for offset, length in zip(offsets, lengths)), default=0)
+
+    def category_of(self, slot):
+        return self._slots[slot * _SLOT_FIELDS]
+
+    def label(self, slot):
+        base = slot * _SLOT_FIELDS
+        return self._string(self._slots[base + 1], self._slots[base + 2])
+
+
+def load_skill_index(source=None, index_path=None):
+    """Open the compiled index for `source`, rebuilding it only when stale.
+
+    `source` defaults to ``$RESUME_ANALYZER_TAXONOMY`` or the bundled
+    taxonomy, and the index lives next to it unless `index_path` (or
+    ``$RESUME_ANALYZER_SKILL_INDEX``) says otherwise. If the index cannot be
+    written, the freshly built one is used from memory.
+    """
+    source = source or os.environ.get("RESUME_ANALYZER_TAXONOMY") or DEFAULT_TAXONOMY_PATH
+    index_path = (index_path or os.environ.get("RESUME_ANALYZER_SKILL_INDEX")
+                  or os.path.splitext(source)[0] + ".idx")
+
+    try:
+        index = SkillIndex.open(index_path)
+    except (OSError, ValueError, TaxonomyError):
+        index = None
+    try:
+        stat = os.stat(source)
+    except OSError:
+        if index is None:
+            raise
+        # Deployed with a prebuilt index only
+        return index
+    if index is not None and (index.source_mtime_ns, index.source_size) == (stat.st_mtime_ns, stat.st_size):
+        return index
+
+    try:
+        compile_taxonomy(source, index_path)
+        return SkillIndex.open(index_path)
+    except OSError:
+        return SkillIndex(build_index(load_taxonomy(source), stat.st_mtime_ns, stat.st_size))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a skill taxonomy into a memory-mapped index.")
+    parser.add_argument("source", help="taxonomy JSON or CSV file")
+    parser.add_argument("-o", "--output", help="index path (default: next to the source, .idx)")
+    args = parser.parse_args(argv)
+
+    index_path = args.output or os.path.splitext(args.source)[0] + ".idx"
+    data = compile_taxonomy(args.source, index_path)
+    index = SkillIndex(data)
+    print(f"Wrote {index_path}: {len(data)} bytes, {len(index.categories)} categories")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Small resume and job description texts shared by the tests."""
+
+RESUME = """EXPERIENCE:
+• 3 years as Backend Developer
+• Built REST APIs with Python and Django
+
+SKILLS:
+• Python, SQL, Docker, AWS
+• Communication, leadership"""
+
+SHORT_RESUME = "Python developer. Docker, teamwork."
+
+JAVA_RESUME = "Java developer with Spring and Hibernate experience."
+
+JOB = "JOB TITLE: Backend Engineer\nPython, Django, PostgreSQL, Kubernetes, AWS, communication, leadership"
+
+FRONTEND_JOB = "JOB TITLE: Frontend Developer\nReact, TypeScript, CSS, teamwork"
@@ -0,0 +1,180 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks.fake_openai import FakeOpenAI
+from resume_analyzer import ai, scheduler
+
+pytest.importorskip("openai")
+
+RESUME = "EXPERIENCE:\n• Built REST APIs with Python\n\nSKILLS:\n• Python, SQL"
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    # Each test gets its own scheduler and an empty rewrite cache
+    monkeypatch.setattr(scheduler, "_scheduler", scheduler.LLMScheduler())
+    ai.rewrite_cache.clear()
+    yield
+    ai.rewrite_cache.clear()
+
+
+@pytest.fixture
+def fake_openai(request):
+    options = getattr(request, "param", {})
+    fake = FakeOpenAI(**options).start()
+    yield fake
+    fake.stop()
+
+
+def improve(fake, resume_text=RESUME, **kwargs):
+    return ai.ai_improve_resume(resume_text, "sk-test", "Backend Engineer", api_base=fake.api_base, **kwargs)
+
+
+def test_rewrite(fake_openai):
+    improved, err = improve(fake_openai)
+    assert err is None
+    assert improved == f"IMPROVED ({ai.MODEL}):\n{RESUME}"
+    assert fake_openai.requests == 1
+
+
+def test_rewrite_is_cached(fake_openai):
+    first = improve(fake_openai)
+    assert improve(fake_openai) == first
+    assert fake_openai.requests == 1
+    # Any other input is a new request
+    improve(fake_openai, max_tokens=300)
+    improve(fake_openai, resume_text=RESUME + "\n• Docker")
+    assert fake_openai.requests == 3
+
+
+def test_cache_key_covers_every_input():
+    base = ai.rewrite_key(RESUME, "Backend Engineer")
+    assert ai.rewrite_key(RESUME, "Backend Engineer") == base
+    assert len({base, ai.rewrite_key(RESUME, "Data Engineer"), ai.rewrite_key(RESUME, "Backend Engineer", "gpt-4o"),
+                ai.rewrite_key(RESUME, "Backend Engineer", max_tokens=300),
+                ai.rewrite_key(RESUME, "Backend Engineer", temperature=0.7),
+                ai.rewrite_key(RESUME, "Backend Engineer", api_base="http://localhost:8199/v1")}) == 6
+
+
+@pytest.mark.parametrize("fake_openai", [{"latency": 0.3}], indirect=True)
+def test_identical_requests_share_one_call(fake_openai):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(improve(fake_openai))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert len(results) == 4 and len(set(results)) == 1
+    assert fake_openai.requests == 1
+
+
+def test_failures_are_not_cached(fake_openai):
+    fake_openai.fail_first = 1
+    improved, err = improve(fake_openai, retries=0)
+    assert improved is None and err.startswith("OpenAI request failed")
+    assert improve(fake_openai)[1] is None
+    assert fake_openai.requests == 2
+
+
+def test_missing_api_key():
+    assert ai.ai_improve_resume(RESUME, "") == (None, "No OpenAI API key provided")
+
+
+def start(fake, resume_text=RESUME, **kwargs):
+    kwargs.setdefault("backoff", 0.01)
+    return ai.start_rewrite(resume_text, "sk-test", "Backend Engineer", api_base=fake.api_base, **kwargs)
+
+
+@pytest.mark.parametrize("fake_openai", [{"token_delay": 0.05}], indirect=True)
+def test_rewrite_streams_in_the_background(fake_openai):
+    job = start(fake_openai)
+    assert not job.done.is_set()
+    partial = ""
+    while not job.done.wait(0.02):
+        partial = partial or job.text
+    assert partial and partial != job.text and job.text.startswith(partial)
+    assert job.wait() == (f"IMPROVED ({ai.MODEL}):\n{RESUME}", None)
+    assert job.first_text_after is not None
+
+
+@pytest.mark.parametrize("fake_openai", [{"token_delay": 0.05}], indirect=True)
+def test_cancel_stops_the_job(fake_openai):
+    job = start(fake_openai)
+    job.cancel()
+    assert job.wait(5) == (None, "Cancelled")
+    assert not ai._jobs
+
+
+@pytest.mark.parametrize("fake_openai", [{"latency": 1.0}], indirect=True)
+def test_timeout(fake_openai):
+    improved, err = start(fake_openai, timeout=0.2, retries=0).wait(10)
+    assert improved is None
+    assert err == "OpenAI request timed out (no response for 0.2s)"
+
+
+@pytest.mark.parametrize("fake_openai", [{"fail_first": 1}], indirect=True)
+def test_503_is_retried(fake_openai):
+    improved, err = start(fake_openai).wait(10)
+    assert err is None
+    assert improved.startswith("IMPROVED")
+    assert fake_openai.requests == 2
+
+
+@pytest.mark.parametrize("fake_openai", [{"fail_first": 5}], indirect=True)
+def test_gives_up_after_the_last_retry(fake_openai):
+    job = start(fake_openai, retries=1)
+    improved, err = job.wait(10)
+    assert improved is None
+    assert err.startswith("OpenAI request failed")
+    assert job.attempts == 2 and fake_openai.requests == 2
+    assert not ai._jobs
+
+
+def test_job_finishes_when_error_classification_fails(fake_openai, monkeypatch):
+    def broken(openai, error):
+        raise AttributeError("module 'openai' has no attribute 'error'")
+
+    monkeypatch.setattr(ai, "_retryable", broken)
+    fake_openai.fail_first = 1
+    improved, err = start(fake_openai).wait(10)
+    assert improved is None
+    assert err.startswith("OpenAI request failed")
+    assert not ai._jobs
+
+
+def test_rewrite_by_section(fake_openai):
+    improved, err = improve(fake_openai, by_section=True)
+    assert err is None
+    assert improved == (f"EXPERIENCE:\nIMPROVED ({ai.MODEL}):\n• Built REST APIs with Python\n\n"
+                        f"SKILLS:\nIMPROVED ({ai.MODEL}):\n• Python, SQL")
+    assert fake_openai.requests == 2
+    # Sections are cached one by one: a change to one only rewrites that one
+    improve(fake_openai, resume_text=RESUME + ", Docker", by_section=True)
+    assert fake_openai.requests == 3
+
+
+@pytest.mark.parametrize("fake_openai", [{"rate_limit": 1, "window": 1.0}], indirect=True)
+def test_429_pauses_the_scheduler_and_is_retried(fake_openai):
+    assert improve(fake_openai)[1] is None
+    job = start(fake_openai, resume_text=RESUME + "\n• Docker")
+    improved, err = job.wait(10)
+    assert err is None
+    assert improved.endswith("Docker")
+    assert fake_openai.rate_limited == 1
+    assert fake_openai.requests == 3
+    assert scheduler.get_scheduler()._paused_until > 0
+
+
+def test_rewrites_take_a_scheduler_ticket(fake_openai, monkeypatch):
+    # With no room for a single request, a rewrite waits in the queue
+    monkeypatch.setattr(scheduler, "_scheduler", scheduler.LLMScheduler(max_concurrent=0))
+    job = start(fake_openai)
+    deadline = time.monotonic() + 5
+    while job.queue_position != 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.queue_position == 1
+    assert fake_openai.requests == 0
+    job.cancel()
+    assert job.wait(5) == (None, "Cancelled")
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+
+import pytest
+
+from resume_analyzer import cli
+from tests.samples import FRONTEND_JOB, JAVA_RESUME, JOB, RESUME
+
+
+@pytest.fixture
+def folders(tmp_path):
+    resumes = tmp_path / "resumes"
+    (resumes / "nested").mkdir(parents=True)
+    (resumes / "backend.txt").write_text(RESUME, encoding="utf-8")
+    (resumes / "nested" / "java.md").write_text(JAVA_RESUME, encoding="utf-8")
+    (resumes / "notes.docx").write_text("ignored", encoding="utf-8")
+    for team, text in (("a", JOB), ("b", FRONTEND_JOB)):
+        (tmp_path / "jobs" / team).mkdir(parents=True)
+        (tmp_path / "jobs" / team / "dev.txt").write_text(text, encoding="utf-8")
+    return tmp_path
+
+
+def test_find_resumes_searches_subfolders(folders):
+    found = cli.find_resumes(str(folders / "resumes"))
+    assert [path.rsplit("/", 2)[-2:] for path in found] == [["resumes", "backend.txt"], ["nested", "java.md"]]
+
+
+def test_job_names():
+    assert cli.job_names(["jobs/backend.txt", "jobs/data.txt"]) == ["backend.txt", "data.txt"]
+    assert cli.job_names(["jobs/a/dev.txt", "jobs/b/dev.txt"]) == ["a/dev.txt", "b/dev.txt"]
+    assert cli.job_names(["dev.txt"]) == ["dev.txt"]
+    with pytest.raises(ValueError):
+        cli.job_names(["jobs/dev.txt", "./jobs/dev.txt"])
+
+
+def test_score_folder_ranks_per_job(folders):
+    jobs = cli.load_jobs([str(folders / "jobs" / "a" / "dev.txt"), str(folders / "jobs" / "b" / "dev.txt")])
+    assert [(name, title) for name, title, _ in jobs] == [("a/dev.txt", "Backend Engineer"),
+                                                          ("b/dev.txt", "Frontend Developer")]
+    rows = cli.score_folder(str(folders / "resumes"), jobs, workers=1)
+    assert [(row["job"], row["rank"]) for row in rows] == [("a/dev.txt", 1), ("a/dev.txt", 2),
+                                                           ("b/dev.txt", 1), ("b/dev.txt", 2)]
+    assert rows[0]["score"] >= rows[1]["score"] and rows[2]["score"] >= rows[3]["score"]
+    best = rows[0]
+    assert best["resume"].endswith("backend.txt")
+    assert best["score"] == pytest.approx(53.72, abs=0.01)
+    assert "Database: PostgreSQL" in best["missing_skills"]
+    assert "Programming: Python" in best["matched_skills"]
+
+
+def test_main_writes_csv_and_jsonl(folders, capsys):
+    args = ["score", str(folders / "resumes"), "-j", str(folders / "jobs" / "a" / "dev.txt"), "-w", "1"]
+    cli.main(args)
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert [row["rank"] for row in rows] == ["1", "2"]
+    assert rows[0]["job"] == "dev.txt"
+
+    out = folders / "ranked.jsonl"
+    cli.main(args + ["-o", str(out)])
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert list(records[0]) == cli.FIELDS
+    assert [r["score"] for r in records] == [float(row["score"]) for row in rows]
+
+
+def test_main_rejects_the_same_job_twice(folders):
+    job = str(folders / "jobs" / "a" / "dev.txt")
+    with pytest.raises(SystemExit):
+        cli.main(["score", str(folders / "resumes"), "-j", job, "-j", job])
+
+
+def test_unreadable_resume_is_reported_per_job(folders):
+    (folders / "resumes" / "broken.pdf").write_bytes(b"not a pdf")
+    jobs = cli.load_jobs([str(folders / "jobs" / "a" / "dev.txt")])
+    rows = cli.score_resume(str(folders / "resumes" / "broken.pdf"), jobs)
+    assert rows[0]["score"] == 0
+    assert rows[0]["error"]
+
+
+def test_worker_pool_gives_the_same_rows(folders):
+    jobs = cli.load_jobs([str(folders / "jobs" / "a" / "dev.txt"), str(folders / "jobs" / "b" / "dev.txt")])
+    resumes = str(folders / "resumes")
+    assert cli.score_folder(resumes, jobs, workers=2) == cli.score_folder(resumes, jobs, workers=1)
@@ -0,0 +1,48 @@
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from benchmarks.synthetic import synthetic_job, synthetic_resume
+from resume_analyzer.features import (counts_vector, cosine, hashed_vector, ngram_vector, resume_features,
+                                      text_vector)
+from tests.samples import JOB, RESUME
+
+
+def sklearn_cosine(a, b):
+    rows = CountVectorizer(stop_words='english', ngram_range=(1,3)).fit_transform([a, b])
+    return cosine_similarity(rows[0], rows[1])[0][0]
+
+
+def test_exact_cosine_matches_count_vectorizer():
+    assert cosine(ngram_vector(RESUME), ngram_vector(JOB)) == pytest.approx(sklearn_cosine(RESUME, JOB))
+
+
+def test_hashed_cosine_is_close_to_exact():
+    for seed in range(3):
+        resume, job = synthetic_resume(3_000, seed=seed), synthetic_job(1_500, seed=seed)
+        exact = cosine(ngram_vector(resume), ngram_vector(job))
+        assert cosine(hashed_vector(resume), hashed_vector(job)) == pytest.approx(exact, abs=0.005)
+
+
+def test_hashed_vector_has_no_strings_and_stays_in_range():
+    vector = hashed_vector(RESUME, n_features=2 ** 8)
+    assert all(isinstance(bucket, int) and 0 <= bucket < 2 ** 8 for bucket in vector.counts)
+    # Folding keeps the total count
+    assert sum(vector.counts.values()) == sum(ngram_vector(RESUME).counts.values())
+    assert len(vector.counts) <= len(ngram_vector(RESUME).counts)
+    assert text_vector(RESUME, "hashed") == hashed_vector(RESUME)
+
+
+def test_empty_text_and_unknown_vectorizer():
+    assert cosine(hashed_vector(""), hashed_vector(JOB)) == 0.0
+    assert cosine(ngram_vector(None), ngram_vector(JOB)) == 0.0
+    with pytest.raises(ValueError, match="Unknown vectorizer"):
+        counts_vector({}, "tfidf")
+
+
+def test_resume_features_are_cached_and_build_vectors_lazily():
+    features = resume_features(RESUME)
+    assert resume_features(RESUME) is features
+    assert features.vector_for("hashed") == hashed_vector(RESUME)
+    assert features.vector == ngram_vector(RESUME)
+
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from resume_analyzer import idf
+from resume_analyzer.features import ngram_vector
+from resume_analyzer.idf import IdfModel, gram_hash
+
+CORPUS = ["Experience with Python and Django", "Experience with Java and Spring",
+          "Experience with Python and React", "Strong communication skills"]
+
+
+@pytest.fixture
+def configured(monkeypatch, tmp_path):
+    """Point RESUME_ANALYZER_IDF at a model fitted on CORPUS."""
+    path = str(tmp_path / "idf.npz")
+    IdfModel.fit(CORPUS, min_df=1).save(path)
+    monkeypatch.setenv("RESUME_ANALYZER_IDF", path)
+    monkeypatch.setattr(idf, "_model", None)
+    monkeypatch.setattr(idf, "_loaded", False)
+    return path
+
+
+def test_weights_match_scikit_learn():
+    model = IdfModel.fit(CORPUS, min_df=1)
+    reference = TfidfVectorizer(stop_words='english', ngram_range=(1,3)).fit(CORPUS)
+    grams = reference.get_feature_names_out()
+    assert len(model) == len(grams)
+    weights = model.lookup([gram_hash(gram) for gram in grams])
+    assert weights == pytest.approx(reference.idf_, rel=1e-6)
+
+
+def test_rare_and_unseen_grams_weigh_like_one_document():
+    model = IdfModel.fit(CORPUS, min_df=2)
+    assert model.n_docs == 4
+    python, java, unseen = model.lookup([gram_hash("python"), gram_hash("java"), gram_hash("cobol")])
+    assert python == pytest.approx(np.log(5 / 3) + 1, rel=1e-6)
+    assert java == unseen == model.default == pytest.approx(np.log(5 / 2) + 1)
+
+
+def test_save_load_and_fingerprint(tmp_path):
+    model = IdfModel.fit(CORPUS)
+    path = str(tmp_path / "idf.npz")
+    model.save(path)
+    loaded = IdfModel.load(path)
+    assert loaded.n_docs == model.n_docs
+    assert np.array_equal(loaded.hashes, model.hashes) and np.array_equal(loaded.weights, model.weights)
+    assert loaded.fingerprint() == model.fingerprint()
+    assert IdfModel.fit(CORPUS[:3]).fingerprint() != model.fingerprint()
+
+
+def test_configured_model_weights_vectors(configured):
+    model = idf.get_idf_model()
+    assert idf.get_idf_model() is model
+    vector = ngram_vector("python python communication")
+    expected = model.lookup([gram_hash("python"), gram_hash("communication")])
+    assert vector.counts["python"] == pytest.approx(2 * expected[0])
+    assert vector.counts["communication"] == pytest.approx(expected[1])
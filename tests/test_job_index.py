@@ -0,0 +1,77 @@
+import pytest
+
+from benchmarks.synthetic import synthetic_job, synthetic_resume
+from resume_analyzer.job_index import JobIndex
+from resume_analyzer.matching import calculate_ai_match
+from tests.samples import FRONTEND_JOB, JOB, RESUME
+
+
+def hashed_score(resume, job):
+    return min(round(calculate_ai_match(resume, job, vectorizer="hashed")[0], 2), 100)
+
+
+def test_top_k_matches_brute_force():
+    jobs = [synthetic_job(1_500, seed=seed) for seed in range(40)] + [JOB]
+    index = JobIndex()
+    for i, job in enumerate(jobs):
+        index.add(i, job)
+
+    for resume in (RESUME, synthetic_resume(3_000, seed=7)):
+        expected = sorted((hashed_score(resume, job) for job in jobs), reverse=True)[:5]
+        results = index.top_k(resume, k=5)
+        assert [r["score"] for r in results] == pytest.approx(expected, abs=0.01)
+        for r in results:
+            assert r["score"] == pytest.approx(hashed_score(resume, jobs[int(r["id"])]), abs=0.01)
+
+
+def test_ties_keep_insertion_order():
+    index = JobIndex()
+    for job_id in ("c", "a", "b"):
+        index.add(job_id, JOB)
+    assert [r["id"] for r in index.top_k(RESUME, k=2)] == ["c", "a"]
+
+
+def test_replaces_postings_with_the_same_id():
+    index = JobIndex()
+    index.add("a", FRONTEND_JOB)
+    index.add("a", JOB)
+    results = index.top_k(RESUME, k=5)
+    assert [r["id"] for r in results] == ["a"]
+    assert results[0]["score"] == pytest.approx(hashed_score(RESUME, JOB), abs=0.01)
+
+
+def test_result_details():
+    index = JobIndex()
+    index.add("backend", JOB)
+    result, = index.top_k(RESUME)
+    assert result["title"] == "Backend Engineer"
+    assert result["score"] == 53.72
+    assert result["matched_skills"] == ["Programming: Python", "Web Backend: Django", "Cloud & DevOps: AWS",
+                                        "Soft: Communication", "Soft: Leadership"]
+    assert result["missing_skills"] == ["Database: PostgreSQL", "Cloud & DevOps: Kubernetes"]
+    assert JobIndex().top_k(RESUME) == []
+    assert index.top_k("   ") == []
+
+
+def test_save_and_load(tmp_path):
+    index = JobIndex()
+    index.add("backend", JOB)
+    index.add("frontend", FRONTEND_JOB)
+    index.save(tmp_path)
+    loaded = JobIndex.load(tmp_path)
+    assert len(loaded) == 2
+    assert loaded.top_k(RESUME) == index.top_k(RESUME)
+
+    loaded.add("frontend", JOB)
+    loaded.save(tmp_path)
+    assert [r["id"] for r in JobIndex.load(tmp_path).top_k(RESUME)] == ["backend", "frontend"]
+
+
+def test_load_rebuilds_with_another_bucket_count(tmp_path):
+    index = JobIndex()
+    index.add("backend", JOB)
+    index.save(tmp_path)
+    rebuilt = JobIndex.load(tmp_path, n_features=2 ** 12)
+    assert rebuilt.n_features == 2 ** 12
+    assert [r["id"] for r in rebuilt.top_k(RESUME)] == ["backend"]
+    assert JobIndex.load(tmp_path, n_features=2 ** 12).n_features == 2 ** 12
@@ -0,0 +1,48 @@
+import pytest
+
+from resume_analyzer.live import LiveResume, paragraph_cache, split_paragraphs
+from resume_analyzer.matching import calculate_ai_match, skill_overlap
+from tests.samples import JOB, RESUME
+
+EDITS = [
+    RESUME,
+    RESUME + "\n\nPROJECTS:\n• Kubernetes operator in Go",
+    RESUME.replace("Django", "Flask"),
+    # Joining two paragraphs creates n-grams across the old break
+    RESUME.replace("\n\nSKILLS:", "\nSKILLS:"),
+    "",
+    RESUME,
+]
+
+
+@pytest.mark.parametrize("vectorizer", ["exact", "hashed"])
+def test_live_resume_matches_calculate_ai_match(vectorizer):
+    live = LiveResume(vectorizer)
+    for text in EDITS:
+        live_score, live_tech, live_soft, _, _ = live.match(text, JOB)
+        score, tech, soft, _, _ = calculate_ai_match(text, JOB, vectorizer=vectorizer)
+        assert live_score == pytest.approx(score, abs=1e-6)
+        assert (live_tech, live_soft) == (tech, soft)
+
+
+def test_skill_split_across_a_paragraph_break():
+    live = LiveResume()
+    live.update("Built APIs in Node\n\njs and Python")
+    assert "Node.js" in live.tech["Web Backend"]
+    assert live.slots == LiveResume().update("Built APIs in Node\njs and Python").slots
+
+
+def test_overlap_matches_skill_overlap():
+    live = LiveResume()
+    for text in EDITS:
+        live.update(text)
+        assert live.overlap(JOB) == skill_overlap(text, JOB)
+
+
+def test_only_changed_paragraphs_are_analyzed():
+    live = LiveResume()
+    live.update(RESUME)
+    misses = paragraph_cache.stats()["misses"]
+    live.update(RESUME + "\n\nPROJECTS:\n• Kubernetes operator in Go")
+    assert paragraph_cache.stats()["misses"] - misses <= 1
+    assert split_paragraphs("a\n\n \n\nb\n") == ["a", "b\n"]
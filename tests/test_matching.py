@@ -0,0 +1,44 @@
+import pytest
+
+from resume_analyzer.matching import EMPTY_MATCH, calculate_ai_match, match_many, rank_resumes, score_pairs
+from tests.samples import FRONTEND_JOB, JAVA_RESUME, JOB, RESUME, SHORT_RESUME
+
+JOBS = [JOB, FRONTEND_JOB, "", JOB + "\nGo, Rust"]
+RESUMES = [RESUME, SHORT_RESUME, JAVA_RESUME, "   "]
+
+
+@pytest.mark.parametrize("vectorizer", ["exact", "hashed"])
+def test_match_many_equals_calculate_ai_match(vectorizer):
+    for resume, result in zip(RESUMES, [match_many(r, JOBS, vectorizer=vectorizer) for r in RESUMES]):
+        for job, (score, *skills) in zip(JOBS, result):
+            expected, *expected_skills = calculate_ai_match(resume, job, vectorizer=vectorizer)
+            assert score == pytest.approx(expected, abs=1e-6)
+            assert skills == expected_skills
+
+
+def test_empty_inputs_score_zero():
+    assert match_many("", JOBS) == [EMPTY_MATCH] * len(JOBS)
+    assert calculate_ai_match(RESUME, "") == EMPTY_MATCH
+
+
+def test_rank_resumes_is_best_first_and_points_back_to_its_input():
+    ranked = rank_resumes(JOB, RESUMES)
+    assert sorted(i for i, _ in ranked) == list(range(len(RESUMES)))
+    scores = [result[0] for _, result in ranked]
+    assert scores == sorted(scores, reverse=True)
+    for i, result in ranked:
+        assert result[0] == pytest.approx(calculate_ai_match(RESUMES[i], JOB)[0], abs=1e-6)
+
+
+def test_score_pairs_keeps_input_order():
+    pairs = [(RESUME, JOB), (SHORT_RESUME, FRONTEND_JOB), (RESUME, FRONTEND_JOB)]
+    assert [result[0] for result in score_pairs(pairs)] == pytest.approx(
+        [calculate_ai_match(resume, job)[0] for resume, job in pairs], abs=1e-6)
+
+
+def test_stages_are_reported_in_order():
+    from resume_analyzer.matching import STAGES
+
+    seen = []
+    match_many(RESUME, JOBS, on_stage=lambda stage, seconds: seen.append(stage))
+    assert tuple(seen) == STAGES
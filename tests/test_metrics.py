@@ -0,0 +1,102 @@
+import json
+import logging
+import urllib.request
+
+import pytest
+
+from resume_analyzer import metrics
+from resume_analyzer.pdf import extract_text_from_pdf
+
+
+@pytest.fixture
+def recording(monkeypatch):
+    """Metrics enabled, starting from an empty history."""
+    monkeypatch.setattr(metrics, "_enabled", True)
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@metrics.timed("test.double")
+def double(text):
+    return text * 2
+
+
+@metrics.timed("test.parse", returns_error=True)
+def parse(text):
+    return (None, "bad input") if text == "bad" else (text, None)
+
+
+def test_disabled_by_default_records_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", False)
+    metrics.reset()
+    assert double("ab") == "abab"
+    metrics.record("test.manual", 1.0)
+    assert metrics.recent() == [] and metrics.summary() == {}
+
+
+def test_timed_records_duration_size_and_errors(recording):
+    double("abc")
+    parse("ok")
+    parse("bad")
+    with pytest.raises(TypeError):
+        double(None, 1)
+    events = metrics.recent()
+    assert [(e["stage"], e["size"], e["ok"]) for e in events] == [
+        ("test.double", None, False), ("test.parse", 3, False), ("test.parse", 2, True), ("test.double", 3, True)]
+    summary = metrics.summary()
+    assert summary["test.parse"]["count"] == 2 and summary["test.parse"]["errors"] == 1
+    assert summary["test.double"]["p50"] >= 0
+
+
+def test_sinks_and_log_sink(recording, caplog):
+    seen = []
+    # A failing sink does not stop the others
+    sinks = [metrics.add_sink(lambda event: 1 / 0), metrics.add_sink(seen.append),
+             metrics.add_sink(metrics.log_sink())]
+    try:
+        with caplog.at_level(logging.INFO, logger="resume_analyzer.metrics"):
+            metrics.record("test.manual", 0.5, size=10)
+    finally:
+        for sink in sinks:
+            metrics.remove_sink(sink)
+    assert [event["stage"] for event in seen] == ["test.manual"]
+    assert json.loads(caplog.records[0].getMessage())["seconds"] == 0.5
+
+
+def test_drain_and_replay(recording):
+    metrics.record("test.worker", 0.2, size=5)
+    events = metrics.drain()
+    assert metrics.recent() == []
+    metrics.replay(events)
+    assert metrics.summary()["test.worker"]["count"] == 1
+
+
+def test_prometheus_text(recording):
+    metrics.record("test.manual", 0.003, size=7)
+    metrics.record("test.manual", 2.0, ok=False)
+    text = metrics.prometheus_text()
+    assert 'resume_analyzer_stage_seconds_bucket{stage="test.manual",le="0.005"} 1' in text
+    assert 'resume_analyzer_stage_seconds_bucket{stage="test.manual",le="+Inf"} 2' in text
+    assert 'resume_analyzer_stage_seconds_count{stage="test.manual"} 2' in text
+    assert 'resume_analyzer_stage_errors_total{stage="test.manual"} 1' in text
+    assert 'resume_analyzer_stage_input_bytes_total{stage="test.manual"} 7' in text
+    assert 'resume_analyzer_cache_hits_total{cache="pdf_text"}' in text
+
+
+def test_pipeline_stages_are_recorded(recording):
+    extract_text_from_pdf(b"not a pdf")
+    event, = metrics.recent()
+    assert (event["stage"], event["ok"], event["size"]) == ("extract_text_from_pdf", False, 9)
+
+
+def test_serve_prometheus(recording):
+    metrics.record("test.manual", 0.1)
+    server = metrics.serve_prometheus(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            assert 'stage="test.manual"' in response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,167 @@
+import io
+
+import pytest
+
+from benchmarks.synthetic import synthetic_pdf
+from resume_analyzer import pdf
+from resume_analyzer.cache import ContentCache
+
+pytest.importorskip("PyPDF2")
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(pdf, "pdf_text_cache", ContentCache(maxsize=16))
+
+
+@pytest.fixture(scope="module")
+def resume_pdf():
+    return synthetic_pdf(3, seed=1)
+
+
+def test_extracts_text(resume_pdf):
+    text, err = pdf.extract_text_from_pdf(resume_pdf)
+    assert err is None
+    assert text.count("\n") > 3 * 10
+
+
+def test_same_bytes_are_extracted_once(resume_pdf):
+    first = pdf.extract_text_from_pdf(resume_pdf)
+    assert pdf.extract_text_from_pdf(bytearray(resume_pdf)) == first
+    assert pdf.pdf_text_cache.stats()["hits"] == 1
+    assert pdf.pdf_text_cache.stats()["misses"] == 1
+
+
+def test_file_objects_are_read_and_rewound(resume_pdf):
+    upload = io.BytesIO(resume_pdf)
+    assert pdf.extract_text_from_pdf(upload) == pdf.extract_text_from_pdf(resume_pdf)
+    assert upload.tell() == 0
+
+
+def test_disk_tier_survives_a_restart(resume_pdf, tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf, "pdf_text_cache", ContentCache(disk_dir=str(tmp_path)))
+    first = pdf.extract_text_from_pdf(resume_pdf)
+    monkeypatch.setattr(pdf, "pdf_text_cache", ContentCache(disk_dir=str(tmp_path)))
+    assert pdf.extract_text_from_pdf(resume_pdf) == first
+    assert pdf.pdf_text_cache.stats()["disk_hits"] == 1
+
+
+def test_not_a_pdf():
+    text, err = pdf.extract_text_from_pdf(b"not a pdf")
+    assert text is None
+    assert err.startswith("Failed to extract PDF text")
+
+
+@pytest.fixture(scope="module")
+def long_pdf():
+    return synthetic_pdf(40, seed=2)
+
+
+def test_parallel_equals_sequential(long_pdf):
+    sequential = pdf.extract_text_from_pdf(long_pdf, parallel=False)
+    pdf.pdf_text_cache.clear()
+    assert pdf.extract_text_from_pdf(long_pdf, parallel=True) == sequential
+    assert not any(pdf._pool_users.values())
+
+
+def test_pool_takes_over_after_the_probe_pages(long_pdf, monkeypatch):
+    sequential = pdf.extract_text_from_pdf(long_pdf, parallel=False)
+    pdf.pdf_text_cache.clear()
+    handed_over = []
+
+    def pool(data, start, stop, page_timeout):
+        handed_over.append((start, stop))
+        reader = pdf._pdf_reader()(io.BytesIO(data))
+        return (reader.pages[page].extract_text() for page in range(start, stop))
+
+    monkeypatch.setattr(pdf, "PDF_WORKERS", 4)
+    monkeypatch.setattr(pdf, "_pool_pays_off", lambda *args: True)
+    monkeypatch.setattr(pdf, "_iter_pages_parallel", pool)
+    assert pdf.extract_text_from_pdf(long_pdf) == sequential
+    assert handed_over == [(pdf.PARALLEL_PROBE_PAGES, 40)]
+
+
+def test_single_worker_never_uses_the_pool(long_pdf, monkeypatch):
+    monkeypatch.setattr(pdf, "PDF_WORKERS", 1)
+    monkeypatch.setattr(pdf, "_iter_pages_parallel", None)
+    assert pdf.extract_text_from_pdf(long_pdf)[1] is None
+
+
+def test_pool_is_used_only_for_slow_pages(monkeypatch):
+    monkeypatch.setattr(pdf, "PDF_WORKERS", 4)
+    monkeypatch.setattr(pdf, "_pool", object())
+    # Ordinary text pages take a few milliseconds: not worth the round trips
+    assert not pdf._pool_pays_off(0.003, 196, 0.02)
+    assert pdf._pool_pays_off(0.05, 196, 0.02)
+    monkeypatch.setattr(pdf, "_pool", None)
+    # A cold pool has to win back its start-up time
+    assert not pdf._pool_pays_off(0.05, 36, 0.005)
+    assert pdf._pool_pays_off(0.2, 36, 0.005)
+
+
+def test_timed_out_page_is_an_error(long_pdf):
+    text, err = pdf.extract_text_from_pdf(long_pdf, parallel=True, page_timeout=1e-6)
+    assert text is None
+    assert "timed out" in err
+    assert len(pdf.pdf_text_cache) == 0
+    # The stuck pool is retired; the next extraction gets a fresh one
+    assert pdf.extract_text_from_pdf(long_pdf, parallel=True)[1] is None
+
+
+def test_stopping_early_skips_queued_pages(long_pdf, tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf.tempfile, "tempdir", str(tmp_path))
+    text, err = pdf.extract_text_from_pdf(long_pdf, parallel=True, max_chars=100)
+    assert err is None
+    assert len(text) == 100
+    assert list(tmp_path.iterdir()) == []
+    assert pdf._extract_page(str(tmp_path / "gone.pdf"), 0) is None
+
+
+def extract(data, **budgets):
+    notes = []
+    text, err = pdf.extract_text_from_pdf(data, on_truncated=notes.append, **budgets)
+    assert err is None
+    return text, notes
+
+
+def pages_of(data):
+    reader = pdf._pdf_reader()(io.BytesIO(data))
+    return [page.extract_text() for page in reader.pages]
+
+
+def test_page_budget(long_pdf):
+    text, notes = extract(long_pdf, max_pages=5)
+    assert text == "\n".join(pages_of(long_pdf)[:5])
+    assert notes == ["Stopped after 5 of 40 pages"]
+
+
+def test_character_budget_cuts_the_last_page(long_pdf):
+    text, notes = extract(long_pdf, max_chars=1000)
+    assert len(text) == 1000
+    assert notes == ["Stopped at the 1,000-character limit on page 1 of 40"]
+
+
+def test_character_budget_ending_exactly_at_a_page_break(long_pdf):
+    first = pages_of(long_pdf)[0]
+    for max_chars in (len(first), len(first) + 1):
+        text, notes = extract(long_pdf, max_chars=max_chars)
+        assert text == first
+        assert notes == [f"Stopped at the {max_chars:,}-character limit on page 1 of 40"]
+
+
+def test_whole_document_within_budgets_has_no_note(resume_pdf):
+    full = "\n".join(pages_of(resume_pdf))
+    for budgets in ({}, {"max_pages": 3}, {"max_chars": len(full)}, {"max_pages": 0, "max_chars": 0}):
+        assert extract(resume_pdf, **budgets) == (full, [])
+
+
+def test_truncation_note_is_repeated_on_a_cache_hit(long_pdf):
+    first = extract(long_pdf, max_pages=5)
+    assert extract(long_pdf, max_pages=5) == first
+    assert pdf.pdf_text_cache.stats()["hits"] == 1
+
+
+def test_pages_are_streamed(long_pdf):
+    streamed = []
+    text, err = pdf.extract_text_from_pdf(long_pdf, on_page=streamed.append, max_pages=4)
+    assert streamed == pages_of(long_pdf)[:4]
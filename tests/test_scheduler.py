@@ -0,0 +1,113 @@
+import threading
+import time
+
+from resume_analyzer.scheduler import LLMScheduler
+
+
+def scheduler(**limits):
+    options = dict(requests_per_minute=60_000, tokens_per_minute=10_000_000, max_concurrent=1,
+                   session_concurrency=4, session_requests_per_minute=60_000)
+    options.update(limits)
+    return LLMScheduler(**options)
+
+
+def wait_in_thread(s, ticket, granted, name, release=False):
+    def run():
+        s.wait(ticket)
+        granted.append(name)
+        if release:
+            s.release(ticket)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_tickets_are_granted_by_priority_then_arrival():
+    s = scheduler()
+    running = s.wait(s.ticket(10))
+    tickets = [("late low", s.ticket(10, priority=5)), ("first", s.ticket(10)), ("second", s.ticket(10))]
+    assert [s.position(ticket) for _, ticket in tickets] == [3, 1, 2]
+
+    granted = []
+    threads = [wait_in_thread(s, ticket, granted, name, release=True) for name, ticket in tickets]
+    s.release(running)
+    for thread in threads:
+        thread.join(5)
+    assert granted == ["first", "second", "late low"]
+
+
+def test_position_is_zero_once_granted():
+    s = scheduler(max_concurrent=2)
+    ticket = s.ticket(10)
+    assert s.position(ticket) == 1
+    s.wait(ticket)
+    assert s.position(ticket) == 0
+    s.release(ticket)
+    assert s.stats() == {"waiting": 0, "running": 0, "sessions": 0}
+
+
+def test_busy_session_does_not_hold_up_others():
+    s = scheduler(max_concurrent=4, session_concurrency=1)
+    running = s.wait(s.ticket(10, session="a"))
+    queued = s.ticket(10, session="a")
+    other = s.ticket(10, session="b")
+
+    granted = []
+    waiting = wait_in_thread(s, queued, granted, "a")
+    wait_in_thread(s, other, granted, "b").join(5)
+    assert granted == ["b"]
+    assert s.position(queued) == 1
+
+    s.release(running)
+    waiting.join(5)
+    assert granted == ["b", "a"]
+
+
+def test_session_requests_per_minute():
+    s = scheduler(max_concurrent=4, session_requests_per_minute=60)
+    # Six seconds' worth may go at once, then one a second
+    for _ in range(6):
+        s.release(s.wait(s.ticket(10, session="a")))
+    queued = s.ticket(10, session="a")
+    started = time.monotonic()
+    s.release(s.wait(s.ticket(10, session="b")))
+    assert time.monotonic() - started < 0.5
+    s.release(s.wait(queued))
+    assert time.monotonic() - started >= 0.8
+
+
+def test_tokens_per_minute():
+    # Holds six seconds' worth (6,000 tokens) and refills 1,000 a second
+    s = scheduler(max_concurrent=4, tokens_per_minute=60_000)
+    started = time.monotonic()
+    s.release(s.wait(s.ticket(6_000)))
+    assert time.monotonic() - started < 0.2
+    s.release(s.wait(s.ticket(500)))
+    assert time.monotonic() - started >= 0.4
+
+
+def test_pause_holds_back_every_ticket():
+    s = scheduler(max_concurrent=4)
+    s.pause(0.5)
+    started = time.monotonic()
+    ticket = s.wait(s.ticket(10, session="a"))
+    assert time.monotonic() - started >= 0.45
+    assert ticket.waited >= 0.45
+    s.release(ticket)
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    s = scheduler()
+    running = s.wait(s.ticket(10))
+    ticket = s.ticket(10)
+
+    def give_up():
+        raise TimeoutError()
+
+    try:
+        s.wait(ticket, give_up)
+    except TimeoutError:
+        pass
+    assert s.position(ticket) == 0
+    assert s.stats()["waiting"] == 0
+    s.release(running)
@@ -0,0 +1,26 @@
+"""Pinned scores: any change to the blend or the features shows up here."""
+import numpy as np
+import pytest
+
+from resume_analyzer.matching import calculate_ai_match
+from resume_analyzer.skill_masks import blend
+from tests.samples import FRONTEND_JOB, JAVA_RESUME, JOB, RESUME, SHORT_RESUME
+
+
+def test_blend_weights():
+    # 40 x cosine (0-1) + 0.45 x tech % + 0.15 x soft %
+    assert blend(0.5, 50, 20) == pytest.approx(45.5)
+    assert blend(1.0, 100, 100) == 100
+    assert blend(0.0, 0, 0) == 0
+    assert list(blend(np.array([0.25, 0.1]), np.array([40, 0]), np.array([0, 100]))) == pytest.approx([28.0, 19.0])
+
+
+@pytest.mark.parametrize("resume, job, expected", [
+    (RESUME, JOB, 53.72),
+    (SHORT_RESUME, JOB, 11.43),
+    (JAVA_RESUME, JOB, 0.0),
+    (RESUME, FRONTEND_JOB, 1.27),
+])
+@pytest.mark.parametrize("vectorizer", ["exact", "hashed"])
+def test_known_scores(resume, job, expected, vectorizer):
+    assert calculate_ai_match(resume, job, vectorizer=vectorizer)[0] == pytest.approx(expected, abs=0.01)
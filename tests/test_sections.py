@@ -0,0 +1,42 @@
+from resume_analyzer.ai import SECTION_MAX_TOKENS, SECTION_MIN_TOKENS, section_budgets
+from resume_analyzer.sections import Section, is_heading, split_sections
+
+RESUME = """Jane Doe
+jane@example.com
+
+## Experience
+• Built REST APIs with Python
+
+**SKILLS:**
+• Python, SQL
+
+OPEN SOURCE:
+• Maintainer of a parser library
+Education
+B.Tech in Computer Science"""
+
+
+def test_split_sections():
+    sections = split_sections(RESUME)
+    assert [section.heading for section in sections] == ["", "## Experience", "**SKILLS:**", "OPEN SOURCE:",
+                                                        "Education"]
+    assert sections[0] == Section("", "Jane Doe\njane@example.com\n")
+    assert sections[-1].body == "B.Tech in Computer Science"
+
+
+def test_sections_join_back_to_the_original():
+    sections = split_sections(RESUME)
+    lines = [section.heading + "\n" + section.body if section.heading else section.body for section in sections]
+    assert "\n".join(lines) == RESUME
+
+
+def test_headings():
+    assert all(map(is_heading, ["Work Experience", "SKILLS:", "# Projects", "**Certifications**", "CLOUD & DATA:"]))
+    assert not any(map(is_heading, ["Skills in Python", "• Experience: 3 years", "Led the TEAM:", ""]))
+    assert split_sections("") == []
+    assert split_sections("No headings here") == [Section("", "No headings here")]
+
+
+def test_section_budgets():
+    tiny, medium, huge = Section("Skills", "Python"), Section("Experience", "x" * 2_000), Section("Projects", "x" * 50_000)
+    assert section_budgets([tiny, medium, huge]) == [SECTION_MIN_TOKENS, 2_000 * 3 // 8 + 64, SECTION_MAX_TOKENS]
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from resume_analyzer.matching import calculate_ai_match
+from resume_analyzer.service import create_app
+from tests.samples import JOB, RESUME
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp.test_utils import TestClient, TestServer  # noqa: E402
+
+
+def call(method, path, **kwargs):
+    """Start the app with one worker, make one request, return `(status, body)`."""
+    async def run():
+        async with TestClient(TestServer(create_app(workers=1))) as client:
+            response = await client.request(method, path, **kwargs)
+            if response.content_type == "application/json":
+                return response.status, await response.json()
+            return response.status, await response.text()
+    return asyncio.run(run())
+
+
+def expected():
+    return round(float(calculate_ai_match(RESUME, JOB)[0]), 2)
+
+
+def test_score_json():
+    status, body = call("POST", "/score", json={"resume_text": RESUME, "job_desc": JOB})
+    assert status == 200
+    assert body["score"] == expected()
+    assert set(body) == {"score", "rtech", "rsoft", "jtech", "jsoft"}
+
+
+def test_score_urlencoded_form():
+    status, body = call("POST", "/score", data={"resume_text": RESUME, "job_desc": JOB})
+    assert status == 200
+    assert body["score"] == expected()
+
+
+def test_score_multipart_pdf():
+    pytest.importorskip("PyPDF2")
+    from benchmarks.synthetic import synthetic_pdf
+
+    form = aiohttp.FormData()
+    form.add_field("resume", synthetic_pdf(2, seed=1), filename="resume.pdf",
+                   content_type="application/pdf")
+    form.add_field("job_desc", JOB)
+    status, body = call("POST", "/score", data=form)
+    assert status == 200
+    assert 0 <= body["score"] <= 100
+
+
+def test_bad_requests():
+    status, body = call("POST", "/score", data="not json", headers={"content-type": "text/plain"})
+    assert (status, body["error"]) == (400, "Expected a JSON body or a form")
+    status, body = call("POST", "/score", json=["a list"])
+    assert (status, body["error"]) == (400, "Expected a JSON object")
+    status, body = call("POST", "/score", data={"resume_text": RESUME})
+    assert status == 400
+
+
+def test_healthz_and_metrics():
+    assert call("GET", "/healthz") == (200, {"status": "ok"})
+    status, text = call("GET", "/metrics")
+    assert status == 200
+    assert "resume_analyzer" in text
@@ -0,0 +1,39 @@
+from resume_analyzer.skills import extract_skills_advanced, get_default_matcher
+from resume_analyzer.taxonomy import tokenize
+
+
+def found(text):
+    tech, soft = extract_skills_advanced(text)
+    return {skill.lower() for skills in list(tech.values()) + [soft] for skill in skills}
+
+
+def test_go_is_not_found_inside_good():
+    assert "go" not in found("Good communication and goodwill")
+    assert "go" in found("Built services in Go")
+
+
+def test_sql_is_not_found_inside_nosql():
+    assert "sql" not in found("Worked with NoSQL stores")
+    assert "sql" in found("SQL and NoSQL databases")
+
+
+def test_java_is_not_found_inside_javascript():
+    assert "java" not in found("JavaScript only")
+    assert "javascript" in found("JavaScript only")
+    assert {"java", "javascript"} <= found("Java and JavaScript")
+
+
+def test_skills_are_found_at_the_end_of_the_text():
+    assert "docker" in found("Tools: Git, Docker")
+
+
+def test_soft_skills_are_reported_separately():
+    tech, soft = extract_skills_advanced("good communication")
+    assert [skill.lower() for skill in soft] == ["communication"]
+    assert not any(tech.values())
+
+
+def test_match_tokens_equals_match():
+    matcher = get_default_matcher()
+    text = "Python, React and Kubernetes; strong leadership"
+    assert matcher.match_tokens(tokenize(text)) == matcher.match(text)
@@ -0,0 +1,79 @@
+import json
+import os
+
+import pytest
+
+from resume_analyzer.skills import SkillMatcher, get_default_matcher
+from resume_analyzer.taxonomy import SkillIndex, TaxonomyError, build_index, load_skill_index, load_taxonomy
+
+TAXONOMY = {
+    "tech": {
+        "Database": ["PostgreSQL", {"name": "GraphQL", "aliases": ["gql"]}],
+        "Mobile": ["iOS", {"name": "react native", "label": "React Native", "aliases": ["rn"]}],
+    },
+    "soft": [{"name": "teamwork", "aliases": ["team player"]}],
+}
+
+CSV = """category,skill,aliases,label
+Database,PostgreSQL,postgres|psql,
+Mobile,ios,,iOS
+Soft Skills,teamwork,team work|team player,Teamwork
+"""
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content if isinstance(content, str) else json.dumps(content), encoding="utf-8")
+    return str(path)
+
+
+def matcher_for(path):
+    return SkillMatcher(SkillIndex(build_index(load_taxonomy(path))))
+
+
+def test_json_taxonomy_keeps_the_source_casing(tmp_path):
+    matcher = matcher_for(write(tmp_path, "taxonomy.json", TAXONOMY))
+    tech, soft = matcher.match("postgresql, GQL and iOS in a team player role; RN apps")
+    assert tech == {"Database": ["PostgreSQL", "GraphQL"], "Mobile": ["iOS", "React Native"]}
+    assert soft == ["teamwork"]
+
+
+def test_csv_taxonomy_with_aliases_and_labels(tmp_path):
+    matcher = matcher_for(write(tmp_path, "taxonomy.csv", CSV))
+    tech, soft = matcher.match("Postgres on iOS, team work")
+    assert tech == {"Database": ["PostgreSQL"], "Mobile": ["iOS"]}
+    assert soft == ["Teamwork"]
+
+
+def test_bundled_taxonomy_labels():
+    tech, soft = get_default_matcher().match("PostgreSQL, iOS apps in JavaScript and Node.js, SQL; problem solving")
+    assert {"PostgreSQL", "iOS", "JavaScript", "Node.js", "SQL"} <= {name for names in tech.values() for name in names}
+    assert soft == ["Problem Solving"]
+
+
+def test_invalid_taxonomies_are_rejected(tmp_path):
+    with pytest.raises(TaxonomyError):
+        load_taxonomy(write(tmp_path, "bad.json", {"soft": []}))
+    with pytest.raises(TaxonomyError):
+        load_taxonomy(write(tmp_path, "bad.csv", "name,aliases\nsql,\n"))
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    source = write(tmp_path, "taxonomy.json", TAXONOMY)
+    index_path = str(tmp_path / "taxonomy.idx")
+    assert SkillMatcher(load_skill_index(source, index_path)).match("rust")[0]["Database"] == []
+
+    changed = json.loads(json.dumps(TAXONOMY))
+    changed["tech"]["Database"].append("Rust")
+    write(tmp_path, "taxonomy.json", changed)
+    os.utime(source, ns=(os.stat(index_path).st_mtime_ns + 10**9,) * 2)
+    assert SkillMatcher(load_skill_index(source, index_path)).match("rust")[0]["Database"] == ["Rust"]
+
+
+def test_up_to_date_index_is_not_rebuilt(tmp_path):
+    source = write(tmp_path, "taxonomy.json", TAXONOMY)
+    index_path = str(tmp_path / "taxonomy.idx")
+    load_skill_index(source, index_path)
+    built = os.stat(index_path).st_mtime_ns
+    load_skill_index(source, index_path)
+    assert os.stat(index_path).st_mtime_ns == built